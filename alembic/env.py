@@ -21,6 +21,8 @@ from api.models import (
     CompanyInfo,
     OnboardingQuestion,
     Lead,
+    IdempotencyKey,
+    EdgePurge,
 )
 
 # this is the Alembic Config object
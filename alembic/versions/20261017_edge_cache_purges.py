@@ -0,0 +1,31 @@
+"""add edge cache purges
+
+Revision ID: 3c9e4b7a1f20
+Revises: 8d3f1a6c2e7b
+Create Date: 2026-10-17
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = '3c9e4b7a1f20'
+down_revision: Union[str, None] = '8d3f1a6c2e7b'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Written in the admin write's transaction, so every instance (and a
+    # recycled one) sees the same pending purges
+    op.create_table(
+        'edge_cache_purges',
+        sa.Column('surrogate_key', sa.String(255), primary_key=True),
+        sa.Column('recorded_at', sa.TIMESTAMP(timezone=True), server_default=sa.text('now()')),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('edge_cache_purges')
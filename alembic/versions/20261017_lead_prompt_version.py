@@ -0,0 +1,33 @@
+"""add lead prompt versioning
+
+Revision ID: 5b7e2c9d4a1f
+Revises: abc123def456
+Create Date: 2026-10-17
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = '5b7e2c9d4a1f'
+down_revision: Union[str, None] = 'abc123def456'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Version of the pricing plan / question labels each prompt was rendered
+    # from; NULL for existing prompts, which are re-rendered on next read
+    op.add_column('leads', sa.Column('prompt_version', sa.String(16), nullable=True))
+
+    # Prompts may be rendered after the lead is stored (LEAD_PROMPT_MODE=deferred)
+    op.alter_column('leads', 'ai_prompt', existing_type=sa.Text(), nullable=True)
+
+
+def downgrade() -> None:
+    op.execute("UPDATE leads SET ai_prompt = '' WHERE ai_prompt IS NULL")
+    op.alter_column('leads', 'ai_prompt', existing_type=sa.Text(), nullable=False)
+
+    op.drop_column('leads', 'prompt_version')
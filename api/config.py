@@ -9,12 +9,86 @@ class Settings(BaseSettings):
 
     # Database
     DATABASE_URL: str = ""  # Will fail gracefully if not set
+    # Optional read replica for public reads and admin lists
+    DATABASE_READ_URL: str = ""
+    # Upper bound on replica lag (seconds): catalog entries loaded this soon
+    # after a write are only cached this long
+    DATABASE_READ_MAX_LAG: int = 5
+    # Connection pooling: auto (NullPool in production, regular pool in
+    # development), null, warm (small pool reused across warm invocations)
+    # or pgbouncer (Neon pooled endpoint, no prepared statement caching)
+    DB_POOL_MODE: str = "auto"
+    DB_WARM_POOL_SIZE: int = 2
+    DB_WARM_MAX_OVERFLOW: int = 3
+    DB_POOL_RECYCLE: int = 300  # Seconds; below Neon's idle connection timeout
+    # asyncpg prepared statements kept per pooled connection (warm mode;
+    # pgbouncer mode disables them, NullPool connections never reuse them)
+    DB_PREPARED_STATEMENT_CACHE_SIZE: int = 256
+    # Startup warm-up for long-running servers (uvicorn): pooled connections
+    # to open before serving (0 disables; ignored with NullPool)
+    DB_WARMUP_CONNECTIONS: int = 0
+    # Retries for transient connection failures (Neon compute waking up,
+    # dropped connections): exponential backoff with full jitter, at most
+    # DB_RETRY_ATTEMPTS tries within DB_RETRY_DEADLINE seconds. Each
+    # connection attempt times out after DB_CONNECT_TIMEOUT seconds. Inside
+    # a request both are cut to the route's query budget.
+    DB_RETRY_ATTEMPTS: int = 4
+    DB_RETRY_BASE_DELAY: float = 0.2
+    DB_RETRY_MAX_DELAY: float = 2.0
+    DB_RETRY_DEADLINE: float = 10.0
+    DB_CONNECT_TIMEOUT: float = 5.0
+    # Query budgets: per-transaction statement_timeout (milliseconds) for
+    # public routes, admin routes and exports/imports. The request deadline
+    # adds QUERY_DEADLINE_GRACE seconds so Postgres normally cancels first.
+    QUERY_BUDGET_PUBLIC_MS: int = 3000
+    QUERY_BUDGET_ADMIN_MS: int = 15000
+    QUERY_BUDGET_EXPORT_MS: int = 120000
+    QUERY_DEADLINE_GRACE: float = 2.0
+    # Slow-query log: statements slower than the threshold (milliseconds) are
+    # logged as JSON lines on the api.slow_query logger. The sample rate
+    # (0-1) thins them out under load; 0 turns the log off.
+    SLOW_QUERY_THRESHOLD_MS: int = 200
+    SLOW_QUERY_SAMPLE_RATE: float = 1.0
+    # /health/db serves the last probe result instead of connecting per
+    # request. Results older than the max age are re-probed after the
+    # response, and ?fresh=1 probes inline. An interval (seconds) also
+    # probes in the background, but it runs a query on every instance
+    # that often and keeps Neon compute from suspending: leave it at 0
+    # (off) unless the compute is always on anyway.
+    DB_HEALTH_PROBE_INTERVAL: int = 0
+    DB_HEALTH_MAX_AGE: int = 120
+    DB_HEALTH_PROBE_TIMEOUT: float = 5.0
 
     # API
     API_KEY: str = ""  # Will fail gracefully if not set
     ENVIRONMENT: str = "development"
     LOG_LEVEL: str = "INFO"
 
+    # Catalog cache (pricing, add-ons, services, features, company, onboarding)
+    CATALOG_CACHE_TTL: int = 300  # Seconds
+    CATALOG_CACHE_MAX_ENTRIES: int = 512
+    # Company info is served stale-while-revalidate: refreshed in the
+    # background after the soft TTL, served stale up to the hard TTL
+    COMPANY_CACHE_SOFT_TTL: int = 300
+    COMPANY_CACHE_HARD_TTL: int = 86400
+    # LISTEN on catalog_changed to evict entries written by other instances.
+    # Holds one connection open, so leave off on serverless deployments.
+    CATALOG_LISTEN_ENABLED: bool = False
+    # Edge (Vercel CDN) caching for public catalog GETs
+    CATALOG_EDGE_MAX_AGE: int = 60
+    CATALOG_EDGE_STALE_WHILE_REVALIDATE: int = 3600
+    # Build-time catalog snapshot (scripts/export_catalog_snapshot.py), relative
+    # to the project root; served on cold start and revalidated in the background.
+    # Empty disables it.
+    CATALOG_SNAPSHOT_PATH: str = "api/data/catalog.snapshot"
+    # Load the catalog caches at startup instead of on the first requests
+    CATALOG_PRELOAD: bool = False
+
+    # Lead AI prompts: "eager" renders them while handling POST /leads,
+    # "deferred" stores the lead first and renders after the response
+    # (falling back to the first admin read)
+    LEAD_PROMPT_MODE: str = "eager"
+
     # CORS
     CORS_ORIGINS: str = "http://localhost:3000"
 
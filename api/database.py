@@ -1,76 +1,234 @@
 """Database connection and session management using async SQLAlchemy"""
 
+import asyncio
 import re
-from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession, async_sessionmaker
+from uuid import uuid4
+from sqlalchemy import event, text
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncEngine, create_async_engine, AsyncSession, async_sessionmaker
 from sqlalchemy.ext.declarative import declarative_base
-from typing import AsyncGenerator
+from sqlalchemy.orm import Session
+from sqlalchemy.pool import NullPool
+from typing import Any, AsyncGenerator, Dict, Optional
 
 from api.config import settings
+from api.utils.db_metrics import EngineMetrics, InstrumentedNullPool, InstrumentedQueuePool, instrument_engine
+from api.utils.query_budget import apply_statement_timeout
+from api.utils.query_log import install_slow_query_log
+from api.utils.retry import RetryPolicy, install_connect_retry
 
 # Base class for ORM models
 Base = declarative_base()
 
-# Convert DATABASE_URL to async format
-database_url = settings.DATABASE_URL
-
-# Validate DATABASE_URL is set
-if not database_url:
-    raise ValueError(
-        "DATABASE_URL environment variable is required. "
-        "Please set it in Vercel dashboard or .env file."
-    )
-
-# Clean up URL for asyncpg compatibility
-# Remove problematic parameters that asyncpg doesn't support
-database_url = re.sub(r'[?&]channel_binding=[^&]*', '', database_url)
-database_url = re.sub(r'[?&]sslmode=[^&]*', '', database_url)
-
-# Convert to async format (postgresql -> postgresql+asyncpg)
-if database_url.startswith('postgresql://'):
-    database_url = database_url.replace('postgresql://', 'postgresql+asyncpg://', 1)
-elif database_url.startswith('postgres://'):
-    database_url = database_url.replace('postgres://', 'postgresql+asyncpg://', 1)
-
-# Add SSL requirement for asyncpg (Neon requires SSL)
-# asyncpg uses ssl=require instead of sslmode=require
-if '?' in database_url:
-    database_url += '&ssl=require'
-else:
-    database_url += '?ssl=require'
-
-# Create async SQLAlchemy engine
-# For Vercel serverless: use smaller pool or NullPool
-if settings.is_production:
-    # Serverless: minimal pooling
-    from sqlalchemy.pool import NullPool
-    engine = create_async_engine(
-        database_url,
-        echo=False,
-        future=True,
-        poolclass=NullPool,  # No pooling for serverless
-    )
-else:
-    # Development: normal pooling
-    engine = create_async_engine(
-        database_url,
-        echo=True,
-        future=True,
-        pool_pre_ping=True,
-        pool_recycle=300,
-        pool_size=5,
-        max_overflow=10,
-    )
+
+def _async_database_url(database_url: Optional[str] = None) -> str:
+    """DATABASE_URL (or another Postgres URL) rewritten for asyncpg"""
+    database_url = database_url or settings.DATABASE_URL
+
+    # Validate DATABASE_URL is set
+    if not database_url:
+        raise ValueError(
+            "DATABASE_URL environment variable is required. "
+            "Please set it in Vercel dashboard or .env file."
+        )
+
+    # Clean up URL for asyncpg compatibility
+    # Remove problematic parameters that asyncpg doesn't support
+    database_url = re.sub(r'[?&]channel_binding=[^&]*', '', database_url)
+    database_url = re.sub(r'[?&]sslmode=[^&]*', '', database_url)
+
+    # Convert to async format (postgresql -> postgresql+asyncpg)
+    if database_url.startswith('postgresql://'):
+        database_url = database_url.replace('postgresql://', 'postgresql+asyncpg://', 1)
+    elif database_url.startswith('postgres://'):
+        database_url = database_url.replace('postgres://', 'postgresql+asyncpg://', 1)
+
+    # Add SSL requirement for asyncpg (Neon requires SSL)
+    # asyncpg uses ssl=require instead of sslmode=require
+    if '?' in database_url:
+        database_url += '&ssl=require'
+    else:
+        database_url += '?ssl=require'
+    return database_url
+
+
+POOL_MODES = ("auto", "null", "warm", "pgbouncer")
+
+
+def resolve_pool_mode(mode: Optional[str] = None) -> str:
+    """Resolve DB_POOL_MODE, mapping auto to today's per-environment default"""
+    mode = (mode or settings.DB_POOL_MODE).lower()
+    if mode not in POOL_MODES:
+        raise ValueError(f"DB_POOL_MODE must be one of {', '.join(POOL_MODES)}, got {mode!r}")
+    if mode == "auto":
+        return "null" if settings.is_production else "development"
+    return mode
+
+
+def pooler_url(url: str) -> str:
+    """Point a Neon URL at its PgBouncer endpoint (ep-xxx -> ep-xxx-pooler)"""
+    return re.sub(r'@(ep-[a-z0-9-]+?)(?<!-pooler)\.', r'@\1-pooler.', url, count=1)
+
+
+def engine_options(mode: str) -> Dict[str, Any]:
+    """create_async_engine keyword arguments for a resolved pool mode"""
+    if mode == "null":
+        # Serverless default: a fresh connection (TCP + TLS + auth) per session
+        return {"echo": False, "poolclass": InstrumentedNullPool}
+
+    # Small pool that survives across invocations on a warm instance;
+    # pre-ping catches connections Neon dropped while the instance was frozen
+    warm = {
+        "echo": False,
+        "poolclass": InstrumentedQueuePool,
+        "pool_size": settings.DB_WARM_POOL_SIZE,
+        "max_overflow": settings.DB_WARM_MAX_OVERFLOW,
+        "pool_pre_ping": True,
+        "pool_recycle": settings.DB_POOL_RECYCLE,
+        "pool_use_lifo": True,  # Let surplus connections go idle and recycle
+        # Server-side prepared statements for repeated SQL (see api/queries.py)
+        "connect_args": {"prepared_statement_cache_size": settings.DB_PREPARED_STATEMENT_CACHE_SIZE},
+    }
+    if mode == "warm":
+        return warm
+    if mode == "pgbouncer":
+        # Transaction pooling hands each transaction a different server
+        # connection, so named prepared statements must not be reused
+        return {
+            **warm,
+            "connect_args": {
+                "statement_cache_size": 0,
+                "prepared_statement_cache_size": 0,
+                "prepared_statement_name_func": lambda: f"__asyncpg_{uuid4()}__",
+            },
+        }
+    # Development: normal pooling. Statements aren't echoed (that skews
+    # local timings); lower SLOW_QUERY_THRESHOLD_MS to see them instead.
+    return {
+        "echo": False,
+        "poolclass": InstrumentedQueuePool,
+        "pool_pre_ping": True,
+        "pool_recycle": settings.DB_POOL_RECYCLE,
+        "pool_size": 5,
+        "max_overflow": 10,
+    }
+
+
+def create_engine_for_mode(mode: Optional[str] = None, url: Optional[str] = None) -> AsyncEngine:
+    """
+    Create the async engine for a pool mode (DB_POOL_MODE by default).
+
+    Connects to DATABASE_URL unless another URL is given. Pool and query
+    latencies are recorded on engine.pool.metrics (see /health/pool),
+    slow statements are logged (see api/utils/query_log.py) and transient
+    connect failures are retried (see api/utils/retry.py).
+    """
+    mode = resolve_pool_mode(mode)
+    url = _async_database_url(url)
+    if mode == "pgbouncer":
+        url = pooler_url(url)
+    engine = create_async_engine(url, future=True, **engine_options(mode))
+    instrument_engine(engine.sync_engine, EngineMetrics())
+    install_slow_query_log(engine.sync_engine)
+    install_connect_retry(engine.sync_engine, RetryPolicy.from_settings())
+    return engine
+
+
+pool_mode = resolve_pool_mode()
+
+# The engine is created on first use rather than at import, so routes that
+# never query (health, root, cached catalog hits) don't pay for the URL
+# handling, dialect import and engine setup, and a missing DATABASE_URL
+# only fails the requests that need the database.
+_engine: Optional[AsyncEngine] = None
+_read_engine: Optional[AsyncEngine] = None
+
+
+def get_engine() -> AsyncEngine:
+    """Return the async engine, creating it on first use"""
+    global _engine
+    if _engine is None:
+        _engine = create_engine_for_mode()
+    return _engine
+
+
+def get_read_engine() -> AsyncEngine:
+    """
+    Return the engine for read-only traffic.
+
+    Connects to DATABASE_READ_URL (a read replica) when it is set and
+    falls back to the primary engine otherwise.
+    """
+    global _read_engine
+    if not settings.DATABASE_READ_URL:
+        return get_engine()
+    if _read_engine is None:
+        _read_engine = create_engine_for_mode(url=settings.DATABASE_READ_URL)
+    return _read_engine
+
+
+def __getattr__(name: str) -> Any:
+    # Keep `from api.database import engine` working
+    if name == "engine":
+        return get_engine()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+class _EngineBoundSession(Session):
+    """Session that binds to the engine lazily, when it first needs a connection"""
+
+    engine_getter = staticmethod(get_engine)
+
+    def get_bind(self, mapper=None, clause=None, bind=None, **kwargs):
+        if bind is None and self.bind is None:
+            return self.engine_getter().sync_engine
+        return super().get_bind(mapper, clause=clause, bind=bind, **kwargs)
+
+
+# Every transaction starts with SET LOCAL statement_timeout from the
+# current route's query budget
+event.listen(_EngineBoundSession, "after_begin", apply_statement_timeout)
+
+
+class _ReadEngineBoundSession(_EngineBoundSession):
+    """Session bound to the read replica engine"""
+
+    engine_getter = staticmethod(get_read_engine)
+
 
 # Create async session factory
 AsyncSessionLocal = async_sessionmaker(
-    bind=engine,
     class_=AsyncSession,
+    sync_session_class=_EngineBoundSession,
+    expire_on_commit=False,
+    autoflush=False,
+    autocommit=False
+)
+
+# Session factory for read-only traffic (replica when configured)
+ReadSessionLocal = async_sessionmaker(
+    class_=AsyncSession,
+    sync_session_class=_ReadEngineBoundSession,
     expire_on_commit=False,
     autoflush=False,
     autocommit=False
 )
 
 
+def asyncpg_connect_args() -> Dict[str, Any]:
+    """
+    Keyword arguments for opening a raw asyncpg connection to DATABASE_URL.
+
+    Used for connections that live outside the SQLAlchemy pool, such as the
+    LISTEN connection for catalog invalidation.
+    """
+    # Always the direct endpoint: LISTEN does not work through PgBouncer
+    _, params = get_engine().dialect.create_connect_args(make_url(_async_database_url()))
+    for key in ("prepared_statement_cache_size", "prepared_statement_name_func", "async_fallback"):
+        params.pop(key, None)
+    return params
+
+
 async def get_db() -> AsyncGenerator[AsyncSession, None]:
     """
     Dependency function to get async database session.
@@ -91,12 +249,57 @@ async def get_db() -> AsyncGenerator[AsyncSession, None]:
             await session.close()
 
 
+async def warm_up_pool(connections: int) -> int:
+    """
+    Open pooled connections ahead of the first requests.
+
+    Connections are opened concurrently, checked with SELECT 1 and handed
+    back to the pool. Returns how many were opened: at most the pool size,
+    and none with NullPool, which would close them straight away.
+    """
+    engine = get_engine()
+    if connections <= 0 or isinstance(engine.pool, NullPool):
+        return 0
+    connections = min(connections, engine.pool.size())
+
+    async def ping(conn):
+        await conn.start()
+        await conn.execute(text("SELECT 1"))
+
+    conns = [engine.connect() for _ in range(connections)]
+    try:
+        await asyncio.gather(*(ping(conn) for conn in conns))
+    finally:
+        await asyncio.gather(*(conn.close() for conn in conns if conn.sync_connection is not None))
+    return connections
+
+
+async def get_read_db() -> AsyncGenerator[AsyncSession, None]:
+    """
+    Dependency function to get an async session for read-only routes.
+
+    Uses the read replica when DATABASE_READ_URL is set. Replicas lag the
+    primary slightly, so routes that must see their own writes (anything
+    that writes) use get_db instead.
+    """
+    async with ReadSessionLocal() as session:
+        try:
+            yield session
+        except Exception:
+            await session.rollback()
+            raise
+        finally:
+            await session.close()
+
+
 async def init_db():
     """Initialize database tables (for development/testing)"""
-    async with engine.begin() as conn:
+    async with get_engine().begin() as conn:
         await conn.run_sync(Base.metadata.create_all)
 
 
 async def close_db():
     """Close database connections"""
-    await engine.dispose()
\ No newline at end of file
+    for engine in (_engine, _read_engine):
+        if engine is not None:
+            await engine.dispose()
\ No newline at end of file
@@ -1,10 +1,21 @@
 """FastAPI application"""
 
+import logging
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import JSONResponse
+from sqlalchemy.exc import DBAPIError
 
 from api.config import settings
+from api.database import close_db, warm_up_pool
+from api.services.catalog_listener import catalog_listener
+from api.services.catalog_service import preload_catalog
+from api.services.db_health import db_prober
+from api.utils.http_cache import DefaultCacheControlMiddleware
+from api.utils.query_budget import is_query_canceled
+from api.utils.retry import DatabaseUnavailable, is_connection_lost
 from api.routers import (
     pricing,
     addons,
@@ -17,8 +28,42 @@ from api.routers import (
     onboarding_submission,
     contact_submission,
     submissions,
+    catalog,
 )
 
+logger = logging.getLogger(__name__)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """
+    Warm up connections and caches before serving, release them on shutdown.
+
+    Warm-up is opt-in (DB_WARMUP_CONNECTIONS, CATALOG_PRELOAD) and best
+    effort: if the database is unreachable the app still starts cold.
+    """
+    try:
+        if settings.DB_WARMUP_CONNECTIONS > 0:
+            opened = await warm_up_pool(settings.DB_WARMUP_CONNECTIONS)
+            logger.info("Opened %d pooled database connections", opened)
+        if settings.CATALOG_PRELOAD:
+            loaded = await preload_catalog()
+            logger.info("Preloaded %d catalog resources", loaded)
+    except Exception:
+        logger.warning("Startup warm-up failed, serving cold", exc_info=True)
+
+    if settings.CATALOG_LISTEN_ENABLED:
+        await catalog_listener.start()
+    if settings.DB_HEALTH_PROBE_INTERVAL > 0:
+        await db_prober.start()
+
+    yield
+
+    await db_prober.stop()
+    await catalog_listener.stop()
+    await close_db()
+
+
 # Create FastAPI application with API Key security scheme for Swagger
 app = FastAPI(
     title="Lunaxcode API",
@@ -31,6 +76,7 @@ app = FastAPI(
         "clientId": "swagger-ui",
         "appName": "Lunaxcode API",
     },
+    lifespan=lifespan,
 )
 
 # Add API Key security scheme to OpenAPI schema
@@ -67,6 +113,19 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Only routes that opt in (public catalog GETs) may be stored by the edge;
+# admin, submission and health responses default to private, no-store
+app.add_middleware(DefaultCacheControlMiddleware)
+
+
+def database_unavailable_response() -> JSONResponse:
+    """503 for a database that stayed unreachable through the connect retries"""
+    return JSONResponse(
+        status_code=503,
+        content={"detail": "Database temporarily unavailable, please retry"},
+        headers={"Retry-After": "2"},
+    )
+
 
 # Global exception handler
 @app.exception_handler(Exception)
@@ -86,6 +145,26 @@ async def global_exception_handler(request, exc):
         )
 
 
+@app.exception_handler(DBAPIError)
+async def database_exception_handler(request, exc):
+    """Map cancelled statements and lost connections to 503"""
+    if is_query_canceled(exc):
+        return JSONResponse(
+            status_code=503,
+            content={"detail": "Database query took too long, please retry"},
+            headers={"Retry-After": "1"},
+        )
+    if is_connection_lost(exc):
+        return database_unavailable_response()
+    return await global_exception_handler(request, exc)
+
+
+@app.exception_handler(DatabaseUnavailable)
+async def database_unavailable_handler(request, exc):
+    """503 for a connection that could not be opened"""
+    return database_unavailable_response()
+
+
 # Include routers with /api/v1 prefix
 API_V1_PREFIX = "/api/v1"
 
@@ -96,6 +175,7 @@ app.include_router(services.router, prefix=API_V1_PREFIX)
 app.include_router(features.router, prefix=API_V1_PREFIX)
 app.include_router(company.router, prefix=API_V1_PREFIX)
 app.include_router(onboarding.router, prefix=API_V1_PREFIX)
+app.include_router(catalog.router, prefix=API_V1_PREFIX)
 app.include_router(leads.router, prefix=API_V1_PREFIX)
 app.include_router(onboarding_submission.router, prefix=API_V1_PREFIX)
 app.include_router(contact_submission.router, prefix=API_V1_PREFIX)
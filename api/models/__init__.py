@@ -7,6 +7,8 @@ from api.models.feature import Feature
 from api.models.company import CompanyInfo
 from api.models.onboarding import OnboardingQuestion
 from api.models.lead import Lead
+from api.models.idempotency_key import IdempotencyKey
+from api.models.edge_purge import EdgePurge
 
 __all__ = [
     "PricingPlan",
@@ -16,4 +18,6 @@ __all__ = [
     "CompanyInfo",
     "OnboardingQuestion",
     "Lead",
+    "IdempotencyKey",
+    "EdgePurge",
 ]
\ No newline at end of file
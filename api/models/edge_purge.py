@@ -0,0 +1,16 @@
+"""Edge cache purge model"""
+
+from sqlalchemy import Column, String, TIMESTAMP
+from sqlalchemy.sql import func
+
+from api.database import Base
+
+
+class EdgePurge(Base):
+    """Surrogate key made stale by an admin write, awaiting an edge cache purge"""
+
+    __tablename__ = "edge_cache_purges"
+
+    surrogate_key = Column(String(255), primary_key=True)  # e.g. 'pricing:landing_page'
+    # First write to the key since it was last purged
+    recorded_at = Column(TIMESTAMP(timezone=True), server_default=func.now())
@@ -0,0 +1,19 @@
+"""Idempotency key model"""
+
+from sqlalchemy import Column, String, Integer, JSON, TIMESTAMP
+from sqlalchemy.sql import func
+
+from api.database import Base
+
+
+class IdempotencyKey(Base):
+    """Response of a write sent with an Idempotency-Key, returned again on a repeat"""
+
+    __tablename__ = "idempotency_keys"
+
+    key = Column(String(255), primary_key=True)  # Unique: a second write with the key cannot commit
+    route = Column(String(100), nullable=False)  # e.g. 'POST /leads'
+    request_hash = Column(String(64), nullable=False)  # sha256 of the request body
+    status_code = Column(Integer, nullable=False)
+    response = Column(JSON, nullable=False)
+    created_at = Column(TIMESTAMP(timezone=True), server_default=func.now(), index=True)
@@ -18,7 +18,8 @@ class Lead(Base):
     company = Column(String)
     project_description = Column(Text)
     answers = Column(JSON, nullable=False)  # Structured data for queries
-    ai_prompt = Column(Text, nullable=False)  # AI-formatted prompt
+    ai_prompt = Column(Text)  # AI-formatted prompt; NULL until rendered (deferred mode)
+    prompt_version = Column(String(16))  # Version of the pricing/questions it was rendered from
     status = Column(String, default="new")  # 'new', 'contacted', 'converted', 'rejected'
     created_at = Column(TIMESTAMP(timezone=True), server_default=func.now())
     updated_at = Column(
@@ -0,0 +1,47 @@
+"""Pre-built statements for hot parameterized lookups
+
+Building select(Model).filter(Model.id == x) per request makes SQLAlchemy
+construct the statement and walk it to derive its compiled-cache key every
+time. The statements here are built once with a bound parameter, so each
+execution only binds the value; they also render the same SQL string on
+every call, which keeps asyncpg's per-connection prepared statement cache
+warm on pooled modes (see DB_PREPARED_STATEMENT_CACHE_SIZE).
+
+Usage:
+    plan = await fetch_one(db, PRICING_PLAN_BY_ID, plan_id)
+"""
+
+from typing import Any, Optional
+
+from sqlalchemy import Select, bindparam, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from api.models.addon import Addon
+from api.models.company import CompanyInfo
+from api.models.contact_submission import ContactSubmission
+from api.models.feature import Feature
+from api.models.lead import Lead
+from api.models.onboarding_submission import OnboardingSubmission
+from api.models.pricing import PricingPlan
+from api.models.service import Service
+
+
+def by_id(model) -> Select:
+    """select(model) filtered on a bound :id parameter"""
+    return select(model).where(model.id == bindparam("id"))
+
+
+PRICING_PLAN_BY_ID = by_id(PricingPlan)
+SERVICE_BY_ID = by_id(Service)
+ADDON_BY_ID = by_id(Addon)
+FEATURE_BY_ID = by_id(Feature)
+COMPANY_INFO_BY_ID = by_id(CompanyInfo)
+LEAD_BY_ID = by_id(Lead)
+SUBMISSION_BY_ID = by_id(OnboardingSubmission)
+CONTACT_BY_ID = by_id(ContactSubmission)
+
+
+async def fetch_one(db: AsyncSession, statement: Select, id: Any) -> Optional[Any]:
+    """Execute a by-id statement and return the object, or None"""
+    result = await db.execute(statement, {"id": id})
+    return result.scalar_one_or_none()
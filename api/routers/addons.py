@@ -1,31 +1,35 @@
 """Add-on routes"""
 
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Request
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
 from typing import List
 
-from api.database import get_db
+from api.database import get_db, get_read_db
 from api.models.addon import Addon
+from api.queries import ADDON_BY_ID, fetch_one
 from api.schemas.addon import AddonCreate, AddonUpdate, AddonResponse
+from api.services.catalog_service import serve_catalog, commit_catalog_change
 from api.utils.auth import verify_api_key
+from api.utils.query_budget import BudgetedRoute
 
-router = APIRouter(prefix="/addons", tags=["addons"])
+router = APIRouter(prefix="/addons", tags=["addons"], route_class=BudgetedRoute)
 
 
 @router.get("", response_model=List[AddonResponse])
-async def get_addons(db: AsyncSession = Depends(get_db)):
+async def get_addons(request: Request, db: AsyncSession = Depends(get_read_db)):
     """Get all add-ons (public)"""
-    result = await db.execute(select(Addon))
-    return result.scalars().all()
+    return await serve_catalog(request, "addons", db)
 
 
 @router.get("/{addon_id}", response_model=AddonResponse)
-async def get_addon(addon_id: int, db: AsyncSession = Depends(get_db)):
+async def get_addon(
+    addon_id: int,
+    request: Request,
+    db: AsyncSession = Depends(get_read_db)
+):
     """Get specific add-on (public)"""
-    result = await db.execute(select(Addon).filter(Addon.id == addon_id))
-    addon = result.scalar_one_or_none()
-    if not addon:
+    addon = await serve_catalog(request, "addons", db, addon_id)
+    if addon is None:
         raise HTTPException(status_code=404, detail="Add-on not found")
     return addon
 
@@ -39,7 +43,8 @@ async def create_addon(
     """Create add-on (admin)"""
     db_addon = Addon(**addon.model_dump())
     db.add(db_addon)
-    await db.commit()
+    await db.flush()
+    await commit_catalog_change(db, "addons", db_addon.id)
     await db.refresh(db_addon)
     return db_addon
 
@@ -52,15 +57,14 @@ async def update_addon(
     api_key: str = Depends(verify_api_key)
 ):
     """Update add-on (admin)"""
-    result = await db.execute(select(Addon).filter(Addon.id == addon_id))
-    db_addon = result.scalar_one_or_none()
+    db_addon = await fetch_one(db, ADDON_BY_ID, addon_id)
     if not db_addon:
         raise HTTPException(status_code=404, detail="Add-on not found")
 
     for field, value in addon.model_dump(exclude_unset=True).items():
         setattr(db_addon, field, value)
 
-    await db.commit()
+    await commit_catalog_change(db, "addons", addon_id)
     await db.refresh(db_addon)
     return db_addon
 
@@ -72,11 +76,10 @@ async def delete_addon(
     api_key: str = Depends(verify_api_key)
 ):
     """Delete add-on (admin)"""
-    result = await db.execute(select(Addon).filter(Addon.id == addon_id))
-    db_addon = result.scalar_one_or_none()
+    db_addon = await fetch_one(db, ADDON_BY_ID, addon_id)
     if not db_addon:
         raise HTTPException(status_code=404, detail="Add-on not found")
 
     await db.delete(db_addon)
-    await db.commit()
+    await commit_catalog_change(db, "addons", addon_id)
     return None
\ No newline at end of file
@@ -0,0 +1,55 @@
+"""Site catalog bundle routes"""
+
+from fastapi import APIRouter, Depends, Query, Request
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import List, Optional
+
+from api.database import get_db, get_read_db
+from api.schemas.catalog import CatalogResponse
+from api.services.catalog_service import clear_purges, pending_purges, serve_catalog_bundle
+from api.utils.auth import verify_api_key
+from api.utils.query_budget import BudgetedRoute
+
+router = APIRouter(prefix="/catalog", tags=["catalog"], route_class=BudgetedRoute)
+
+
+@router.get("", response_model=CatalogResponse)
+async def get_catalog(request: Request, db: AsyncSession = Depends(get_read_db)):
+    """
+    Get the whole public catalog in one request (public).
+
+    Bundles pricing plans, add-ons, services, features, company information
+    and onboarding questions so a page load needs a single round trip.
+    """
+    return await serve_catalog_bundle(request, db)
+
+
+@router.get("/purges")
+async def get_pending_purges(
+    db: AsyncSession = Depends(get_db),
+    api_key: str = Depends(verify_api_key)
+):
+    """
+    List edge cache surrogate keys made stale by admin writes (admin).
+
+    surrogate_key is ready to pass to the CDN's purge-by-tag call.
+    """
+    purges = await pending_purges(db)
+    return {
+        "surrogate_key": " ".join(purges),
+        "keys": [
+            {"key": key, "recorded_at": recorded_at}
+            for key, recorded_at in purges.items()
+        ],
+    }
+
+
+@router.delete("/purges", status_code=204)
+async def acknowledge_purges(
+    keys: Optional[List[str]] = Query(None),
+    db: AsyncSession = Depends(get_db),
+    api_key: str = Depends(verify_api_key)
+):
+    """Forget purged surrogate keys, or all of them if none are given (admin)"""
+    await clear_purges(db, keys)
+    return None
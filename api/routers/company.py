@@ -1,23 +1,23 @@
 """Company information routes"""
 
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Request
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
 
-from api.database import get_db
-from api.models.company import CompanyInfo
+from api.database import get_db, get_read_db
+from api.queries import COMPANY_INFO_BY_ID, fetch_one
 from api.schemas.company import CompanyInfoUpdate, CompanyInfoResponse
+from api.services.catalog_service import serve_catalog, commit_catalog_change
 from api.utils.auth import verify_api_key
+from api.utils.query_budget import BudgetedRoute
 
-router = APIRouter(prefix="/company", tags=["company"])
+router = APIRouter(prefix="/company", tags=["company"], route_class=BudgetedRoute)
 
 
 @router.get("", response_model=CompanyInfoResponse)
-async def get_company_info(db: AsyncSession = Depends(get_db)):
+async def get_company_info(request: Request, db: AsyncSession = Depends(get_read_db)):
     """Get company information (public)"""
-    result = await db.execute(select(CompanyInfo).filter(CompanyInfo.id == 1))
-    company = result.scalar_one_or_none()
-    if not company:
+    company = await serve_catalog(request, "company", db, 1)
+    if company is None:
         raise HTTPException(status_code=404, detail="Company information not found")
     return company
 
@@ -29,14 +29,13 @@ async def update_company_info(
     api_key: str = Depends(verify_api_key)
 ):
     """Update company information (admin)"""
-    result = await db.execute(select(CompanyInfo).filter(CompanyInfo.id == 1))
-    db_company = result.scalar_one_or_none()
+    db_company = await fetch_one(db, COMPANY_INFO_BY_ID, 1)
     if not db_company:
         raise HTTPException(status_code=404, detail="Company information not found")
 
     for field, value in company.model_dump(exclude_unset=True).items():
         setattr(db_company, field, value)
 
-    await db.commit()
+    await commit_catalog_change(db, "company", 1)
     await db.refresh(db_company)
     return db_company
\ No newline at end of file
@@ -5,7 +5,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from typing import List
 from uuid import UUID
 
-from api.database import get_db
+from api.database import get_db, get_read_db
 from api.schemas.contact_submission import (
     ContactSubmissionCreate,
     ContactSubmissionResponse,
@@ -18,8 +18,9 @@ from api.services.contact_service import (
     update_contact_status
 )
 from api.utils.auth import verify_api_key
+from api.utils.query_budget import BudgetedRoute
 
-router = APIRouter(prefix="/contact", tags=["contact"])
+router = APIRouter(prefix="/contact", tags=["contact"], route_class=BudgetedRoute)
 
 
 @router.post("/submit", response_model=ContactSubmissionResponse, status_code=201)
@@ -57,7 +58,7 @@ async def list_contacts(
     status: str = None,
     skip: int = 0,
     limit: int = 100,
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
     api_key: str = Depends(verify_api_key)
 ):
     """List all contact submissions (admin only)"""
@@ -1,31 +1,35 @@
 """Feature routes"""
 
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Request
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
 from typing import List
 
-from api.database import get_db
+from api.database import get_db, get_read_db
 from api.models.feature import Feature
+from api.queries import FEATURE_BY_ID, fetch_one
 from api.schemas.feature import FeatureCreate, FeatureUpdate, FeatureResponse
+from api.services.catalog_service import serve_catalog, commit_catalog_change
 from api.utils.auth import verify_api_key
+from api.utils.query_budget import BudgetedRoute
 
-router = APIRouter(prefix="/features", tags=["features"])
+router = APIRouter(prefix="/features", tags=["features"], route_class=BudgetedRoute)
 
 
 @router.get("", response_model=List[FeatureResponse])
-async def get_features(db: AsyncSession = Depends(get_db)):
+async def get_features(request: Request, db: AsyncSession = Depends(get_read_db)):
     """Get all features ordered by display_order (public)"""
-    result = await db.execute(select(Feature).order_by(Feature.display_order))
-    return result.scalars().all()
+    return await serve_catalog(request, "features", db)
 
 
 @router.get("/{feature_id}", response_model=FeatureResponse)
-async def get_feature(feature_id: int, db: AsyncSession = Depends(get_db)):
+async def get_feature(
+    feature_id: int,
+    request: Request,
+    db: AsyncSession = Depends(get_read_db)
+):
     """Get specific feature (public)"""
-    result = await db.execute(select(Feature).filter(Feature.id == feature_id))
-    feature = result.scalar_one_or_none()
-    if not feature:
+    feature = await serve_catalog(request, "features", db, feature_id)
+    if feature is None:
         raise HTTPException(status_code=404, detail="Feature not found")
     return feature
 
@@ -39,7 +43,8 @@ async def create_feature(
     """Create feature (admin)"""
     db_feature = Feature(**feature.model_dump())
     db.add(db_feature)
-    await db.commit()
+    await db.flush()
+    await commit_catalog_change(db, "features", db_feature.id)
     await db.refresh(db_feature)
     return db_feature
 
@@ -52,15 +57,14 @@ async def update_feature(
     api_key: str = Depends(verify_api_key)
 ):
     """Update feature (admin)"""
-    result = await db.execute(select(Feature).filter(Feature.id == feature_id))
-    db_feature = result.scalar_one_or_none()
+    db_feature = await fetch_one(db, FEATURE_BY_ID, feature_id)
     if not db_feature:
         raise HTTPException(status_code=404, detail="Feature not found")
 
     for field, value in feature.model_dump(exclude_unset=True).items():
         setattr(db_feature, field, value)
 
-    await db.commit()
+    await commit_catalog_change(db, "features", feature_id)
     await db.refresh(db_feature)
     return db_feature
 
@@ -72,11 +76,10 @@ async def delete_feature(
     api_key: str = Depends(verify_api_key)
 ):
     """Delete feature (admin)"""
-    result = await db.execute(select(Feature).filter(Feature.id == feature_id))
-    db_feature = result.scalar_one_or_none()
+    db_feature = await fetch_one(db, FEATURE_BY_ID, feature_id)
     if not db_feature:
         raise HTTPException(status_code=404, detail="Feature not found")
 
     await db.delete(db_feature)
-    await db.commit()
+    await commit_catalog_change(db, "features", feature_id)
     return None
\ No newline at end of file
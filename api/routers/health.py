@@ -1,12 +1,16 @@
 """Health check routes"""
 
-from fastapi import APIRouter, Depends
-from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import text
+from fastapi import APIRouter, BackgroundTasks, Depends, Query
 
-from api.database import get_db
+from api import database
+from api.services.catalog_listener import catalog_listener
+from api.services.catalog_service import catalog_cache, catalog_flight
+from api.services.db_health import db_prober
+from api.utils.auth import verify_api_key
+from api.utils.db_metrics import engine_report
+from api.utils.query_budget import BudgetedRoute
 
-router = APIRouter(prefix="/health", tags=["health"])
+router = APIRouter(prefix="/health", tags=["health"], route_class=BudgetedRoute)
 
 
 @router.get("")
@@ -20,18 +24,37 @@ async def health_check():
 
 
 @router.get("/db")
-async def database_health(db: AsyncSession = Depends(get_db)):
-    """Database connection health check"""
-    try:
-        # Execute simple query to test connection
-        await db.execute(text("SELECT 1"))
-        return {
-            "status": "healthy",
-            "database": "connected"
-        }
-    except Exception as e:
-        return {
-            "status": "unhealthy",
-            "database": "disconnected",
-            "error": str(e)
-        }
\ No newline at end of file
+async def database_health(
+    background_tasks: BackgroundTasks,
+    fresh: bool = Query(False, description="Probe the database now instead of returning the last result"),
+):
+    """Database connection health check (last probe result)"""
+    if fresh or db_prober.healthy is None:
+        await db_prober.probe()
+    elif db_prober.stale:
+        background_tasks.add_task(db_prober.probe)
+    return db_prober.report()
+
+
+@router.get("/cache")
+async def cache_health(api_key: str = Depends(verify_api_key)):
+    """Catalog cache and request coalescing statistics (admin)"""
+    return {
+        "catalog_cache": catalog_cache.stats(),
+        "single_flight": catalog_flight.stats(),
+        "listener": catalog_listener.stats(),
+    }
+
+
+@router.get("/pool")
+async def pool_health(api_key: str = Depends(verify_api_key)):
+    """Connection pool usage and latency histograms per created engine (admin)"""
+    engines = {"primary": database._engine, "read": database._read_engine}
+    return {
+        "pool_mode": database.pool_mode,
+        "engines": {
+            name: engine_report(engine.sync_engine)
+            for name, engine in engines.items()
+            if engine is not None
+        },
+    }
@@ -1,42 +1,138 @@
 """Lead routes with dual data storage"""
 
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, Query, Request
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
-from typing import List, Optional
+from typing import Any, Dict, List, Optional
 
-from api.database import get_db
-from api.schemas.lead import LeadCreate, LeadUpdate, LeadResponse
-from api.services.lead_service import create_lead, get_lead, get_leads, update_lead, delete_lead
+from api.database import get_db, get_read_db
+from api.schemas.lead import LeadCreate, LeadListItem, LeadUpdate, LeadResponse
+from api.services.idempotency import check_key, request_hash, saved_response
+from api.services.lead_service import (
+    LEAD_ROUTE,
+    create_lead,
+    get_lead_with_prompt,
+    get_leads,
+    update_lead,
+    delete_lead,
+    render_deferred_prompt,
+)
+from api.services.lead_import import (
+    CSV_TYPES,
+    DEFAULT_BATCH_SIZE,
+    NDJSON_TYPES,
+    import_leads,
+    iter_lines,
+    parse_csv,
+    parse_ndjson,
+)
+from api.services.prompt_regeneration import DEFAULT_CHUNK_SIZE, regenerate_prompts
 from api.utils.auth import verify_api_key
+from api.utils.exceptions import ValidationException
+from api.utils.fields import FIELDS_DESCRIPTION, parse_fields, project
+from api.utils.query_budget import EXPORT_BUDGET, BudgetedRoute
+from api.utils.retry import IDEMPOTENCY_KEY_HEADER, idempotent_writes
 
-router = APIRouter(prefix="/leads", tags=["leads"])
+router = APIRouter(prefix="/leads", tags=["leads"], route_class=BudgetedRoute)
 
 
-@router.post("", response_model=LeadResponse, status_code=201)
-async def submit_lead(lead: LeadCreate, db: AsyncSession = Depends(get_db)):
+@router.post("", response_model=LeadResponse, status_code=201, dependencies=[Depends(idempotent_writes)])
+async def submit_lead(
+    lead: LeadCreate,
+    request: Request,
+    background_tasks: BackgroundTasks,
+    db: AsyncSession = Depends(get_db)
+):
     """
     Submit new lead (public endpoint).
 
     This endpoint implements dual data storage:
     - Stores structured answers (JSONB) for queries
     - Auto-generates AI-formatted prompt (TEXT) for LLM processing
+      (after responding when LEAD_PROMPT_MODE=deferred)
+
+    With an Idempotency-Key header, a repeat of a committed request returns
+    the original response instead of creating another lead.
     """
+    key = request.headers.get(IDEMPOTENCY_KEY_HEADER)
+    body_hash = ""
+    if key is not None:
+        key, body_hash = check_key(key), request_hash(await request.body())
+        saved = await saved_response(db, key, LEAD_ROUTE, body_hash)
+        if saved is not None:
+            return saved
     try:
-        return await create_lead(lead, db)
-    except Exception as e:
-        raise HTTPException(status_code=400, detail=str(e))
+        db_lead = await create_lead(lead, db, idempotency_key=key, body_hash=body_hash)
+    except IntegrityError as e:
+        await db.rollback()
+        # A concurrent request with the same key committed first
+        saved = await saved_response(db, key, LEAD_ROUTE, body_hash) if key is not None else None
+        if saved is not None:
+            return saved
+        raise HTTPException(status_code=400, detail=str(e.orig))
+    except ValidationException as e:
+        # Database errors are left to BudgetedRoute (replay) and the 503 handlers
+        raise HTTPException(status_code=400, detail=e.detail)
+    if db_lead.ai_prompt is None:
+        background_tasks.add_task(render_deferred_prompt, db_lead.id)
+    return db_lead
 
 
-@router.get("", response_model=List[LeadResponse])
+@router.get("", response_model=List[LeadListItem], response_model_exclude_unset=True)
 async def list_leads(
     skip: int = Query(0, ge=0),
     limit: int = Query(100, ge=1, le=100),
     status: Optional[str] = Query(None, pattern="^(new|contacted|converted|rejected)$"),
-    db: AsyncSession = Depends(get_db),
+    fields: Optional[str] = Query(None, description=FIELDS_DESCRIPTION),
+    db: AsyncSession = Depends(get_read_db),
     api_key: str = Depends(verify_api_key)
 ):
     """Get all leads with optional filtering (admin only)"""
-    return await get_leads(db, skip=skip, limit=limit, status=status)
+    columns = parse_fields(fields, LeadListItem)
+    leads = await get_leads(db, skip=skip, limit=limit, status=status, columns=columns)
+    return [project(lead, columns) for lead in leads]
+
+
+@router.post("/import", dependencies=[Depends(EXPORT_BUDGET)])
+async def import_lead_rows(
+    request: Request,
+    batch_size: int = Query(DEFAULT_BATCH_SIZE, ge=1, le=10000),
+    db: AsyncSession = Depends(get_db),
+    api_key: str = Depends(verify_api_key)
+) -> Dict[str, Any]:
+    """
+    Bulk import historical leads from a CSV or NDJSON body (admin only)
+
+    Rows that fail validation are listed in the response and skipped;
+    every other row is imported, a committed batch at a time.
+    """
+    content_type = request.headers.get("content-type", "").split(";")[0].strip().lower()
+    if content_type in CSV_TYPES:
+        parse = parse_csv
+    elif content_type in NDJSON_TYPES:
+        parse = parse_ndjson
+    else:
+        raise HTTPException(status_code=415, detail="Send text/csv or application/x-ndjson")
+
+    stats = await import_leads(parse(iter_lines(request.stream())), db, batch_size=batch_size)
+    return stats.as_dict()
+
+
+@router.post("/prompts/regenerate", dependencies=[Depends(EXPORT_BUDGET)])
+async def regenerate_lead_prompts(
+    service_type: Optional[str] = Query(None, description="Only leads for this service type"),
+    chunk_size: int = Query(DEFAULT_CHUNK_SIZE, ge=1, le=5000),
+    db: AsyncSession = Depends(get_db),
+    api_key: str = Depends(verify_api_key)
+) -> Dict[str, Any]:
+    """
+    Re-render AI prompts whose pricing/question version is out of date (admin only)
+
+    Each chunk is committed as it is written, so a run cut short by the
+    request deadline can be resumed by calling this again.
+    """
+    stats = await regenerate_prompts(db, service_type, chunk_size=chunk_size)
+    return stats.as_dict()
 
 
 @router.get("/{lead_id}", response_model=LeadResponse)
@@ -46,10 +142,7 @@ async def get_lead_by_id(
     api_key: str = Depends(verify_api_key)
 ):
     """Get specific lead (admin only)"""
-    try:
-        return await get_lead(lead_id, db)
-    except Exception as e:
-        raise HTTPException(status_code=404, detail=str(e))
+    return await get_lead_with_prompt(lead_id, db)
 
 
 @router.put("/{lead_id}", response_model=LeadResponse)
@@ -60,10 +153,7 @@ async def update_lead_status(
     api_key: str = Depends(verify_api_key)
 ):
     """Update lead status (admin only)"""
-    try:
-        return await update_lead(lead_id, lead_update, db)
-    except Exception as e:
-        raise HTTPException(status_code=404, detail=str(e))
+    return await update_lead(lead_id, lead_update, db)
 
 
 @router.delete("/{lead_id}", status_code=204)
@@ -73,8 +163,5 @@ async def delete_lead_by_id(
     api_key: str = Depends(verify_api_key)
 ):
     """Delete lead (admin only)"""
-    try:
-        await delete_lead(lead_id, db)
-        return None
-    except Exception as e:
-        raise HTTPException(status_code=404, detail=str(e))
\ No newline at end of file
+    await delete_lead(lead_id, db)
+    return None
\ No newline at end of file
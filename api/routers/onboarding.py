@@ -1,34 +1,36 @@
 """Onboarding question routes"""
 
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Request
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
 from typing import List
 
-from api.database import get_db
+from api.database import get_db, get_read_db
 from api.models.onboarding import OnboardingQuestion
 from api.schemas.onboarding import OnboardingQuestionCreate, OnboardingQuestionUpdate, OnboardingQuestionResponse
+from api.services.catalog_service import serve_catalog, commit_catalog_change
 from api.utils.auth import verify_api_key
+from api.utils.query_budget import BudgetedRoute
 
-router = APIRouter(prefix="/onboarding/questions", tags=["onboarding"])
+router = APIRouter(prefix="/onboarding/questions", tags=["onboarding"], route_class=BudgetedRoute)
 
 
 @router.get("", response_model=List[OnboardingQuestionResponse])
-async def get_all_questions(db: AsyncSession = Depends(get_db)):
+async def get_all_questions(request: Request, db: AsyncSession = Depends(get_read_db)):
     """Get all onboarding question sets (public)"""
-    result = await db.execute(select(OnboardingQuestion))
-    return result.scalars().all()
+    return await serve_catalog(request, "onboarding", db)
 
 
 @router.get("/{service_type}", response_model=OnboardingQuestionResponse)
-async def get_questions_for_service(service_type: str, db: AsyncSession = Depends(get_db)):
+async def get_questions_for_service(
+    service_type: str,
+    request: Request,
+    db: AsyncSession = Depends(get_read_db)
+):
     """Get onboarding questions for specific service type (public)"""
-    result = await db.execute(
-        select(OnboardingQuestion).filter(OnboardingQuestion.service_type == service_type)
-    )
-    questions = result.scalar_one_or_none()
+    questions = await serve_catalog(request, "onboarding", db, service_type)
 
-    if not questions:
+    if questions is None:
         raise HTTPException(
             status_code=404,
             detail=f"No onboarding questions found for service type: {service_type}"
@@ -57,7 +59,7 @@ async def create_questions(
 
     db_questions = OnboardingQuestion(**questions.model_dump())
     db.add(db_questions)
-    await db.commit()
+    await commit_catalog_change(db, "onboarding", db_questions.service_type)
     await db.refresh(db_questions)
     return db_questions
 
@@ -81,7 +83,7 @@ async def update_questions(
     for field, value in questions.model_dump(exclude_unset=True).items():
         setattr(db_questions, field, value)
 
-    await db.commit()
+    await commit_catalog_change(db, "onboarding", service_type)
     await db.refresh(db_questions)
     return db_questions
 
@@ -102,5 +104,5 @@ async def delete_questions(
         raise HTTPException(status_code=404, detail="Questions not found")
 
     await db.delete(db_questions)
-    await db.commit()
+    await commit_catalog_change(db, "onboarding", service_type)
     return None
\ No newline at end of file
@@ -1,15 +1,16 @@
 """Onboarding submission routes"""
 
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy.ext.asyncio import AsyncSession
-from typing import List
+from typing import List, Optional
 from uuid import UUID
 
-from api.database import get_db
+from api.database import get_db, get_read_db
 from api.schemas.onboarding_submission import (
     OnboardingSubmissionCreate,
     OnboardingSubmissionResponse,
     OnboardingSubmissionDetail,
+    OnboardingSubmissionListItem,
     AdminSubmissionUpdate
 )
 from api.services.onboarding_service import (
@@ -19,8 +20,10 @@ from api.services.onboarding_service import (
     update_submission_status
 )
 from api.utils.auth import verify_api_key
+from api.utils.fields import FIELDS_DESCRIPTION, parse_fields, project
+from api.utils.query_budget import BudgetedRoute
 
-router = APIRouter(prefix="/onboarding", tags=["onboarding"])
+router = APIRouter(prefix="/onboarding", tags=["onboarding"], route_class=BudgetedRoute)
 
 
 @router.post("/submit", response_model=OnboardingSubmissionResponse, status_code=201)
@@ -58,17 +61,23 @@ async def submit_onboarding(
         raise HTTPException(status_code=400, detail=str(e))
 
 
-@router.get("/submissions", response_model=List[OnboardingSubmissionDetail])
+@router.get(
+    "/submissions",
+    response_model=List[OnboardingSubmissionListItem],
+    response_model_exclude_unset=True,
+)
 async def list_submissions(
     status: str = None,
     skip: int = 0,
     limit: int = 100,
-    db: AsyncSession = Depends(get_db),
+    fields: Optional[str] = Query(None, description=FIELDS_DESCRIPTION),
+    db: AsyncSession = Depends(get_read_db),
     api_key: str = Depends(verify_api_key)
 ):
     """List all onboarding submissions (admin only)"""
-    submissions = await get_submissions(db, status=status, skip=skip, limit=limit)
-    return submissions
+    columns = parse_fields(fields, OnboardingSubmissionListItem)
+    submissions = await get_submissions(db, status=status, skip=skip, limit=limit, columns=columns)
+    return [project(submission, columns) for submission in submissions]
 
 
 @router.get("/submissions/{submission_id}", response_model=OnboardingSubmissionDetail)
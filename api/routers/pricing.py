@@ -1,31 +1,35 @@
 """Pricing plan routes"""
 
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Request
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
 from typing import List
 
-from api.database import get_db
+from api.database import get_db, get_read_db
 from api.models.pricing import PricingPlan
+from api.queries import PRICING_PLAN_BY_ID, fetch_one
 from api.schemas.pricing import PricingPlanCreate, PricingPlanUpdate, PricingPlanResponse
+from api.services.catalog_service import serve_catalog, commit_catalog_change
 from api.utils.auth import verify_api_key
+from api.utils.query_budget import BudgetedRoute
 
-router = APIRouter(prefix="/pricing", tags=["pricing"])
+router = APIRouter(prefix="/pricing", tags=["pricing"], route_class=BudgetedRoute)
 
 
 @router.get("", response_model=List[PricingPlanResponse])
-async def get_pricing_plans(db: AsyncSession = Depends(get_db)):
+async def get_pricing_plans(request: Request, db: AsyncSession = Depends(get_read_db)):
     """Get all pricing plans (public)"""
-    result = await db.execute(select(PricingPlan))
-    return result.scalars().all()
+    return await serve_catalog(request, "pricing", db)
 
 
 @router.get("/{plan_id}", response_model=PricingPlanResponse)
-async def get_pricing_plan(plan_id: str, db: AsyncSession = Depends(get_db)):
+async def get_pricing_plan(
+    plan_id: str,
+    request: Request,
+    db: AsyncSession = Depends(get_read_db)
+):
     """Get specific pricing plan (public)"""
-    result = await db.execute(select(PricingPlan).filter(PricingPlan.id == plan_id))
-    plan = result.scalar_one_or_none()
-    if not plan:
+    plan = await serve_catalog(request, "pricing", db, plan_id)
+    if plan is None:
         raise HTTPException(status_code=404, detail="Pricing plan not found")
     return plan
 
@@ -38,14 +42,13 @@ async def create_pricing_plan(
 ):
     """Create pricing plan (admin)"""
     # Check if ID already exists
-    result = await db.execute(select(PricingPlan).filter(PricingPlan.id == plan.id))
-    existing = result.scalar_one_or_none()
+    existing = await fetch_one(db, PRICING_PLAN_BY_ID, plan.id)
     if existing:
         raise HTTPException(status_code=400, detail="Pricing plan with this ID already exists")
 
     db_plan = PricingPlan(**plan.model_dump())
     db.add(db_plan)
-    await db.commit()
+    await commit_catalog_change(db, "pricing", db_plan.id)
     await db.refresh(db_plan)
     return db_plan
 
@@ -58,8 +61,7 @@ async def update_pricing_plan(
     api_key: str = Depends(verify_api_key)
 ):
     """Update pricing plan (admin)"""
-    result = await db.execute(select(PricingPlan).filter(PricingPlan.id == plan_id))
-    db_plan = result.scalar_one_or_none()
+    db_plan = await fetch_one(db, PRICING_PLAN_BY_ID, plan_id)
     if not db_plan:
         raise HTTPException(status_code=404, detail="Pricing plan not found")
 
@@ -67,7 +69,7 @@ async def update_pricing_plan(
     for key, value in plan.model_dump(exclude_unset=True).items():
         setattr(db_plan, key, value)
 
-    await db.commit()
+    await commit_catalog_change(db, "pricing", plan_id)
     await db.refresh(db_plan)
     return db_plan
 
@@ -79,11 +81,10 @@ async def delete_pricing_plan(
     api_key: str = Depends(verify_api_key)
 ):
     """Delete pricing plan (admin)"""
-    result = await db.execute(select(PricingPlan).filter(PricingPlan.id == plan_id))
-    db_plan = result.scalar_one_or_none()
+    db_plan = await fetch_one(db, PRICING_PLAN_BY_ID, plan_id)
     if not db_plan:
         raise HTTPException(status_code=404, detail="Pricing plan not found")
 
     await db.delete(db_plan)
-    await db.commit()
+    await commit_catalog_change(db, "pricing", plan_id)
     return None
\ No newline at end of file
@@ -1,31 +1,35 @@
 """Service routes"""
 
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Request
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
 from typing import List
 
-from api.database import get_db
+from api.database import get_db, get_read_db
 from api.models.service import Service
+from api.queries import SERVICE_BY_ID, fetch_one
 from api.schemas.service import ServiceCreate, ServiceUpdate, ServiceResponse
+from api.services.catalog_service import serve_catalog, commit_catalog_change
 from api.utils.auth import verify_api_key
+from api.utils.query_budget import BudgetedRoute
 
-router = APIRouter(prefix="/services", tags=["services"])
+router = APIRouter(prefix="/services", tags=["services"], route_class=BudgetedRoute)
 
 
 @router.get("", response_model=List[ServiceResponse])
-async def get_services(db: AsyncSession = Depends(get_db)):
+async def get_services(request: Request, db: AsyncSession = Depends(get_read_db)):
     """Get all services (public)"""
-    result = await db.execute(select(Service))
-    return result.scalars().all()
+    return await serve_catalog(request, "services", db)
 
 
 @router.get("/{service_id}", response_model=ServiceResponse)
-async def get_service(service_id: str, db: AsyncSession = Depends(get_db)):
+async def get_service(
+    service_id: str,
+    request: Request,
+    db: AsyncSession = Depends(get_read_db)
+):
     """Get specific service (public)"""
-    result = await db.execute(select(Service).filter(Service.id == service_id))
-    service = result.scalar_one_or_none()
-    if not service:
+    service = await serve_catalog(request, "services", db, service_id)
+    if service is None:
         raise HTTPException(status_code=404, detail="Service not found")
     return service
 
@@ -37,14 +41,13 @@ async def create_service(
     api_key: str = Depends(verify_api_key)
 ):
     """Create service (admin)"""
-    result = await db.execute(select(Service).filter(Service.id == service.id))
-    existing = result.scalar_one_or_none()
+    existing = await fetch_one(db, SERVICE_BY_ID, service.id)
     if existing:
         raise HTTPException(status_code=400, detail="Service with this ID already exists")
 
     db_service = Service(**service.model_dump())
     db.add(db_service)
-    await db.commit()
+    await commit_catalog_change(db, "services", db_service.id)
     await db.refresh(db_service)
     return db_service
 
@@ -57,15 +60,14 @@ async def update_service(
     api_key: str = Depends(verify_api_key)
 ):
     """Update service (admin)"""
-    result = await db.execute(select(Service).filter(Service.id == service_id))
-    db_service = result.scalar_one_or_none()
+    db_service = await fetch_one(db, SERVICE_BY_ID, service_id)
     if not db_service:
         raise HTTPException(status_code=404, detail="Service not found")
 
     for field, value in service.model_dump(exclude_unset=True).items():
         setattr(db_service, field, value)
 
-    await db.commit()
+    await commit_catalog_change(db, "services", service_id)
     await db.refresh(db_service)
     return db_service
 
@@ -77,11 +79,10 @@ async def delete_service(
     api_key: str = Depends(verify_api_key)
 ):
     """Delete service (admin)"""
-    result = await db.execute(select(Service).filter(Service.id == service_id))
-    db_service = result.scalar_one_or_none()
+    db_service = await fetch_one(db, SERVICE_BY_ID, service_id)
     if not db_service:
         raise HTTPException(status_code=404, detail="Service not found")
 
     await db.delete(db_service)
-    await db.commit()
+    await commit_catalog_change(db, "services", service_id)
     return None
\ No newline at end of file
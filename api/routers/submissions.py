@@ -4,17 +4,18 @@ from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy.ext.asyncio import AsyncSession
 from uuid import UUID
 
-from api.database import get_db
+from api.database import get_read_db
 from api.schemas.onboarding_submission import SubmissionStatusResponse
 from api.services.onboarding_service import get_submission_by_id
+from api.utils.query_budget import BudgetedRoute
 
-router = APIRouter(prefix="/submissions", tags=["submissions"])
+router = APIRouter(prefix="/submissions", tags=["submissions"], route_class=BudgetedRoute)
 
 
 @router.get("/{submission_id}/status", response_model=SubmissionStatusResponse)
 async def get_submission_status(
     submission_id: UUID,
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_read_db)
 ):
     """
     Check submission status (public endpoint)
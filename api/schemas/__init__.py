@@ -6,7 +6,8 @@ from api.schemas.service import ServiceBase, ServiceCreate, ServiceUpdate, Servi
 from api.schemas.feature import FeatureBase, FeatureCreate, FeatureUpdate, FeatureResponse
 from api.schemas.company import CompanyInfoBase, CompanyInfoUpdate, CompanyInfoResponse
 from api.schemas.onboarding import OnboardingQuestionBase, OnboardingQuestionCreate, OnboardingQuestionUpdate, OnboardingQuestionResponse
-from api.schemas.lead import LeadBase, LeadCreate, LeadUpdate, LeadResponse
+from api.schemas.lead import LeadBase, LeadCreate, LeadImport, LeadUpdate, LeadResponse, LeadListItem
+from api.schemas.catalog import CatalogResponse
 
 __all__ = [
     "PricingPlanBase",
@@ -34,6 +35,9 @@ __all__ = [
     "OnboardingQuestionResponse",
     "LeadBase",
     "LeadCreate",
+    "LeadImport",
     "LeadUpdate",
     "LeadResponse",
+    "LeadListItem",
+    "CatalogResponse",
 ]
\ No newline at end of file
@@ -0,0 +1,22 @@
+"""Site catalog bundle schemas"""
+
+from typing import List, Optional
+from pydantic import BaseModel
+
+from api.schemas.addon import AddonResponse
+from api.schemas.company import CompanyInfoResponse
+from api.schemas.feature import FeatureResponse
+from api.schemas.onboarding import OnboardingQuestionResponse
+from api.schemas.pricing import PricingPlanResponse
+from api.schemas.service import ServiceResponse
+
+
+class CatalogResponse(BaseModel):
+    """Whole public catalog in a single response"""
+
+    pricing: List[PricingPlanResponse]
+    addons: List[AddonResponse]
+    services: List[ServiceResponse]
+    features: List[FeatureResponse]
+    company: Optional[CompanyInfoResponse] = None
+    onboarding_questions: List[OnboardingQuestionResponse]
@@ -32,6 +32,13 @@ class LeadCreate(LeadBase):
     pass
 
 
+class LeadImport(LeadCreate):
+    """Schema for one historical lead in a bulk import (admin only)"""
+
+    status: str = Field("new", pattern="^(new|contacted|converted|rejected)$")
+    created_at: Optional[datetime] = None  # Import time when not given
+
+
 class LeadUpdate(BaseModel):
     """Schema for updating lead (admin only)"""
 
@@ -42,10 +49,32 @@ class LeadResponse(LeadBase):
     """Schema for lead response"""
 
     id: int
-    ai_prompt: str
+    ai_prompt: Optional[str]  # None until rendered when prompts are deferred
+    prompt_version: Optional[str] = None
     status: str
     created_at: datetime
     updated_at: datetime
 
     class Config:
-        from_attributes = True
\ No newline at end of file
+        from_attributes = True
+
+
+class LeadListItem(BaseModel):
+    """Lead in a list response: only the requested fields are present (?fields=)"""
+
+    id: int
+    service_type: Optional[str] = None
+    full_name: Optional[str] = None
+    email: Optional[str] = None
+    phone: Optional[str] = None
+    company: Optional[str] = None
+    project_description: Optional[str] = None
+    answers: Optional[Dict[str, Any]] = None
+    ai_prompt: Optional[str] = None
+    prompt_version: Optional[str] = None
+    status: Optional[str] = None
+    created_at: Optional[datetime] = None
+    updated_at: Optional[datetime] = None
+
+    class Config:
+        from_attributes = True
@@ -74,6 +74,26 @@ class OnboardingSubmissionDetail(BaseModel):
         from_attributes = True
 
 
+class OnboardingSubmissionListItem(BaseModel):
+    """Submission in a list response: only the requested fields are present (?fields=)"""
+    id: UUID
+    service_type: Optional[str] = None
+    customer_email: Optional[str] = None
+    customer_name: Optional[str] = None
+    customer_company: Optional[str] = None
+    customer_phone: Optional[str] = None
+    answers: Optional[Dict[str, Any]] = None
+    status: Optional[str] = None
+    payment_status: Optional[str] = None
+    payment_intent_id: Optional[str] = None
+    created_at: Optional[datetime] = None
+    updated_at: Optional[datetime] = None
+    submission_metadata: Optional[Dict[str, Any]] = None
+
+    class Config:
+        from_attributes = True
+
+
 class SubmissionStatusResponse(BaseModel):
     """Submission status check response"""
     submission_id: UUID
@@ -0,0 +1,126 @@
+"""LISTEN for catalog_changed notifications from other instances
+
+Admin writes NOTIFY catalog_changed inside their transaction (see
+commit_catalog_change). A long-running instance keeps one dedicated asyncpg
+connection LISTENing on that channel and evicts the named cache keys, so a
+write on one worker is visible on every worker without waiting for the TTL.
+
+The connection lives outside the SQLAlchemy pool. If it drops, the whole
+catalog cache is cleared (notifications may have been missed) and the
+listener reconnects with exponential backoff. Any error while connecting
+(including a bad DSN) is logged and retried the same way, so the listener
+never stops silently.
+"""
+
+import asyncio
+import logging
+from typing import TYPE_CHECKING, Any, Dict, Optional
+
+from api.database import asyncpg_connect_args
+from api.services.catalog_service import (
+    CATALOG_CHANNEL,
+    catalog_cache,
+    handle_catalog_notification,
+)
+
+if TYPE_CHECKING:
+    import asyncpg
+
+logger = logging.getLogger(__name__)
+
+
+class CatalogChangeListener:
+    """Dedicated LISTEN connection that evicts catalog cache entries"""
+
+    def __init__(
+        self,
+        connect_args: Optional[Dict[str, Any]] = None,
+        min_backoff: float = 1.0,
+        max_backoff: float = 30.0,
+    ):
+        self.connect_args = connect_args
+        self.min_backoff = min_backoff
+        self.max_backoff = max_backoff
+        self.notifications = 0
+        self.reconnects = 0
+        self._connection: Optional["asyncpg.Connection"] = None
+        self._task: Optional[asyncio.Task] = None
+        self._disconnected: Optional[asyncio.Event] = None
+
+    @property
+    def connected(self) -> bool:
+        return self._connection is not None and not self._connection.is_closed()
+
+    def _on_notify(self, connection, pid, channel, payload) -> None:
+        self.notifications += 1
+        handle_catalog_notification(payload)
+
+    def _on_terminate(self, connection) -> None:
+        logger.warning("Catalog listener connection lost, clearing catalog cache")
+        catalog_cache.clear()
+        if self._disconnected is not None:
+            self._disconnected.set()
+
+    async def _connect(self) -> None:
+        import asyncpg
+
+        connect_args = self.connect_args or asyncpg_connect_args()
+        connection = await asyncpg.connect(**connect_args)
+        try:
+            connection.add_termination_listener(self._on_terminate)
+            await connection.add_listener(CATALOG_CHANNEL, self._on_notify)
+        except BaseException:
+            await connection.close()
+            raise
+        self._connection = connection
+
+    async def _run(self) -> None:
+        import asyncpg
+
+        backoff = self.min_backoff
+        while True:
+            self._disconnected = asyncio.Event()
+            try:
+                await self._connect()
+            except Exception as exc:
+                if isinstance(exc, (OSError, asyncpg.PostgresError)):
+                    logger.warning("Catalog listener failed to connect: %s; retrying in %.0fs", exc, backoff)
+                else:
+                    logger.exception("Catalog listener failed to start; retrying in %.0fs", backoff)
+                await asyncio.sleep(backoff)
+                backoff = min(backoff * 2, self.max_backoff)
+                continue
+
+            backoff = self.min_backoff
+            await self._disconnected.wait()
+            self._connection = None
+            self.reconnects += 1
+
+    async def start(self) -> None:
+        """Start listening in the background"""
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """Stop listening and close the connection"""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        if self._connection is not None:
+            await self._connection.close()
+            self._connection = None
+
+    def stats(self) -> Dict[str, Any]:
+        """Return connection state and counters"""
+        return {
+            "connected": self.connected,
+            "notifications": self.notifications,
+            "reconnects": self.reconnects,
+        }
+
+
+catalog_listener = CatalogChangeListener()
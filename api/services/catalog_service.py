@@ -0,0 +1,815 @@
+"""Catalog service layer with in-process caching
+
+The public catalog (pricing, add-ons, services, features, company info and
+onboarding questions) changes a few times a month but is read on every page
+view. Reads go through a shared TTL cache and admin writes invalidate the
+affected keys.
+
+Every cached entry carries a strong ETag and Last-Modified derived from the
+row count and max(updated_at), so conditional requests can be answered
+with 304 from the cache, or from a cheap aggregate query on a cache miss,
+without hydrating ORM rows.
+
+Entries also hold the JSON body rendered once when they are built, so
+cache hits are returned as raw bytes without re-running response_model
+validation and serialization on every request.
+
+Resources with a soft TTL (company info) are served stale-while-revalidate:
+past the soft TTL the cached copy is still returned immediately and a
+background task refreshes it; it is only dropped at the hard TTL.
+
+Database loads are coalesced per query identity, so a burst of concurrent
+misses for the same key (an expired entry, a freshly started instance)
+awaits one in-flight query instead of stampeding the connection limit.
+
+Admin writes also NOTIFY catalog_changed with '<table>:<id>' inside their
+transaction; instances running the catalog listener evict the same keys,
+so other workers do not keep serving the old rows until their TTL.
+
+Catalog responses are marked cacheable by the edge (public, s-maxage,
+stale-while-revalidate) and tagged with Surrogate-Key: the cache key of
+the list or item, plus every resource for the bundle. Admin writes record
+the tags to purge in the edge_cache_purges table, which an admin endpoint
+hands to the deploy tooling.
+
+A snapshot of the catalog exported at build time can ship with the
+deployment. Cold instances serve misses from it without opening a database
+connection, and check each key against the database's version in the
+background; a key is only reloaded if the snapshot copy is out of date.
+"""
+
+import hashlib
+import logging
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple, Type, Union
+
+from fastapi import Request, Response
+from starlette.background import BackgroundTask
+from pydantic import BaseModel, TypeAdapter
+from sqlalchemy import JSON, delete, func, literal_column, select
+from sqlalchemy.dialects.postgresql import aggregate_order_by
+from sqlalchemy.dialects.postgresql import insert as postgresql_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from api.config import settings
+from api.database import ReadSessionLocal
+from api.models.addon import Addon
+from api.models.company import CompanyInfo
+from api.models.edge_purge import EdgePurge
+from api.models.feature import Feature
+from api.models.onboarding import OnboardingQuestion
+from api.models.pricing import PricingPlan
+from api.models.service import Service
+from api.schemas.addon import AddonResponse
+from api.schemas.company import CompanyInfoResponse
+from api.schemas.feature import FeatureResponse
+from api.schemas.onboarding import OnboardingQuestionResponse
+from api.schemas.pricing import PricingPlanResponse
+from api.schemas.service import ServiceResponse
+from api.utils.cache import SingleFlight, TTLCache
+from api.utils.snapshot import Snapshot
+from api.utils.http_cache import (
+    is_conditional,
+    is_not_modified,
+    not_modified_response,
+    shared_cache_control,
+    validator_headers,
+)
+
+logger = logging.getLogger(__name__)
+
+CATALOG_CHANNEL = "catalog_changed"
+
+JSON_MEDIA_TYPE = "application/json"
+
+CATALOG_CACHE_CONTROL = shared_cache_control(
+    settings.CATALOG_EDGE_MAX_AGE, settings.CATALOG_EDGE_STALE_WHILE_REVALIDATE
+)
+
+catalog_cache = TTLCache(
+    ttl=settings.CATALOG_CACHE_TTL,
+    max_entries=settings.CATALOG_CACHE_MAX_ENTRIES,
+)
+catalog_flight = SingleFlight()
+
+
+@dataclass(frozen=True)
+class CatalogResource:
+    """How a catalog resource is queried and serialized"""
+
+    name: str
+    model: Type[Any]
+    schema: Type[BaseModel]
+    key_column: Any
+    order_by: Any = None
+    soft_ttl: Optional[int] = None  # Enables stale-while-revalidate
+    hard_ttl: Optional[int] = None
+
+    @property
+    def list_adapter(self) -> TypeAdapter:
+        """Serializer for a list of this resource's response schema"""
+        if self.name not in _list_adapters:
+            _list_adapters[self.name] = TypeAdapter(List[self.schema])
+        return _list_adapters[self.name]
+
+
+_list_adapters: Dict[str, TypeAdapter] = {}
+
+
+CATALOG_RESOURCES: Dict[str, CatalogResource] = {
+    resource.name: resource
+    for resource in (
+        CatalogResource("pricing", PricingPlan, PricingPlanResponse, PricingPlan.id),
+        CatalogResource("addons", Addon, AddonResponse, Addon.id),
+        CatalogResource("services", Service, ServiceResponse, Service.id),
+        CatalogResource(
+            "features", Feature, FeatureResponse, Feature.id,
+            order_by=Feature.display_order,
+        ),
+        CatalogResource(
+            "company", CompanyInfo, CompanyInfoResponse, CompanyInfo.id,
+            soft_ttl=settings.COMPANY_CACHE_SOFT_TTL,
+            hard_ttl=settings.COMPANY_CACHE_HARD_TTL,
+        ),
+        CatalogResource(
+            "onboarding", OnboardingQuestion, OnboardingQuestionResponse,
+            OnboardingQuestion.service_type,
+        ),
+    )
+}
+
+
+def catalog_key(resource: str, item_id: Any = None) -> str:
+    """Cache key for a resource list (item_id=None) or a single item"""
+    if item_id is None:
+        return resource
+    return f"{resource}:{item_id}"
+
+
+@dataclass
+class CatalogEntry:
+    """Cached catalog payload with its rendered body and HTTP validators"""
+
+    data: Any
+    body: bytes
+    etag: str
+    last_modified: Optional[datetime]
+
+    def response(self) -> Response:
+        """Raw JSON response for the pre-rendered body"""
+        return Response(
+            content=self.body,
+            media_type=JSON_MEDIA_TYPE,
+            headers=validator_headers(self.etag, self.last_modified),
+        )
+
+
+def catalog_etag(key: str, count: int, last_modified: Optional[datetime]) -> str:
+    """Strong ETag for a catalog key at a given row count and max(updated_at)"""
+    stamp = last_modified.astimezone(timezone.utc).isoformat() if last_modified is not None else ""
+    digest = hashlib.sha256(f"{key}|{count}|{stamp}".encode()).hexdigest()[:32]
+    return f'"{digest}"'
+
+
+def _filtered(spec: CatalogResource, query, item_id: Any):
+    if item_id is not None:
+        query = query.filter(spec.key_column == item_id)
+    return query
+
+
+async def load_catalog_version(
+    resource: str, db: AsyncSession, item_id: Any = None
+) -> Optional[Tuple[str, Optional[datetime]]]:
+    """
+    Compute (etag, last_modified) with an aggregate query, without loading rows.
+
+    Returns None when item_id is given and the row does not exist.
+    """
+    spec = CATALOG_RESOURCES[resource]
+    query = _filtered(
+        spec,
+        select(func.count(), func.max(spec.model.updated_at)).select_from(spec.model),
+        item_id,
+    )
+    count, last_modified = (await db.execute(query)).one()
+    if item_id is not None and count == 0:
+        return None
+    return catalog_etag(catalog_key(resource, item_id), count, last_modified), last_modified
+
+
+def _build_entry(
+    resource: str, rows: Sequence[BaseModel], item_id: Any = None
+) -> CatalogEntry:
+    spec = CATALOG_RESOURCES[resource]
+    stamps = [row.updated_at for row in rows if row.updated_at is not None]
+    last_modified = max(stamps) if stamps else None
+    if item_id is None:
+        data, body = list(rows), spec.list_adapter.dump_json(rows)
+    else:
+        data = rows[0]
+        body = spec.schema.__pydantic_serializer__.to_json(data)
+    return CatalogEntry(
+        data=data,
+        body=body,
+        etag=catalog_etag(catalog_key(resource, item_id), len(rows), last_modified),
+        last_modified=last_modified,
+    )
+
+
+async def load_catalog_entry(
+    resource: str, db: AsyncSession, item_id: Any = None
+) -> Optional[CatalogEntry]:
+    """Load a catalog list (item_id=None) or item from the database"""
+    spec = CATALOG_RESOURCES[resource]
+    query = _filtered(spec, select(spec.model), item_id)
+    if item_id is None and spec.order_by is not None:
+        query = query.order_by(spec.order_by)
+    rows = [spec.schema.model_validate(row) for row in (await db.execute(query)).scalars().all()]
+
+    if item_id is not None and not rows:
+        return None
+    return _build_entry(resource, rows, item_id)
+
+
+async def load_catalog_versions(
+    resources: Iterable[str], db: AsyncSession
+) -> Dict[str, Tuple[str, Optional[datetime]]]:
+    """Compute list versions for several resources in one aggregate query"""
+    resources = list(resources)
+    versions = await load_catalog_key_versions([(resource, None) for resource in resources], db)
+    return {resource: versions[(resource, None)] for resource in resources}
+
+
+async def load_catalog_key_versions(
+    keys: Sequence[Tuple[str, Any]], db: AsyncSession
+) -> Dict[Tuple[str, Any], Optional[Tuple[str, Optional[datetime]]]]:
+    """
+    load_catalog_version for several (resource, item_id) pairs in one
+    aggregate query; items that do not exist map to None.
+    """
+    columns = []
+    for resource, item_id in keys:
+        spec = CATALOG_RESOURCES[resource]
+        count = select(func.count()).select_from(spec.model)
+        columns.append(_filtered(spec, count, item_id).scalar_subquery())
+        columns.append(_filtered(spec, select(func.max(spec.model.updated_at)), item_id).scalar_subquery())
+
+    row = (await db.execute(select(*columns))).one()
+    versions = {}
+    for index, (resource, item_id) in enumerate(keys):
+        count, last_modified = row[2 * index], row[2 * index + 1]
+        if item_id is not None and count == 0:
+            versions[(resource, item_id)] = None
+            continue
+        etag = catalog_etag(catalog_key(resource, item_id), count, last_modified)
+        versions[(resource, item_id)] = (etag, last_modified)
+    return versions
+
+
+def _json_rows(spec: CatalogResource):
+    """Scalar subquery aggregating a whole table into a JSON array"""
+    table = spec.model.__table__.alias("t")
+    row = table.table_valued()
+    if spec.order_by is not None:
+        row = aggregate_order_by(row, table.c[spec.order_by.key])
+    return select(
+        func.coalesce(func.json_agg(row), literal_column("'[]'::json"), type_=JSON)
+    ).select_from(table).scalar_subquery()
+
+
+async def load_catalog_entries(
+    resources: Iterable[str], db: AsyncSession
+) -> Dict[str, CatalogEntry]:
+    """
+    Load several catalog lists at once.
+
+    On PostgreSQL every table is aggregated with json_agg in a single
+    statement, so the whole catalog costs one round trip; other dialects
+    fall back to one query per resource.
+    """
+    resources = list(resources)
+    if db.get_bind().dialect.name != "postgresql":
+        return {resource: await load_catalog_entry(resource, db) for resource in resources}
+
+    specs = [CATALOG_RESOURCES[resource] for resource in resources]
+    row = (await db.execute(select(*[_json_rows(spec) for spec in specs]))).one()
+    return {
+        spec.name: _build_entry(
+            spec.name, [spec.schema.model_validate(item) for item in payload]
+        )
+        for spec, payload in zip(specs, row)
+    }
+
+
+def _json_row(spec: CatalogResource, item_id: Any):
+    """Scalar subquery returning one row as JSON (NULL when it does not exist)"""
+    table = spec.model.__table__.alias("t")
+    return select(
+        func.row_to_json(table.table_valued(), type_=JSON)
+    ).select_from(table).where(table.c[spec.key_column.key] == item_id).scalar_subquery()
+
+
+async def load_catalog_items(
+    keys: Sequence[Tuple[str, Any]], db: AsyncSession
+) -> Dict[Tuple[str, Any], Optional[CatalogEntry]]:
+    """
+    Load several catalog items, given as (resource, item_id) pairs, at once.
+
+    One statement on PostgreSQL, one query per item elsewhere. Items that
+    do not exist map to None.
+    """
+    if db.get_bind().dialect.name != "postgresql":
+        return {key: await load_catalog_entry(key[0], db, key[1]) for key in keys}
+
+    specs = [CATALOG_RESOURCES[resource] for resource, _ in keys]
+    row = (await db.execute(select(*[_json_row(spec, item_id) for spec, (_, item_id) in zip(specs, keys)]))).one()
+    return {
+        (spec.name, item_id): (
+            None if payload is None
+            else _build_entry(spec.name, [spec.schema.model_validate(payload)], item_id)
+        )
+        for spec, (_, item_id), payload in zip(specs, keys, row)
+    }
+
+
+# Build-time snapshot: None until first use, False when there is none
+_snapshot: Union[Snapshot, None, bool] = None
+
+
+def snapshot_path() -> Optional[Path]:
+    """Resolved CATALOG_SNAPSHOT_PATH, or None when snapshots are disabled"""
+    if not settings.CATALOG_SNAPSHOT_PATH:
+        return None
+    path = Path(settings.CATALOG_SNAPSHOT_PATH)
+    if not path.is_absolute():
+        path = Path(__file__).resolve().parents[2] / path
+    return path
+
+
+def open_catalog_snapshot() -> Optional[Snapshot]:
+    """Memory-map the catalog snapshot once per process"""
+    global _snapshot
+    if _snapshot is None:
+        path = snapshot_path()
+        _snapshot = (Snapshot.open(path) if path is not None else None) or False
+        if _snapshot:
+            logger.info(
+                "Loaded catalog snapshot %s (%d entries, generated %s)",
+                path, len(_snapshot), _snapshot.generated_at,
+            )
+    return _snapshot or None
+
+
+def _snapshot_entry(resource: str, item_id: Any = None) -> Optional[CatalogEntry]:
+    """
+    Take an entry out of the snapshot.
+
+    Each key is served from the snapshot at most once per process; after
+    that it lives in (and expires from) the regular cache.
+    """
+    snapshot = open_catalog_snapshot()
+    if snapshot is None:
+        return None
+    key = catalog_key(resource, item_id)
+    record = snapshot.get(key)
+    if record is None:
+        return None
+    snapshot.discard(key)
+
+    body, meta = record
+    spec = CATALOG_RESOURCES[resource]
+    if item_id is None:
+        data = spec.list_adapter.validate_json(body)
+    else:
+        data = spec.schema.model_validate_json(body)
+    last_modified = meta["last_modified"]
+    return CatalogEntry(
+        data=data,
+        body=body,
+        etag=meta["etag"],
+        last_modified=datetime.fromisoformat(last_modified) if last_modified else None,
+    )
+
+
+async def export_catalog_records(db: AsyncSession) -> Dict[str, Tuple[bytes, Dict[str, Any]]]:
+    """
+    Render every catalog list and item for a snapshot.
+
+    Entries are built exactly as a request would build them, so their ETags
+    match the versions the database reports until the catalog changes.
+    """
+    records = {}
+    for resource, spec in CATALOG_RESOURCES.items():
+        entry = await load_catalog_entry(resource, db)
+        entries = {catalog_key(resource): entry}
+        for row in entry.data:
+            item_id = getattr(row, spec.key_column.key)
+            entries[catalog_key(resource, item_id)] = _build_entry(resource, [row], item_id)
+        for key, item in entries.items():
+            records[key] = (item.body, {
+                "etag": item.etag,
+                "last_modified": item.last_modified.isoformat() if item.last_modified else None,
+            })
+    return records
+
+
+async def _coalesced_entry(
+    resource: str, db: AsyncSession, item_id: Any = None
+) -> Optional[CatalogEntry]:
+    """load_catalog_entry, shared with concurrent loads of the same key"""
+    return await catalog_flight.do(
+        ("entry", catalog_key(resource, item_id)),
+        lambda: load_catalog_entry(resource, db, item_id),
+    )
+
+
+# Keys with a background refresh scheduled or running
+_refreshing: set = set()
+
+
+# Monotonic time of the last write seen per resource
+_written_at: Dict[str, float] = {}
+
+
+def _store(resource: str, entry: CatalogEntry, item_id: Any = None) -> None:
+    """
+    Cache an entry, keeping stale-while-revalidate entries until the hard TTL.
+
+    With a read replica, an entry loaded within DATABASE_READ_MAX_LAG of a
+    write may predate it, so it is only cached for that long.
+    """
+    spec = CATALOG_RESOURCES[resource]
+    ttl = spec.hard_ttl
+    if settings.DATABASE_READ_URL and resource in _written_at:
+        if time.monotonic() - _written_at[resource] < settings.DATABASE_READ_MAX_LAG:
+            ttl = settings.DATABASE_READ_MAX_LAG
+    catalog_cache.set(catalog_key(resource, item_id), entry, ttl=ttl)
+
+
+def _cached(
+    resource: str, item_id: Any = None, stale: Optional[list] = None
+) -> Optional[CatalogEntry]:
+    """
+    Look up a cached entry.
+
+    Entries past their soft TTL are still returned; their (resource,
+    item_id) is appended to stale so the caller can schedule a refresh.
+    Callers that can schedule one (stale is given) also fall back to the
+    build-time snapshot, whose entries are always revalidated.
+    """
+    spec = CATALOG_RESOURCES[resource]
+    key = catalog_key(resource, item_id)
+    cached = catalog_cache.get_entry(key)
+    if cached is None:
+        if stale is None:
+            return None
+        entry = _snapshot_entry(resource, item_id)
+        if entry is not None:
+            _store(resource, entry, item_id)
+            stale.append((resource, item_id))
+        return entry
+    if (
+        stale is not None
+        and spec.soft_ttl is not None
+        and cached.age >= spec.soft_ttl
+        and key not in _refreshing
+    ):
+        stale.append((resource, item_id))
+    return cached.value
+
+
+async def refresh_catalog_entries(stale: List[Tuple[str, Any]]) -> None:
+    """
+    Revalidate stale entries in the background with a dedicated session.
+
+    All of them are checked with one aggregate version query; a cached
+    copy whose ETag still matches is kept, and only entries that actually
+    changed are reloaded (lists together, items together). Failures (e.g.
+    the database is waking up) are logged and the stale copies keep being
+    served until their hard TTL.
+    """
+    keys = list(dict.fromkeys(stale))
+    try:
+        async with ReadSessionLocal() as db:
+            versions = await catalog_flight.do(
+                ("key_versions", tuple(keys)), lambda: load_catalog_key_versions(keys, db)
+            )
+            outdated = []
+            for resource, item_id in keys:
+                version = versions[(resource, item_id)]
+                current = catalog_cache.get(catalog_key(resource, item_id))
+                if version is None:
+                    catalog_cache.invalidate(catalog_key(resource, item_id))
+                elif current is not None and current.etag == version[0]:
+                    _store(resource, current, item_id)
+                else:
+                    outdated.append((resource, item_id))
+
+            lists = [resource for resource, item_id in outdated if item_id is None]
+            items = [key for key in outdated if key[1] is not None]
+            reloaded: Dict[Tuple[str, Any], Optional[CatalogEntry]] = {}
+            if lists:
+                entries = await catalog_flight.do(
+                    ("entries", tuple(lists)), lambda: load_catalog_entries(lists, db)
+                )
+                reloaded.update({(resource, None): entry for resource, entry in entries.items()})
+            if items:
+                reloaded.update(await load_catalog_items(items, db))
+        for (resource, item_id), entry in reloaded.items():
+            if entry is None:
+                catalog_cache.invalidate(catalog_key(resource, item_id))
+            else:
+                _store(resource, entry, item_id)
+    except Exception:
+        logger.warning(
+            "Background refresh of %s failed, serving stale copies",
+            " ".join(catalog_key(*key) for key in keys), exc_info=True,
+        )
+    finally:
+        _refreshing.difference_update(catalog_key(*key) for key in keys)
+
+
+def _publish(
+    response: Response, surrogate_key: str, stale: Sequence[Tuple[str, Any]] = ()
+) -> Response:
+    """
+    Mark a catalog response as edge-cacheable and tag it for purging.
+
+    Stale entries, if any, are refreshed in a background task once the
+    response has been sent.
+    """
+    response.headers["Cache-Control"] = CATALOG_CACHE_CONTROL
+    response.headers["Surrogate-Key"] = surrogate_key
+    if stale:
+        _refreshing.update(catalog_key(resource, item_id) for resource, item_id in stale)
+        response.background = BackgroundTask(refresh_catalog_entries, list(stale))
+    return response
+
+
+async def get_catalog_entry(
+    resource: str, db: AsyncSession, item_id: Any = None
+) -> Optional[CatalogEntry]:
+    """Get a catalog list or item entry, served from cache when available"""
+    entry = _cached(resource, item_id)
+    if entry is None:
+        entry = await _coalesced_entry(resource, db, item_id)
+        if entry is not None:
+            _store(resource, entry, item_id)
+    return entry
+
+
+async def get_catalog_entries(
+    keys: Sequence[Tuple[str, Any]], db: AsyncSession
+) -> Dict[Tuple[str, Any], Optional[CatalogEntry]]:
+    """get_catalog_entry for several (resource, item_id) pairs, loading all misses together"""
+    entries = {key: _cached(*key) for key in keys}
+    missing = [key for key, entry in entries.items() if entry is None]
+    if missing:
+        for key, entry in (await load_catalog_items(missing, db)).items():
+            if entry is not None:
+                _store(key[0], entry, key[1])
+            entries[key] = entry
+    return entries
+
+
+async def serve_catalog(
+    request: Request,
+    resource: str,
+    db: AsyncSession,
+    item_id: Any = None,
+) -> Optional[Response]:
+    """
+    Serve a catalog read as pre-rendered JSON with ETag / Last-Modified.
+
+    Returns a 304 response when the client copy is current and None when
+    the requested item does not exist. On a cache miss, conditional
+    requests are first checked against an aggregate version query so that
+    matching clients never trigger a full load.
+    """
+    stale: List[Tuple[str, Any]] = []
+    entry = _cached(resource, item_id, stale)
+    surrogate_key = catalog_key(resource, item_id)
+
+    if entry is None and is_conditional(request):
+        version = await catalog_flight.do(
+            ("version", catalog_key(resource, item_id)),
+            lambda: load_catalog_version(resource, db, item_id),
+        )
+        if version is not None and is_not_modified(request, *version):
+            return _publish(not_modified_response(*version), surrogate_key)
+
+    if entry is None:
+        entry = await _coalesced_entry(resource, db, item_id)
+        if entry is None:
+            return None
+        _store(resource, entry, item_id)
+
+    if is_not_modified(request, entry.etag, entry.last_modified):
+        return _publish(not_modified_response(entry.etag, entry.last_modified), surrogate_key, stale)
+    return _publish(entry.response(), surrogate_key, stale)
+
+
+# Resources in the /catalog bundle, keyed by their field in CatalogResponse
+CATALOG_BUNDLE = {
+    "pricing": "pricing",
+    "addons": "addons",
+    "services": "services",
+    "features": "features",
+    "company": "company",
+    "onboarding_questions": "onboarding",
+}
+
+# A write to any bundled resource purges its list tag, and with it the bundle
+BUNDLE_SURROGATE_KEY = " ".join(["catalog", *CATALOG_BUNDLE.values()])
+
+
+async def preload_catalog() -> int:
+    """Load every bundled resource into the cache in one round trip"""
+    async with ReadSessionLocal() as db:
+        entries = await load_catalog_entries(CATALOG_BUNDLE.values(), db)
+    for resource, entry in entries.items():
+        _store(resource, entry)
+    return len(entries)
+
+
+def _bundle_version(
+    versions: Dict[str, Tuple[str, Optional[datetime]]]
+) -> Tuple[str, Optional[datetime]]:
+    """Combine per-resource validators into one for the bundle"""
+    joined = "|".join(versions[resource][0] for resource in CATALOG_BUNDLE.values())
+    stamps = [stamp for _, stamp in versions.values() if stamp is not None]
+    digest = hashlib.sha256(joined.encode()).hexdigest()[:32]
+    return f'"{digest}"', max(stamps) if stamps else None
+
+
+# Last rendered bundle body, with the entries it was spliced from. It is
+# keyed on those entries, not the bundle ETag: the ETag only covers row
+# counts and max(updated_at), which a write within the same second (or
+# one that leaves updated_at alone) does not change
+_bundle_body: Tuple[Tuple[CatalogEntry, ...], bytes] = ((), b"")
+
+
+def _render_bundle(entries: Dict[str, CatalogEntry]) -> bytes:
+    """Splice the per-resource bodies into one CatalogResponse document"""
+    parts = []
+    for field, resource in CATALOG_BUNDLE.items():
+        body = entries[resource].body
+        if field == "company":
+            company = entries[resource].data
+            body = (
+                CATALOG_RESOURCES[resource].schema.__pydantic_serializer__.to_json(company[0])
+                if company else b"null"
+            )
+        parts.append(b'"' + field.encode() + b'":' + body)
+    return b"{" + b",".join(parts) + b"}"
+
+
+async def serve_catalog_bundle(request: Request, db: AsyncSession) -> Response:
+    """
+    Serve the whole public catalog with combined validators.
+
+    Resources already cached are reused as-is and the rest are loaded in
+    one round trip, then cached individually so the per-resource routes
+    benefit too. The bundle body is spliced from the cached per-resource
+    bodies and kept until any of those entries is replaced.
+    """
+    global _bundle_body
+
+    stale: List[Tuple[str, Any]] = []
+    entries = {resource: _cached(resource, stale=stale) for resource in CATALOG_BUNDLE.values()}
+    missing = [resource for resource, entry in entries.items() if entry is None]
+
+    if missing and is_conditional(request):
+        versions = await catalog_flight.do(
+            ("versions", tuple(missing)), lambda: load_catalog_versions(missing, db)
+        )
+        versions.update({
+            resource: (entry.etag, entry.last_modified)
+            for resource, entry in entries.items() if entry is not None
+        })
+        etag, last_modified = _bundle_version(versions)
+        if is_not_modified(request, etag, last_modified):
+            return _publish(not_modified_response(etag, last_modified), BUNDLE_SURROGATE_KEY, stale)
+
+    if missing:
+        loaded = await catalog_flight.do(
+            ("entries", tuple(missing)), lambda: load_catalog_entries(missing, db)
+        )
+        for resource, entry in loaded.items():
+            _store(resource, entry)
+            entries[resource] = entry
+
+    etag, last_modified = _bundle_version({
+        resource: (entry.etag, entry.last_modified) for resource, entry in entries.items()
+    })
+    if is_not_modified(request, etag, last_modified):
+        return _publish(not_modified_response(etag, last_modified), BUNDLE_SURROGATE_KEY, stale)
+
+    sources = tuple(entries[resource] for resource in CATALOG_BUNDLE.values())
+    if len(sources) != len(_bundle_body[0]) or any(a is not b for a, b in zip(sources, _bundle_body[0])):
+        _bundle_body = (sources, _render_bundle(entries))
+    return _publish(
+        Response(
+            content=_bundle_body[1],
+            media_type=JSON_MEDIA_TYPE,
+            headers=validator_headers(etag, last_modified),
+        ),
+        BUNDLE_SURROGATE_KEY,
+        stale,
+    )
+
+
+def invalidate_catalog(resource: str, item_id: Any = None) -> None:
+    """
+    Drop cached entries affected by an admin write.
+
+    The resource list is always dropped; the item entry is dropped too
+    when item_id is given. Snapshot entries for the resource predate the
+    write and are dropped as well.
+    """
+    keys = [catalog_key(resource)]
+    if item_id is not None:
+        keys.append(catalog_key(resource, item_id))
+    catalog_cache.invalidate(*keys)
+    _written_at[resource] = time.monotonic()
+    snapshot = open_catalog_snapshot()
+    if snapshot is not None:
+        snapshot.discard_prefix(resource)
+
+
+async def commit_catalog_change(db: AsyncSession, resource: str, item_id: Any) -> None:
+    """
+    Commit an admin write to a catalog table and invalidate it everywhere.
+
+    On PostgreSQL a catalog_changed notification is queued in the same
+    transaction, so listeners only hear about committed changes. The
+    affected surrogate keys are recorded for an edge cache purge in that
+    transaction too, and local entries are dropped right after the commit.
+    """
+    if db.get_bind().dialect.name == "postgresql":
+        table = CATALOG_RESOURCES[resource].model.__tablename__
+        await db.execute(select(func.pg_notify(CATALOG_CHANNEL, f"{table}:{item_id}")))
+    await record_purge(db, resource, item_id)
+    await db.commit()
+    invalidate_catalog(resource, item_id)
+
+
+_INSERTS = {"postgresql": postgresql_insert, "sqlite": sqlite_insert}
+
+
+async def record_purge(db: AsyncSession, resource: str, item_id: Any = None) -> None:
+    """
+    Record the edge cache tags made stale by a write, in the write's
+    transaction. They are stored in the database, not in process, so every
+    serverless instance lists the same pending purges; a key keeps the
+    time it was first recorded.
+    """
+    keys = [catalog_key(resource)]
+    if item_id is not None:
+        keys.append(catalog_key(resource, item_id))
+    statement = _INSERTS[db.get_bind().dialect.name](EdgePurge).values(
+        [{"surrogate_key": key} for key in keys]
+    )
+    await db.execute(statement.on_conflict_do_nothing(index_elements=["surrogate_key"]))
+    logger.info("Edge cache purge pending for %s", " ".join(keys))
+
+
+async def pending_purges(db: AsyncSession) -> Dict[str, datetime]:
+    """Surrogate keys awaiting an edge cache purge, oldest first"""
+    rows = await db.execute(
+        select(EdgePurge.surrogate_key, EdgePurge.recorded_at).order_by(EdgePurge.recorded_at)
+    )
+    return dict(rows.all())
+
+
+async def clear_purges(db: AsyncSession, keys: Optional[Iterable[str]] = None) -> None:
+    """Forget purged surrogate keys (all of them when keys is None)"""
+    statement = delete(EdgePurge)
+    if keys is not None:
+        statement = statement.where(EdgePurge.surrogate_key.in_(list(keys)))
+    await db.execute(statement)
+    await db.commit()
+
+
+_RESOURCES_BY_TABLE = {spec.model.__tablename__: spec.name for spec in CATALOG_RESOURCES.values()}
+
+
+def handle_catalog_notification(payload: str) -> None:
+    """Evict local entries named by a '<table>:<id>' catalog_changed payload"""
+    table, _, item_id = payload.partition(":")
+    resource = _RESOURCES_BY_TABLE.get(table)
+    if resource is None:
+        logger.warning("Ignoring catalog notification for unknown table: %s", payload)
+        return
+    if item_id:
+        invalidate_catalog(resource, item_id)
+    else:
+        catalog_cache.invalidate_prefix(resource)
+        _written_at[resource] = time.monotonic()
+        snapshot = open_catalog_snapshot()
+        if snapshot is not None:
+            snapshot.discard_prefix(resource)
@@ -6,6 +6,7 @@ from typing import Optional, List
 from uuid import UUID
 
 from api.models.contact_submission import ContactSubmission
+from api.queries import CONTACT_BY_ID, fetch_one
 from api.schemas.contact_submission import ContactSubmissionCreate
 
 
@@ -35,10 +36,7 @@ async def get_contact_by_id(
     db: AsyncSession
 ) -> Optional[ContactSubmission]:
     """Get contact submission by ID"""
-    result = await db.execute(
-        select(ContactSubmission).filter(ContactSubmission.id == contact_id)
-    )
-    return result.scalar_one_or_none()
+    return await fetch_one(db, CONTACT_BY_ID, contact_id)
 
 
 async def get_contacts(
@@ -65,10 +63,7 @@ async def update_contact_status(
     db: AsyncSession
 ) -> Optional[ContactSubmission]:
     """Update contact status"""
-    result = await db.execute(
-        select(ContactSubmission).filter(ContactSubmission.id == contact_id)
-    )
-    contact = result.scalar_one_or_none()
+    contact = await fetch_one(db, CONTACT_BY_ID, contact_id)
     
     if not contact:
         return None
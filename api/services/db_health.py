@@ -0,0 +1,135 @@
+"""Cached database health probe
+
+GET /health/db used to open a session per request, which under NullPool is
+a full Neon handshake per uptime check and keeps compute from suspending.
+Instead one prober per instance records the outcome of SELECT 1 and the
+endpoint returns that record, probing again (after the response) once it
+is older than DB_HEALTH_MAX_AGE. Concurrent on-demand probes (?fresh=1,
+or the first request on a new instance) share a single connection
+attempt. Background probing every DB_HEALTH_PROBE_INTERVAL seconds is off
+by default, since a periodic query stops Neon from autosuspending.
+"""
+
+import asyncio
+import logging
+import time
+from datetime import datetime, timezone
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+from sqlalchemy import text
+
+from api.config import settings
+from api.database import get_engine
+from api.utils.cache import SingleFlight
+
+logger = logging.getLogger(__name__)
+
+
+async def select_one() -> None:
+    """Open a connection and run SELECT 1"""
+    async with get_engine().connect() as conn:
+        await conn.execute(text("SELECT 1"))
+
+
+class DatabaseProber:
+    """Periodically checks the database and remembers the last result"""
+
+    def __init__(
+        self,
+        check: Callable[[], Awaitable[None]] = select_one,
+        interval: Optional[float] = None,
+        timeout: Optional[float] = None,
+        max_age: Optional[float] = None,
+    ):
+        self.check = check
+        self.interval = settings.DB_HEALTH_PROBE_INTERVAL if interval is None else interval
+        self.timeout = settings.DB_HEALTH_PROBE_TIMEOUT if timeout is None else timeout
+        self.max_age = settings.DB_HEALTH_MAX_AGE if max_age is None else max_age
+        self.healthy: Optional[bool] = None
+        self.latency_ms: Optional[float] = None
+        self.last_error: Optional[str] = None
+        self.checked_at: Optional[datetime] = None
+        self.last_healthy_at: Optional[datetime] = None
+        self.consecutive_failures = 0
+        self.probes = 0
+        self._checked_monotonic: Optional[float] = None
+        self._flight = SingleFlight()
+        self._task: Optional[asyncio.Task] = None
+
+    @property
+    def age(self) -> Optional[float]:
+        """Seconds since the last probe finished"""
+        if self._checked_monotonic is None:
+            return None
+        return time.monotonic() - self._checked_monotonic
+
+    @property
+    def stale(self) -> bool:
+        return self.age is None or self.age > self.max_age
+
+    async def _probe(self) -> None:
+        start = time.perf_counter()
+        try:
+            await asyncio.wait_for(self.check(), timeout=self.timeout)
+        except Exception as exc:
+            error = str(exc) or type(exc).__name__
+            if self.healthy is not False:
+                logger.warning("Database health probe failed: %s", error)
+            self.healthy = False
+            self.last_error = error
+            self.consecutive_failures += 1
+        else:
+            if self.healthy is False:
+                logger.info("Database health probe recovered")
+            self.healthy = True
+            self.consecutive_failures = 0
+        self.latency_ms = round((time.perf_counter() - start) * 1000, 2)
+        self.checked_at = datetime.now(timezone.utc)
+        if self.healthy:
+            self.last_healthy_at = self.checked_at
+        self._checked_monotonic = time.monotonic()
+        self.probes += 1
+
+    async def probe(self) -> None:
+        """Check the database now, joining a probe already in flight"""
+        await self._flight.do("probe", self._probe)
+
+    async def _run(self) -> None:
+        while True:
+            await self.probe()
+            await asyncio.sleep(self.interval)
+
+    async def start(self) -> None:
+        """Probe in the background every interval (no-op when it is 0)"""
+        if self.interval > 0 and (self._task is None or self._task.done()):
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """Stop background probing"""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    def report(self) -> Dict[str, Any]:
+        """Last probe result; the error text is hidden in production"""
+        if self.healthy is None:
+            return {"status": "unknown", "database": "unknown"}
+        result: Dict[str, Any] = {
+            "status": "healthy" if self.healthy else "unhealthy",
+            "database": "connected" if self.healthy else "disconnected",
+            "latency_ms": self.latency_ms,
+            "checked_at": self.checked_at.isoformat(),
+            "age_seconds": round(self.age, 1),
+            "last_healthy_at": self.last_healthy_at.isoformat() if self.last_healthy_at else None,
+            "consecutive_failures": self.consecutive_failures,
+        }
+        if not self.healthy and not settings.is_production:
+            result["error"] = self.last_error
+        return result
+
+
+db_prober = DatabaseProber()
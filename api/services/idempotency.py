@@ -0,0 +1,53 @@
+"""Idempotency-Key handling for writes
+
+A route that supports keys (marked with the idempotent_writes dependency,
+see api/utils/retry.py) calls saved_response() first: a key that has
+already committed returns the original response instead of writing again.
+Otherwise the write calls record_response() before its commit, so the key
+and the write commit or roll back together. The key is the table's primary
+key, so of two concurrent requests with the same key only one can commit;
+the other gets an IntegrityError and then finds the saved response.
+
+This is what makes replaying a keyed write safe, both for clients retrying
+and for BudgetedRoute after a connection drops mid-request.
+"""
+
+import hashlib
+from typing import Any, Optional
+
+from fastapi.responses import JSONResponse
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from api.models.idempotency_key import IdempotencyKey
+from api.utils.exceptions import ValidationException
+
+MAX_KEY_LENGTH = 255
+
+
+def request_hash(body: bytes) -> str:
+    return hashlib.sha256(body).hexdigest()
+
+
+def check_key(key: str) -> str:
+    if not key or len(key) > MAX_KEY_LENGTH:
+        raise ValidationException(f"Idempotency-Key must be 1-{MAX_KEY_LENGTH} characters")
+    return key
+
+
+async def saved_response(db: AsyncSession, key: str, route: str, body_hash: str) -> Optional[JSONResponse]:
+    """The response already committed for this key, or None"""
+    saved = await db.get(IdempotencyKey, key)
+    if saved is None:
+        return None
+    if saved.route != route or saved.request_hash != body_hash:
+        raise ValidationException("Idempotency-Key was already used for a different request")
+    return JSONResponse(status_code=saved.status_code, content=saved.response)
+
+
+def record_response(
+    db: AsyncSession, key: str, route: str, body_hash: str, status_code: int, response: Any
+) -> None:
+    """Store the response for a key in the write's own (uncommitted) transaction"""
+    db.add(IdempotencyKey(
+        key=key, route=route, request_hash=body_hash, status_code=status_code, response=response,
+    ))
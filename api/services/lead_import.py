@@ -0,0 +1,271 @@
+"""Bulk import of historical leads
+
+POST /leads/import streams a CSV or NDJSON body and imports it in batches:
+
+- rows are parsed as they arrive and validated against LeadImport
+  (LeadCreate plus an optional status and created_at) a batch at a time;
+- prompts are rendered with the service type's cached PromptContext, so
+  pricing and questions are looked up once per service type, not per row;
+- a batch is loaded with asyncpg's copy_records_to_table (COPY) on
+  PostgreSQL and a multi-row INSERT elsewhere, then committed.
+
+A row that cannot be parsed or validated, or names an unknown service
+type, is reported with its row number and skipped; the rest of its batch
+is still imported. If the database rejects a batch (a constraint, a type
+error in COPY), that batch is rolled back, its rows are reported as
+failed and the import carries on with the next one; it stops, returning
+the counts so far, only if the session cannot be rolled back.
+
+CSV needs a header row with the LeadImport field names; the answers
+column holds a JSON object. Each NDJSON line is one JSON object.
+"""
+
+import codecs
+import csv
+import json
+import logging
+import time
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
+
+from pydantic import ValidationError
+from sqlalchemy import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from api.models.lead import Lead
+from api.schemas.lead import LeadImport
+from api.services.lead_service import PromptContext, get_prompt_context, render_ai_prompt
+
+logger = logging.getLogger(__name__)
+
+CSV_TYPES = frozenset({"text/csv", "application/csv"})
+NDJSON_TYPES = frozenset({"application/x-ndjson", "application/ndjson", "application/jsonl"})
+
+DEFAULT_BATCH_SIZE = 1000
+# Errors beyond this are counted but not listed in the response
+MAX_REPORTED_ERRORS = 100
+
+# Column order of the COPY records
+_COPY_COLUMNS = (
+    "service_type", "full_name", "email", "phone", "company", "project_description",
+    "answers", "ai_prompt", "prompt_version", "status", "created_at",
+)
+
+# (row number, parsed object or the RowError it could not be parsed with)
+ParsedRow = Tuple[int, Any]
+
+
+class RowError(ValueError):
+    """A row that cannot be parsed"""
+
+
+@dataclass
+class ImportStats:
+    """Outcome of a bulk import"""
+
+    received: int = 0
+    imported: int = 0
+    failed: int = 0
+    batches: int = 0
+    failed_batches: int = 0
+    stopped: Optional[str] = None  # Why the rest of the body was not read
+    errors: List[Dict[str, Any]] = field(default_factory=list)
+    started: float = field(default_factory=time.monotonic)
+    finished: Optional[float] = None
+
+    @property
+    def elapsed(self) -> float:
+        return (self.finished or time.monotonic()) - self.started
+
+    def reject(self, row: int, errors: List[str]) -> None:
+        self.failed += 1
+        if len(self.errors) < MAX_REPORTED_ERRORS:
+            self.errors.append({"row": row, "errors": errors})
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            "received": self.received,
+            "imported": self.imported,
+            "failed": self.failed,
+            "batches": self.batches,
+            "failed_batches": self.failed_batches,
+            "stopped": self.stopped,
+            "errors": self.errors,
+            "elapsed_seconds": round(self.elapsed, 3),
+            "leads_per_second": round(self.imported / self.elapsed, 1) if self.elapsed > 0 else 0.0,
+        }
+
+
+async def iter_lines(chunks: AsyncIterator[bytes]) -> AsyncIterator[str]:
+    """Decode a byte stream into lines, keeping their line endings"""
+    decoder = codecs.getincrementaldecoder("utf-8-sig")()
+    pending = ""
+    async for chunk in chunks:
+        pending += decoder.decode(chunk)
+        *lines, pending = pending.split("\n")
+        for line in lines:
+            yield line + "\n"
+    pending += decoder.decode(b"", final=True)
+    if pending:
+        yield pending
+
+
+def _csv_object(header: List[str], values: List[str]) -> Dict[str, Any]:
+    if len(values) != len(header):
+        raise RowError(f"expected {len(header)} columns, got {len(values)}")
+    # Empty cells are missing values, so optional fields keep their defaults
+    data = {name: value for name, value in zip(header, values) if value != ""}
+    if "answers" in data:
+        try:
+            data["answers"] = json.loads(data["answers"])
+        except ValueError:
+            raise RowError("answers: not valid JSON") from None
+    return data
+
+
+async def parse_csv(lines: AsyncIterator[str]) -> AsyncIterator[ParsedRow]:
+    """Parse CSV records (quoted fields may span lines) into row objects"""
+    header: Optional[List[str]] = None
+    record = ""
+    number = 0
+    async for line in lines:
+        record += line
+        if record.count('"') % 2:
+            # Inside a quoted field: the record continues on the next line
+            continue
+        text, record = record, ""
+        if not text.strip():
+            continue
+        values = next(csv.reader([text]))
+        if header is None:
+            header = [name.strip() for name in values]
+            continue
+        number += 1
+        try:
+            yield number, _csv_object(header, values)
+        except RowError as exc:
+            yield number, exc
+    if record.strip() and header is not None:
+        yield number + 1, RowError("unterminated quoted field")
+
+
+async def parse_ndjson(lines: AsyncIterator[str]) -> AsyncIterator[ParsedRow]:
+    """Parse one JSON object per non-empty line"""
+    number = 0
+    async for line in lines:
+        if not line.strip():
+            continue
+        number += 1
+        try:
+            data = json.loads(line)
+        except ValueError as exc:
+            yield number, RowError(f"not valid JSON: {exc}")
+            continue
+        yield number, data if isinstance(data, dict) else RowError("expected a JSON object")
+
+
+def _validation_messages(exc: ValidationError) -> List[str]:
+    return [f"{'.'.join(str(part) for part in error['loc'])}: {error['msg']}" for error in exc.errors()]
+
+
+async def _prepare_batch(
+    rows: List[ParsedRow],
+    db: AsyncSession,
+    contexts: Dict[str, Optional[PromptContext]],
+    stats: ImportStats,
+) -> List[Tuple[int, Dict[str, Any]]]:
+    """Validate a batch and render its prompts; rejected rows are recorded in stats"""
+    imported_at = datetime.now(timezone.utc)
+    prepared = []
+    for number, data in rows:
+        if isinstance(data, RowError):
+            stats.reject(number, [str(data)])
+            continue
+        try:
+            lead = LeadImport.model_validate(data)
+        except ValidationError as exc:
+            stats.reject(number, _validation_messages(exc))
+            continue
+
+        if lead.service_type not in contexts:
+            contexts[lead.service_type] = await get_prompt_context(lead.service_type, db)
+        context = contexts[lead.service_type]
+        if context is None:
+            stats.reject(number, [f"service_type: no pricing plan or questions for {lead.service_type}"])
+            continue
+
+        values = lead.model_dump()
+        values["ai_prompt"] = render_ai_prompt(values, context.pricing_info, context.index)
+        values["prompt_version"] = context.version
+        values["created_at"] = values["created_at"] or imported_at
+        prepared.append((number, values))
+    return prepared
+
+
+def _error_summary(exc: Exception) -> str:
+    """First line of the driver's message for a failed batch"""
+    text = str(getattr(exc, "orig", None) or exc).strip()
+    return text.splitlines()[0] if text else type(exc).__name__
+
+
+async def _write_batch(db: AsyncSession, leads: List[Dict[str, Any]]) -> None:
+    if db.get_bind().dialect.name == "postgresql":
+        # Inside a request the statement_timeout hook has already begun the
+        # transaction; otherwise COPY runs (atomically) on its own
+        connection = await db.connection()
+        raw = await connection.get_raw_connection()
+        records = [
+            tuple(json.dumps(lead[name]) if name == "answers" else lead[name] for name in _COPY_COLUMNS)
+            for lead in leads
+        ]
+        await raw.driver_connection.copy_records_to_table(
+            Lead.__tablename__, records=records, columns=_COPY_COLUMNS
+        )
+    else:
+        await db.execute(insert(Lead), leads)
+
+
+async def import_leads(
+    rows: AsyncIterator[ParsedRow], db: AsyncSession, batch_size: int = DEFAULT_BATCH_SIZE
+) -> ImportStats:
+    """Validate, render and load parsed rows a batch at a time, committing each batch"""
+    stats = ImportStats()
+    contexts: Dict[str, Optional[PromptContext]] = {}
+    batch: List[ParsedRow] = []
+
+    async def flush() -> None:
+        prepared = await _prepare_batch(batch, db, contexts, stats)
+        batch.clear()
+        stats.batches += 1
+        if not prepared:
+            return
+        try:
+            await _write_batch(db, [values for _, values in prepared])
+            await db.commit()
+        except Exception as exc:
+            logger.warning("Lead import batch %d failed", stats.batches, exc_info=True)
+            stats.failed_batches += 1
+            message = f"batch not imported: {_error_summary(exc)}"
+            for number, _ in prepared:
+                stats.reject(number, [message])
+            try:
+                await db.rollback()
+            except Exception:
+                logger.warning("Lead import rollback failed", exc_info=True)
+                stats.stopped = message
+        else:
+            stats.imported += len(prepared)
+
+    async for row in rows:
+        stats.received += 1
+        batch.append(row)
+        if len(batch) >= batch_size:
+            await flush()
+            if stats.stopped:
+                break
+    if batch and not stats.stopped:
+        await flush()
+
+    stats.finished = time.monotonic()
+    return stats
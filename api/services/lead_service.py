@@ -1,13 +1,133 @@
-"""Lead service with AI prompt generation"""
-
+"""Lead service with AI prompt generation
+
+Each stored prompt records the prompt_version it was rendered from: a hash
+of the template version, the pricing fields and the question labels it
+uses. When an admin edits those, the version changes and the prompts
+rendered from the old one are re-rendered on their next admin read or in
+batches (api/services/prompt_regeneration.py). With LEAD_PROMPT_MODE=deferred,
+POST /leads stores the lead without a prompt and renders it after the
+response is sent.
+"""
+
+import hashlib
+import json
+import logging
+from dataclasses import dataclass
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
-from typing import Dict, Any, List, Optional
+from sqlalchemy import String, bindparam, insert, select, update
+from sqlalchemy.orm.attributes import set_committed_value
+from typing import Callable, Dict, Any, List, Optional, Sequence, Tuple
+from api.config import settings
+from api.database import AsyncSessionLocal
 from api.models.lead import Lead
-from api.models.pricing import PricingPlan
-from api.models.onboarding import OnboardingQuestion
-from api.schemas.lead import LeadCreate, LeadUpdate
+from api.queries import LEAD_BY_ID, fetch_one
+from api.schemas.lead import LeadCreate, LeadResponse, LeadUpdate
+from api.services.catalog_service import CatalogEntry, get_catalog_entries
+from api.services.idempotency import record_response
 from api.utils.exceptions import NotFoundException, ValidationException
+from api.utils.fields import load_columns
+
+logger = logging.getLogger(__name__)
+
+# Bump when render_ai_prompt's output changes, so every stored prompt is
+# treated as out of date
+PROMPT_TEMPLATE_VERSION = 1
+
+
+def _format_answer(value: Any) -> Any:
+    """Format arrays nicely, leave other answers as-is"""
+    if isinstance(value, list):
+        return ", ".join(str(v) for v in value)
+    return value
+
+
+def _answer_formatter(question: Dict[str, Any]) -> Callable[[Any], str]:
+    """Build the '- label: value' line formatter for one question"""
+    prefix = f"- {question['label']}: "
+    return lambda value: f"{prefix}{_format_answer(value)}"
+
+
+@dataclass(frozen=True)
+class QuestionIndex:
+    """Question definitions for a service type, compiled for prompt rendering"""
+
+    labels: Dict[str, str]  # question id -> label
+    formatters: Dict[str, Callable[[Any], str]]  # question id -> requirement line
+    ordered_labels: Tuple[str, ...]  # labels in question order
+
+    @classmethod
+    def compile(cls, questions: List[Dict[str, Any]]) -> "QuestionIndex":
+        return cls(
+            labels={q['id']: q['label'] for q in questions},
+            formatters={q['id']: _answer_formatter(q) for q in questions},
+            ordered_labels=tuple(q['label'] for q in questions),
+        )
+
+
+# Compiled indexes by service type, with the ETag of the onboarding entry
+# they were compiled from. Question set writes invalidate that entry, so a
+# changed ETag (or a missing entry) means the index is out of date.
+_question_indexes: Dict[str, Tuple[str, QuestionIndex]] = {}
+
+
+def _question_index(service_type: str, entry: Optional[CatalogEntry]) -> Optional[QuestionIndex]:
+    """Compiled index for the service type's onboarding entry, reusing a current one"""
+    if entry is None:
+        _question_indexes.pop(service_type, None)
+        return None
+
+    compiled = _question_indexes.get(service_type)
+    if compiled is None or compiled[0] != entry.etag:
+        compiled = (entry.etag, QuestionIndex.compile(entry.data.questions))
+        _question_indexes[service_type] = compiled
+    return compiled[1]
+
+
+@dataclass(frozen=True)
+class PromptContext:
+    """Everything render_ai_prompt needs for a service type, with its version"""
+
+    index: QuestionIndex
+    pricing_info: Dict[str, Any]
+    version: str
+
+
+def prompt_version(pricing_info: Dict[str, Any], index: QuestionIndex) -> str:
+    """Hash of the inputs that affect a rendered prompt besides the lead itself"""
+    payload = json.dumps(
+        [PROMPT_TEMPLATE_VERSION, pricing_info, sorted(index.labels.items())],
+        sort_keys=True,
+    )
+    return hashlib.sha256(payload.encode()).hexdigest()[:16]
+
+
+# Prompt contexts by service type, with the pricing and onboarding ETags
+# they were built from
+_prompt_contexts: Dict[str, Tuple[Tuple[str, str], PromptContext]] = {}
+
+
+def _prompt_context(
+    service_type: str, pricing_entry: Optional[CatalogEntry], onboarding_entry: Optional[CatalogEntry]
+) -> Optional[PromptContext]:
+    if pricing_entry is None or onboarding_entry is None:
+        _prompt_contexts.pop(service_type, None)
+        return None
+
+    etags = (pricing_entry.etag, onboarding_entry.etag)
+    cached = _prompt_contexts.get(service_type)
+    if cached is None or cached[0] != etags:
+        index = _question_index(service_type, onboarding_entry)
+        pricing = pricing_entry.data
+        pricing_info = {'name': pricing.name, 'timeline': pricing.timeline, 'price': pricing.price}
+        cached = (etags, PromptContext(index, pricing_info, prompt_version(pricing_info, index)))
+        _prompt_contexts[service_type] = cached
+    return cached[1]
+
+
+async def get_prompt_context(service_type: str, db: AsyncSession) -> Optional[PromptContext]:
+    """Current prompt context for a service type, or None without pricing or questions"""
+    entries = await get_catalog_entries([("pricing", service_type), ("onboarding", service_type)], db)
+    return _prompt_context(service_type, entries[("pricing", service_type)], entries[("onboarding", service_type)])
 
 
 def format_ai_prompt(lead_data: Dict[str, Any], pricing_info: Dict[str, Any], questions: List[Dict[str, Any]]) -> str:
@@ -25,6 +145,11 @@ def format_ai_prompt(lead_data: Dict[str, Any], pricing_info: Dict[str, Any], qu
     Returns:
         Formatted prompt string ready for AI processing
     """
+    return render_ai_prompt(lead_data, pricing_info, QuestionIndex.compile(questions))
+
+
+def render_ai_prompt(lead_data: Dict[str, Any], pricing_info: Dict[str, Any], index: QuestionIndex) -> str:
+    """format_ai_prompt with the service type's questions already compiled"""
     # Build header
     prompt_parts = [
         f"Project: {pricing_info['name']} for {lead_data['full_name']}",
@@ -45,24 +170,17 @@ def format_ai_prompt(lead_data: Dict[str, Any], pricing_info: Dict[str, Any], qu
     prompt_parts.extend([
         "",
         "Project Description:",
-        lead_data.get('project_description', 'Not provided'),
+        lead_data.get('project_description') or 'Not provided',
         "",
         "Requirements:"
     ])
 
     # Format answers based on question labels
-    answers = lead_data['answers']
-    question_map = {q['id']: q for q in questions}
-
-    for q_id, value in answers.items():
-        if q_id in question_map:
-            label = question_map[q_id]['label']
-
-            # Format arrays nicely
-            if isinstance(value, list):
-                value = ", ".join(str(v) for v in value)
-
-            prompt_parts.append(f"- {label}: {value}")
+    formatters = index.formatters
+    for q_id, value in lead_data['answers'].items():
+        formatter = formatters.get(q_id)
+        if formatter is not None:
+            prompt_parts.append(formatter(value))
 
     # Add pricing and timeline
     prompt_parts.extend([
@@ -74,76 +192,187 @@ def format_ai_prompt(lead_data: Dict[str, Any], pricing_info: Dict[str, Any], qu
     return "\n".join(prompt_parts)
 
 
-async def create_lead(lead_create: LeadCreate, db: AsyncSession) -> Lead:
+def render_lead_prompt(lead: Lead, context: PromptContext) -> str:
+    """Render the prompt for a stored lead"""
+    lead_data = {
+        'full_name': lead.full_name,
+        'company': lead.company,
+        'email': lead.email,
+        'phone': lead.phone,
+        'project_description': lead.project_description,
+        'answers': lead.answers,
+    }
+    return render_ai_prompt(lead_data, context.pricing_info, context.index)
+
+
+# Lead columns render_lead_prompt/refresh_prompts read
+PROMPT_INPUT_COLUMNS = (
+    "service_type", "full_name", "company", "email", "phone", "project_description",
+    "answers", "ai_prompt", "prompt_version",
+)
+
+
+def prompt_is_current(lead: Lead, context: PromptContext) -> bool:
+    return lead.ai_prompt is not None and lead.prompt_version == context.version
+
+
+async def refresh_prompts(leads: Sequence[Lead], db: AsyncSession) -> List[Lead]:
     """
-    Create a new lead with both structured answers and AI prompt.
+    Render missing or out-of-date prompts in place.
 
-    This function implements the dual data storage pattern:
-    1. Store structured answers (JSONB) for SQL queries
-    2. Generate and store AI-formatted prompt (TEXT) for LLM usage
+    Returns the leads that changed; the caller decides whether to store
+    them with save_prompts (a read replica session only uses them for the
+    response).
+    """
+    contexts: Dict[str, Optional[PromptContext]] = {}
+    changed = []
+    for lead in leads:
+        if lead.service_type not in contexts:
+            contexts[lead.service_type] = await get_prompt_context(lead.service_type, db)
+        context = contexts[lead.service_type]
+        if context is None or prompt_is_current(lead, context):
+            continue
+        lead.ai_prompt = render_lead_prompt(lead, context)
+        lead.prompt_version = context.version
+        changed.append(lead)
+    return changed
+
+
+async def save_prompts(leads: Sequence[Lead], db: AsyncSession) -> None:
     """
-    # Get pricing information
-    result = await db.execute(
-        select(PricingPlan).filter(PricingPlan.id == lead_create.service_type)
+    Write prompts rendered by refresh_prompts, keeping updated_at unchanged:
+    a re-rendered prompt is not an edit of the lead (the caller commits)
+    """
+    if not leads:
+        return
+    for lead in leads:
+        # Written below, not by the ORM flush (whose onupdate would bump updated_at)
+        set_committed_value(lead, "ai_prompt", lead.ai_prompt)
+        set_committed_value(lead, "prompt_version", lead.prompt_version)
+    table = Lead.__table__
+    await db.execute(
+        update(table)
+        .where(table.c.id == bindparam("lead_id"))
+        .values(
+            ai_prompt=bindparam("prompt"),
+            prompt_version=bindparam("version", type_=String),
+            updated_at=table.c.updated_at,
+        ),
+        [{"lead_id": lead.id, "prompt": lead.ai_prompt, "version": lead.prompt_version} for lead in leads],
     )
-    pricing = result.scalar_one_or_none()
 
-    if not pricing:
-        raise ValidationException(f"Invalid service type: {lead_create.service_type}")
 
-    # Get questions for this service type
-    result = await db.execute(
-        select(OnboardingQuestion).filter(OnboardingQuestion.service_type == lead_create.service_type)
-    )
-    onboarding = result.scalar_one_or_none()
-
-    if not onboarding:
-        raise ValidationException(f"No onboarding questions found for service type: {lead_create.service_type}")
-
-    # Generate AI prompt
-    ai_prompt = format_ai_prompt(
-        lead_data=lead_create.model_dump(),
-        pricing_info={
-            'name': pricing.name,
-            'timeline': pricing.timeline,
-            'price': pricing.price
-        },
-        questions=onboarding.questions
-    )
+LEAD_ROUTE = "POST /leads"
 
-    # Create lead with both formats
-    lead = Lead(
-        **lead_create.model_dump(),
-        ai_prompt=ai_prompt,
-        status="new"
-    )
 
-    db.add(lead)
+async def create_lead(
+    lead_create: LeadCreate,
+    db: AsyncSession,
+    idempotency_key: Optional[str] = None,
+    body_hash: str = "",
+) -> Lead:
+    """
+    Create a new lead with both structured answers and AI prompt.
+
+    This function implements the dual data storage pattern:
+    1. Store structured answers (JSONB) for SQL queries
+    2. Generate and store AI-formatted prompt (TEXT) for LLM usage
+
+    With an idempotency key, the response is saved in the same transaction
+    (see api/services/idempotency.py).
+    """
+    # Pricing plan and questions come from the catalog cache; whatever
+    # is missing is loaded together in one query
+    service_type = lead_create.service_type
+    entries = await get_catalog_entries([("pricing", service_type), ("onboarding", service_type)], db)
+
+    pricing_entry = entries[("pricing", service_type)]
+    if pricing_entry is None:
+        raise ValidationException(f"Invalid service type: {service_type}")
+
+    onboarding_entry = entries[("onboarding", service_type)]
+    if onboarding_entry is None:
+        raise ValidationException(f"No onboarding questions found for service type: {service_type}")
+
+    lead_data = lead_create.model_dump()
+    values = {**lead_data, "status": "new"}
+    if settings.LEAD_PROMPT_MODE != "deferred":
+        # Generate AI prompt
+        context = _prompt_context(service_type, pricing_entry, onboarding_entry)
+        values["ai_prompt"] = render_ai_prompt(lead_data, context.pricing_info, context.index)
+        values["prompt_version"] = context.version
+
+    # Create lead with both formats; RETURNING brings back the id and
+    # server-side timestamps, so no refresh query is needed
+    result = await db.scalars(insert(Lead).returning(Lead), [values])
+    lead = result.one()
+    if idempotency_key is not None:
+        response = LeadResponse.model_validate(lead).model_dump(mode="json")
+        record_response(db, idempotency_key, LEAD_ROUTE, body_hash, 201, response)
     await db.commit()
-    await db.refresh(lead)
 
     return lead
 
 
+async def render_deferred_prompt(lead_id: int) -> None:
+    """Background task: render a lead's prompt after POST /leads has responded"""
+    try:
+        async with AsyncSessionLocal() as db:
+            lead = await fetch_one(db, LEAD_BY_ID, lead_id)
+            if lead is not None:
+                changed = await refresh_prompts([lead], db)
+                if changed:
+                    await save_prompts(changed, db)
+                    await db.commit()
+    except Exception:
+        # The prompt is rendered on the next admin read instead
+        logger.warning("Deferred prompt rendering for lead %s failed", lead_id, exc_info=True)
+
+
 async def get_lead(lead_id: int, db: AsyncSession) -> Lead:
     """Get a lead by ID"""
-    result = await db.execute(select(Lead).filter(Lead.id == lead_id))
-    lead = result.scalar_one_or_none()
+    lead = await fetch_one(db, LEAD_BY_ID, lead_id)
     if not lead:
         raise NotFoundException(f"Lead with id {lead_id} not found")
     return lead
 
 
-async def get_leads(db: AsyncSession, skip: int = 0, limit: int = 100, status: Optional[str] = None) -> List[Lead]:
-    """Get all leads with optional filtering"""
-    query = select(Lead)
+async def get_lead_with_prompt(lead_id: int, db: AsyncSession) -> Lead:
+    """Get a lead by ID, rendering and saving its prompt if missing or out of date"""
+    lead = await get_lead(lead_id, db)
+    changed = await refresh_prompts([lead], db)
+    if changed:
+        await save_prompts(changed, db)
+        await db.commit()
+    return lead
+
+
+async def get_leads(
+    db: AsyncSession,
+    skip: int = 0,
+    limit: int = 100,
+    status: Optional[str] = None,
+    columns: Optional[List[str]] = None,
+) -> List[Lead]:
+    """Get all leads with optional filtering, loading only the given columns if any"""
+    load = columns
+    if columns is not None and "ai_prompt" in columns:
+        # A stale prompt is re-rendered from these
+        load = [*columns, *PROMPT_INPUT_COLUMNS]
+    query = select(Lead).options(*load_columns(Lead, load))
 
     if status:
         query = query.filter(Lead.status == status)
 
     query = query.order_by(Lead.created_at.desc()).offset(skip).limit(limit)
     result = await db.execute(query)
-    return result.scalars().all()
+    leads = result.scalars().all()
+
+    if columns is None or "ai_prompt" in columns:
+        # Render stale prompts for the response only: this may be a replica
+        # session, and batch regeneration or a single-lead read saves them
+        await refresh_prompts(leads, db)
+    return leads
 
 
 async def update_lead(lead_id: int, lead_update: LeadUpdate, db: AsyncSession) -> Lead:
@@ -163,4 +392,5 @@ async def delete_lead(lead_id: int, db: AsyncSession) -> None:
     """Delete a lead"""
     lead = await get_lead(lead_id, db)
     await db.delete(lead)
-    await db.commit()
\ No newline at end of file
+    await db.commit()
+
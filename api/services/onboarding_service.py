@@ -6,10 +6,12 @@ from typing import Optional, List
 from uuid import UUID
 
 from api.models.onboarding_submission import OnboardingSubmission
+from api.queries import SUBMISSION_BY_ID, fetch_one
 from api.schemas.onboarding_submission import (
     OnboardingSubmissionCreate,
     AdminSubmissionUpdate
 )
+from api.utils.fields import load_columns
 
 
 async def create_onboarding_submission(
@@ -56,20 +58,22 @@ async def get_submission_by_id(
     db: AsyncSession
 ) -> Optional[OnboardingSubmission]:
     """Get submission by ID"""
-    result = await db.execute(
-        select(OnboardingSubmission).filter(OnboardingSubmission.id == submission_id)
-    )
-    return result.scalar_one_or_none()
+    return await fetch_one(db, SUBMISSION_BY_ID, submission_id)
 
 
 async def get_submissions(
     db: AsyncSession,
     status: Optional[str] = None,
     skip: int = 0,
-    limit: int = 100
+    limit: int = 100,
+    columns: Optional[List[str]] = None
 ) -> List[OnboardingSubmission]:
-    """Get submissions with optional filtering"""
-    query = select(OnboardingSubmission).order_by(OnboardingSubmission.created_at.desc())
+    """Get submissions with optional filtering, loading only the given columns if any"""
+    query = (
+        select(OnboardingSubmission)
+        .options(*load_columns(OnboardingSubmission, columns))
+        .order_by(OnboardingSubmission.created_at.desc())
+    )
     
     if status:
         query = query.filter(OnboardingSubmission.status == status)
@@ -86,10 +90,7 @@ async def update_submission_status(
     db: AsyncSession
 ) -> Optional[OnboardingSubmission]:
     """Update submission status (admin only)"""
-    result = await db.execute(
-        select(OnboardingSubmission).filter(OnboardingSubmission.id == submission_id)
-    )
-    submission = result.scalar_one_or_none()
+    submission = await fetch_one(db, SUBMISSION_BY_ID, submission_id)
     
     if not submission:
         return None
@@ -121,10 +122,7 @@ async def update_payment_status(
     db: AsyncSession
 ) -> Optional[OnboardingSubmission]:
     """Update payment status from Stripe webhook"""
-    result = await db.execute(
-        select(OnboardingSubmission).filter(OnboardingSubmission.id == submission_id)
-    )
-    submission = result.scalar_one_or_none()
+    submission = await fetch_one(db, SUBMISSION_BY_ID, submission_id)
     
     if not submission:
         return None
@@ -0,0 +1,216 @@
+"""Batch regeneration of lead AI prompts
+
+Re-renders every prompt whose prompt_version is out of date (see
+lead_service) without loading leads through the ORM:
+
+- stale leads are read per service type in keyset-ordered chunks
+  (id > last id, ORDER BY id, LIMIT n), only the columns the prompt uses;
+- each service type's template (compiled questions + pricing) is built
+  once and reused for every chunk;
+- a chunk is written back with one UPDATE ... FROM (VALUES ...) statement
+  on PostgreSQL (executemany elsewhere) and committed, so progress is kept
+  if the run is interrupted;
+- rendering can be spread over a process pool for very large backlogs.
+
+Used by POST /leads/prompts/regenerate and scripts/regenerate_prompts.py.
+"""
+
+import asyncio
+import logging
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from functools import lru_cache
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+from sqlalchemy import Integer, String, Text, bindparam, column, or_, select, update, values
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from api.models.lead import Lead
+from api.services.lead_service import PromptContext, QuestionIndex, get_prompt_context, render_ai_prompt
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CHUNK_SIZE = 500
+
+# Lead columns a prompt is rendered from, in row order
+_PROMPT_COLUMNS = (
+    Lead.id, Lead.full_name, Lead.company, Lead.email, Lead.phone, Lead.project_description, Lead.answers,
+)
+Row = Tuple[Any, ...]
+
+
+@dataclass
+class RegenerationStats:
+    """Progress and throughput of a regeneration run"""
+
+    regenerated: int = 0
+    chunks: int = 0
+    by_service_type: Dict[str, int] = field(default_factory=dict)
+    skipped_service_types: List[str] = field(default_factory=list)
+    started: float = field(default_factory=time.monotonic)
+    finished: Optional[float] = None
+
+    @property
+    def elapsed(self) -> float:
+        return (self.finished or time.monotonic()) - self.started
+
+    @property
+    def leads_per_second(self) -> float:
+        return self.regenerated / self.elapsed if self.elapsed > 0 else 0.0
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            "regenerated": self.regenerated,
+            "chunks": self.chunks,
+            "by_service_type": self.by_service_type,
+            "skipped_service_types": self.skipped_service_types,
+            "elapsed_seconds": round(self.elapsed, 3),
+            "leads_per_second": round(self.leads_per_second, 1),
+        }
+
+
+def _render_row(row: Row, index: QuestionIndex, pricing_info: Dict[str, Any]) -> Tuple[int, str]:
+    lead_id, full_name, company, email, phone, project_description, answers = row
+    lead_data = {
+        'full_name': full_name,
+        'company': company,
+        'email': email,
+        'phone': phone,
+        'project_description': project_description,
+        'answers': answers,
+    }
+    return lead_id, render_ai_prompt(lead_data, pricing_info, index)
+
+
+def render_rows(context: PromptContext, rows: Sequence[Row]) -> List[Tuple[int, str]]:
+    """Render (id, prompt) pairs for lead rows with a compiled template"""
+    return [_render_row(row, context.index, context.pricing_info) for row in rows]
+
+
+@lru_cache(maxsize=64)
+def _worker_index(labels: Tuple[Tuple[str, str], ...]) -> QuestionIndex:
+    # Compiled once per question set in each worker process (rendering
+    # only uses the question ids and labels)
+    return QuestionIndex.compile([{"id": q_id, "label": label} for q_id, label in labels])
+
+
+def _render_rows_in_worker(
+    labels: Tuple[Tuple[str, str], ...], pricing_info: Dict[str, Any], rows: Sequence[Row]
+) -> List[Tuple[int, str]]:
+    """Process pool entry point: the compiled index itself is not picklable"""
+    index = _worker_index(labels)
+    return [_render_row(row, index, pricing_info) for row in rows]
+
+
+async def _render(
+    context: PromptContext, rows: Sequence[Row], pool: Optional[ProcessPoolExecutor], workers: int
+) -> List[Tuple[int, str]]:
+    if pool is None:
+        return render_rows(context, rows)
+
+    labels = tuple(context.index.labels.items())
+    loop = asyncio.get_running_loop()
+    size = -(-len(rows) // workers)
+    parts = await asyncio.gather(*(
+        loop.run_in_executor(pool, _render_rows_in_worker, labels, context.pricing_info, rows[start:start + size])
+        for start in range(0, len(rows), size)
+    ))
+    return [rendered for part in parts for rendered in part]
+
+
+async def _write_chunk(db: AsyncSession, rendered: List[Tuple[int, str]], version: str) -> None:
+    """Store rendered prompts with one statement per chunk"""
+    leads = Lead.__table__
+    # Setting updated_at to itself keeps its onupdate from firing: a
+    # re-rendered prompt is not an edit of the lead
+    unchanged = {"updated_at": leads.c.updated_at}
+    if db.get_bind().dialect.name == "postgresql":
+        rows = values(column("id", Integer), column("ai_prompt", Text), name="rendered").data(rendered)
+        await db.execute(
+            update(leads)
+            .where(leads.c.id == rows.c.id)
+            .values(ai_prompt=rows.c.ai_prompt, prompt_version=version, **unchanged)
+        )
+    else:
+        await db.execute(
+            update(leads)
+            .where(leads.c.id == bindparam("lead_id"))
+            .values(ai_prompt=bindparam("prompt"), prompt_version=bindparam("version", type_=String), **unchanged),
+            [{"lead_id": lead_id, "prompt": prompt, "version": version} for lead_id, prompt in rendered],
+        )
+
+
+async def _regenerate_service_type(
+    db: AsyncSession,
+    context: PromptContext,
+    service_type: str,
+    chunk_size: int,
+    stats: RegenerationStats,
+    pool: Optional[ProcessPoolExecutor],
+    workers: int,
+    progress: Optional[Callable[[RegenerationStats], None]],
+) -> None:
+    stale = select(*_PROMPT_COLUMNS).where(
+        Lead.service_type == service_type,
+        or_(Lead.ai_prompt.is_(None), Lead.prompt_version.is_distinct_from(context.version)),
+    ).order_by(Lead.id).limit(chunk_size)
+
+    last_id = 0
+    while True:
+        rows = (await db.execute(stale.where(Lead.id > last_id))).all()
+        if not rows:
+            break
+        rendered = await _render(context, rows, pool, workers)
+        await _write_chunk(db, rendered, context.version)
+        await db.commit()
+
+        last_id = rows[-1][0]
+        stats.chunks += 1
+        stats.regenerated += len(rows)
+        stats.by_service_type[service_type] = stats.by_service_type.get(service_type, 0) + len(rows)
+        logger.info(
+            "Regenerated %d prompts (%s, %.0f leads/s)",
+            stats.regenerated, service_type, stats.leads_per_second,
+        )
+        if progress is not None:
+            progress(stats)
+        if len(rows) < chunk_size:
+            break
+
+
+async def regenerate_prompts(
+    db: AsyncSession,
+    service_type: Optional[str] = None,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    workers: int = 0,
+    progress: Optional[Callable[[RegenerationStats], None]] = None,
+) -> RegenerationStats:
+    """
+    Re-render prompts that are missing or rendered from an outdated version.
+
+    workers > 1 renders each chunk on a process pool of that size. progress
+    is called with the running stats after every chunk.
+    """
+    stats = RegenerationStats()
+    if service_type is not None:
+        service_types = [service_type]
+    else:
+        service_types = list((await db.scalars(select(Lead.service_type).distinct())).all())
+
+    pool = ProcessPoolExecutor(max_workers=workers) if workers > 1 else None
+    try:
+        for current_type in service_types:
+            context = await get_prompt_context(current_type, db)
+            if context is None:
+                # No pricing plan or questions any more: nothing to render from
+                stats.skipped_service_types.append(current_type)
+                continue
+            await _regenerate_service_type(
+                db, context, current_type, chunk_size, stats, pool, workers, progress
+            )
+    finally:
+        if pool is not None:
+            pool.shutdown()
+    stats.finished = time.monotonic()
+    return stats
@@ -0,0 +1,202 @@
+"""Connection pool and query latency metrics
+
+Three latencies are tracked per engine, so a p99 spike can be attributed:
+
+- acquire: time spent in Pool.connect(), i.e. waiting for a pooled
+  connection or opening a new one;
+- connect: time to open a new DBAPI connection (TCP + TLS + auth, plus
+  Neon compute wake-up after autosuspend);
+- query: cursor execution time, from engine events.
+
+Statements are timed once per engine by observe_queries, which also feeds
+the slow-query log (api/utils/query_log.py). Each latency is kept as a
+rolling window of recent samples and summarised into percentiles and a
+bucketed histogram on demand.
+"""
+
+import time
+import weakref
+from collections import deque
+from typing import Any, Callable, Deque, Dict, List, Optional, Tuple
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from sqlalchemy.pool import AsyncAdaptedQueuePool, NullPool, Pool
+
+# Histogram bucket upper bounds in milliseconds
+BUCKETS_MS = (1, 2, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000)
+
+
+class LatencyHistogram:
+    """Latency samples from the last `window` seconds (at most max_samples)"""
+
+    def __init__(self, window: float = 300.0, max_samples: int = 4096):
+        self.window = window
+        self._samples: Deque[Tuple[float, float]] = deque(maxlen=max_samples)
+        self.total = 0
+
+    def observe(self, seconds: float) -> None:
+        self._samples.append((time.monotonic(), seconds))
+        self.total += 1
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Percentiles and bucket counts (milliseconds) over the window"""
+        cutoff = time.monotonic() - self.window
+        while self._samples and self._samples[0][0] < cutoff:
+            self._samples.popleft()
+        values = sorted(seconds * 1000 for _, seconds in self._samples)
+        if not values:
+            return {"count": 0, "total": self.total}
+
+        def percentile(p: float) -> float:
+            return round(values[min(len(values) - 1, int(len(values) * p))], 2)
+
+        buckets: Dict[str, int] = {}
+        index = 0
+        for bound in BUCKETS_MS:
+            start = index
+            while index < len(values) and values[index] <= bound:
+                index += 1
+            buckets[f"le_{bound}"] = index - start
+        buckets["inf"] = len(values) - index
+
+        return {
+            "count": len(values),
+            "total": self.total,
+            "p50_ms": percentile(0.50),
+            "p95_ms": percentile(0.95),
+            "p99_ms": percentile(0.99),
+            "max_ms": round(values[-1], 2),
+            "buckets": buckets,
+        }
+
+
+class EngineMetrics:
+    """Latency histograms and pool wait counters for one engine"""
+
+    def __init__(self):
+        self.acquire = LatencyHistogram()
+        self.connect = LatencyHistogram()
+        self.query = LatencyHistogram()
+        self.waiting = 0
+        self.max_waiting = 0
+
+
+class _InstrumentedPool:
+    """Pool mixin timing connection checkout and creation"""
+
+    metrics: Optional[EngineMetrics] = None
+
+    def connect(self):
+        metrics = self.metrics
+        if metrics is None:
+            return super().connect()
+        metrics.waiting += 1
+        metrics.max_waiting = max(metrics.max_waiting, metrics.waiting)
+        start = time.perf_counter()
+        try:
+            return super().connect()
+        finally:
+            metrics.waiting -= 1
+            metrics.acquire.observe(time.perf_counter() - start)
+
+    def _create_connection(self):
+        start = time.perf_counter()
+        try:
+            return super()._create_connection()
+        finally:
+            if self.metrics is not None:
+                self.metrics.connect.observe(time.perf_counter() - start)
+
+    def recreate(self):
+        # engine.dispose() swaps in a new pool; keep recording to the same metrics
+        pool = super().recreate()
+        pool.metrics = self.metrics
+        return pool
+
+
+class InstrumentedQueuePool(_InstrumentedPool, AsyncAdaptedQueuePool):
+    pass
+
+
+class InstrumentedNullPool(_InstrumentedPool, NullPool):
+    pass
+
+
+# observer(cursor, statement, seconds, executemany), called after each statement
+QueryObserver = Callable[[Any, str, float, bool], None]
+
+_query_observers: "weakref.WeakKeyDictionary[Engine, List[QueryObserver]]" = (
+    weakref.WeakKeyDictionary()
+)
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("query_start", []).append(time.perf_counter())
+
+
+def _handle_error(exception_context) -> None:
+    # after_cursor_execute does not run for failed statements
+    starts = exception_context.connection.info.get("query_start") if exception_context.connection else None
+    if starts:
+        starts.pop()
+
+
+def observe_queries(engine: Engine, observer: QueryObserver) -> None:
+    """Time every statement on a (sync) engine and pass the duration to observer"""
+    observers = _query_observers.get(engine)
+    if observers is None:
+        observers = _query_observers[engine] = []
+
+        def after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+            starts = conn.info.get("query_start")
+            if not starts:
+                return
+            seconds = time.perf_counter() - starts.pop()
+            for notify in observers:
+                notify(cursor, statement, seconds, executemany)
+
+        # One timer per engine however many observers there are
+        event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+        event.listen(engine, "after_cursor_execute", after_cursor_execute)
+        event.listen(engine, "handle_error", _handle_error)
+    observers.append(observer)
+
+
+def instrument_engine(engine: Engine, metrics: EngineMetrics) -> None:
+    """Attach metrics to a (sync) engine's pool and cursor events"""
+    engine.pool.metrics = metrics
+    observe_queries(
+        engine, lambda cursor, statement, seconds, executemany: metrics.query.observe(seconds)
+    )
+
+
+def pool_status(pool: Pool) -> Dict[str, Any]:
+    """Configured size and current usage of a pool"""
+    status: Dict[str, Any] = {"class": type(pool).__name__}
+    if isinstance(pool, AsyncAdaptedQueuePool):
+        status.update({
+            "size": pool.size(),
+            "max_overflow": pool._max_overflow,
+            "checked_out": pool.checkedout(),
+            "checked_in": pool.checkedin(),
+            "overflow": max(pool.overflow(), 0),
+        })
+    return status
+
+
+def engine_report(engine: Engine) -> Dict[str, Any]:
+    """Pool status plus acquire/connect/query latency summaries"""
+    metrics = getattr(engine.pool, "metrics", None)
+    if metrics is None:
+        return {"pool": pool_status(engine.pool), "instrumented": False}
+    return {
+        "pool": {
+            **pool_status(engine.pool),
+            "waiters": metrics.waiting,
+            "max_waiters": metrics.max_waiting,
+        },
+        "acquire": metrics.acquire.snapshot(),
+        "connect": metrics.connect.snapshot(),
+        "query": metrics.query.snapshot(),
+    }
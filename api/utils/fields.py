@@ -0,0 +1,50 @@
+"""Column projection for admin list endpoints (?fields=)
+
+List endpoints take a comma-separated fields parameter, e.g.
+GET /leads?fields=id,full_name,status. Only those columns are loaded
+(load_only, with raiseload so nothing is lazily fetched per row) and only
+those keys are returned: the response model is a compact schema whose
+fields are all optional, served with response_model_exclude_unset.
+Without fields=, every column is loaded and returned as before.
+
+Usage:
+    columns = parse_fields(fields, LeadListItem)
+    query = query.options(*load_columns(Lead, columns))
+    return [project(lead, columns) for lead in leads]
+"""
+
+from typing import Any, Iterable, List, Optional, Type
+
+from pydantic import BaseModel
+from sqlalchemy.orm import load_only
+
+from api.utils.exceptions import ValidationException
+
+FIELDS_DESCRIPTION = "Comma-separated fields to return (default: all), e.g. id,full_name,status"
+
+
+def parse_fields(value: Optional[str], schema: Type[BaseModel]) -> Optional[List[str]]:
+    """Requested field names (always including id), or None for all of them"""
+    if not value:
+        return None
+    names = [name.strip() for name in value.split(",") if name.strip()]
+    unknown = [name for name in names if name not in schema.model_fields]
+    if unknown:
+        raise ValidationException(
+            f"Unknown fields: {', '.join(unknown)}. Available: {', '.join(schema.model_fields)}"
+        )
+    return list(dict.fromkeys(["id", *names]))
+
+
+def load_columns(model, columns: Optional[Iterable[str]]) -> list:
+    """Loader options for the columns (none when all are requested)"""
+    if columns is None:
+        return []
+    return [load_only(*(getattr(model, name) for name in columns), raiseload=True)]
+
+
+def project(obj: Any, columns: Optional[List[str]]) -> Any:
+    """The requested attributes of a row, or the row itself for all of them"""
+    if columns is None:
+        return obj
+    return {name: getattr(obj, name) for name in columns}
@@ -0,0 +1,127 @@
+"""Per-route query budgets (statement_timeout plus a request deadline)
+
+Every route built with BudgetedRoute runs under a QueryBudget:
+
+- each database transaction it opens starts with
+  SET LOCAL statement_timeout, so Postgres cancels a runaway query and
+  gives the connection back to the pool (-> 503);
+- the whole request runs under an asyncio deadline slightly longer than
+  the statement timeout, as a backstop for time spent waiting on the pool
+  or between queries (-> 504). Connect retries and replays of requests
+  that lost their connection (see api/utils/retry.py) count against the
+  same deadline, and stop once the statement timeout has elapsed, so a
+  connection that cannot be opened still gets its 503 in time.
+
+Routes get the admin budget when they depend on verify_api_key and the
+public one otherwise. A route can pick another budget explicitly by
+listing it as a dependency, e.g. dependencies=[Depends(EXPORT_BUDGET)].
+"""
+
+import asyncio
+import time
+from contextvars import ContextVar
+from dataclasses import dataclass
+from typing import Callable, Optional
+
+from fastapi import Request, Response
+from fastapi.dependencies.models import Dependant
+from fastapi.responses import JSONResponse
+from fastapi.routing import APIRoute
+
+from api.config import settings
+from api.utils.auth import verify_api_key
+from api.utils.query_log import current_route
+from api.utils.retry import RetryPolicy, idempotent_writes, is_replayable, retry_async, retry_until
+
+# Postgres SQLSTATE for query_canceled (statement_timeout)
+QUERY_CANCELED = "57014"
+
+
+@dataclass(frozen=True)
+class QueryBudget:
+    """Time allowed for a route's queries and for the request as a whole"""
+
+    name: str
+    statement_timeout_ms: int
+
+    @property
+    def deadline(self) -> float:
+        """Request deadline in seconds, leaving Postgres time to cancel first"""
+        return self.statement_timeout_ms / 1000 + settings.QUERY_DEADLINE_GRACE
+
+    def __call__(self) -> None:
+        """No-op dependency, so a route can declare its budget"""
+        return None
+
+
+PUBLIC_BUDGET = QueryBudget("public", settings.QUERY_BUDGET_PUBLIC_MS)
+ADMIN_BUDGET = QueryBudget("admin", settings.QUERY_BUDGET_ADMIN_MS)
+EXPORT_BUDGET = QueryBudget("export", settings.QUERY_BUDGET_EXPORT_MS)
+
+# Budget of the request being handled; None outside requests (scripts,
+# background tasks), where no statement_timeout is set
+current_budget: ContextVar[Optional[QueryBudget]] = ContextVar("query_budget", default=None)
+
+
+def _declared_calls(dependant: Dependant):
+    for dependency in dependant.dependencies:
+        yield dependency.call
+        yield from _declared_calls(dependency)
+
+
+def budget_for(dependant: Dependant) -> QueryBudget:
+    """Pick the budget for a route from its dependencies"""
+    calls = list(_declared_calls(dependant))
+    for call in calls:
+        if isinstance(call, QueryBudget):
+            return call
+    return ADMIN_BUDGET if verify_api_key in calls else PUBLIC_BUDGET
+
+
+def apply_statement_timeout(session, transaction, connection) -> None:
+    """Session after_begin hook: SET LOCAL statement_timeout from the budget"""
+    budget = current_budget.get()
+    if budget is None or connection.dialect.name != "postgresql":
+        return
+    connection.exec_driver_sql(f"SET LOCAL statement_timeout = {int(budget.statement_timeout_ms)}")
+
+
+def is_query_canceled(exc: BaseException) -> bool:
+    """Whether a DBAPI error is Postgres cancelling a statement on timeout"""
+    orig = getattr(exc, "orig", None)
+    return getattr(orig, "sqlstate", None) == QUERY_CANCELED or getattr(orig, "pgcode", None) == QUERY_CANCELED
+
+
+class BudgetedRoute(APIRoute):
+    """APIRoute that runs its handler under the route's query budget"""
+
+    def get_route_handler(self) -> Callable:
+        handler = super().get_route_handler()
+        budget = self.query_budget = budget_for(self.dependant)
+        route = f"{','.join(sorted(self.methods))} {self.path}"
+        retry_policy = RetryPolicy.from_settings()
+        stores_keys = idempotent_writes in _declared_calls(self.dependant)
+
+        async def budgeted_handler(request: Request) -> Response:
+            token = current_budget.set(budget)
+            route_token = current_route.set(route)
+            retry_token = retry_until.set(time.monotonic() + budget.statement_timeout_ms / 1000)
+            # Replay requests whose connection dropped mid-way, when that
+            # cannot duplicate a write; each attempt gets a fresh session
+            if is_replayable(request.method, request.headers, stores_keys):
+                call = retry_async(lambda: handler(request), retry_policy, what=route)
+            else:
+                call = handler(request)
+            try:
+                return await asyncio.wait_for(call, timeout=budget.deadline)
+            except asyncio.TimeoutError:
+                return JSONResponse(
+                    status_code=504,
+                    content={"detail": f"Request exceeded its {budget.name} time budget"},
+                )
+            finally:
+                retry_until.reset(retry_token)
+                current_route.reset(route_token)
+                current_budget.reset(token)
+
+        return budgeted_handler
@@ -0,0 +1,73 @@
+"""Structured slow-query log
+
+Statements slower than SLOW_QUERY_THRESHOLD_MS are logged as one JSON
+object per line on the api.slow_query logger, with the route that ran them,
+a fingerprint of the statement (literals and bind parameters replaced, so
+the same query groups together), duration and row count. With
+SLOW_QUERY_SAMPLE_RATE below 1 only that fraction of slow statements is
+logged. Durations come from the engine's statement timer (observe_queries
+in api/utils/db_metrics.py, shared with the query latency histogram), so
+unlike echo=True nothing is formatted or written for fast statements.
+"""
+
+import hashlib
+import json
+import logging
+import random
+import re
+from contextvars import ContextVar
+from functools import lru_cache
+from typing import Optional, Tuple
+
+from sqlalchemy.engine import Engine
+
+from api.config import settings
+from api.utils.db_metrics import observe_queries
+
+logger = logging.getLogger("api.slow_query")
+
+# Route being handled ("GET /api/v1/leads"); set by BudgetedRoute
+current_route: ContextVar[Optional[str]] = ContextVar("current_route", default=None)
+
+# String and numeric literals, and bind parameters ($1, ?, :name, %(name)s)
+_LITERALS = re.compile(r"'(?:[^']|'')*'|\b\d+(?:\.\d+)?\b|\$\d+|\?|(?<!:):\w+|%\(\w+\)s")
+_LISTS = re.compile(r"\(\?(?:, \?)+\)")
+MAX_STATEMENT_LENGTH = 1000
+
+
+@lru_cache(maxsize=512)
+def fingerprint(statement: str) -> Tuple[str, str]:
+    """Return (hash, normalized statement) for grouping similar queries"""
+    normalized = _LISTS.sub("(?)", _LITERALS.sub("?", " ".join(statement.split())))
+    digest = hashlib.sha1(normalized.encode()).hexdigest()[:12]
+    return digest, normalized[:MAX_STATEMENT_LENGTH]
+
+
+def install_slow_query_log(
+    engine: Engine,
+    threshold_ms: Optional[float] = None,
+    sample_rate: Optional[float] = None,
+) -> None:
+    """Log statements on a (sync) engine that take longer than the threshold"""
+    threshold_ms = settings.SLOW_QUERY_THRESHOLD_MS if threshold_ms is None else threshold_ms
+    sample_rate = settings.SLOW_QUERY_SAMPLE_RATE if sample_rate is None else sample_rate
+    if sample_rate <= 0:
+        return
+
+    def log_if_slow(cursor, statement: str, seconds: float, executemany: bool) -> None:
+        duration_ms = seconds * 1000
+        if duration_ms < threshold_ms or (sample_rate < 1 and random.random() >= sample_rate):
+            return
+        digest, normalized = fingerprint(statement)
+        rowcount = getattr(cursor, "rowcount", -1)
+        logger.warning(json.dumps({
+            "event": "slow_query",
+            "route": current_route.get(),
+            "fingerprint": digest,
+            "statement": normalized,
+            "duration_ms": round(duration_ms, 2),
+            "rows": rowcount if rowcount is not None and rowcount >= 0 else None,
+            "executemany": executemany,
+        }))
+
+    observe_queries(engine, log_if_slow)
@@ -0,0 +1,168 @@
+"""Retries for transient database connection failures
+
+The first connection after Neon compute has been suspended can time out or
+be refused while the compute starts. Two layers retry those failures with
+bounded exponential backoff, full jitter and a total deadline
+(RetryPolicy, from the DB_RETRY_* settings):
+
+- install_connect_retry: opening a connection. Nothing has been sent to
+  the server yet, so this is safe for every request, writes included.
+  Each attempt may use at most half the time left, so a hung handshake
+  still leaves room to retry.
+- BudgetedRoute replays a whole request whose connection was lost mid-way,
+  but only GET/HEAD/OPTIONS, and writes carrying an Idempotency-Key header
+  to routes that store keys (marked with the idempotent_writes dependency;
+  see api/services/idempotency.py). Other writes may already have
+  committed, and streamed request bodies cannot be read a second time.
+
+Inside a request both layers also stop at retry_until (set by
+BudgetedRoute), so they give up in time for the request to answer within
+its budget instead of being cut off by its deadline.
+"""
+
+import asyncio
+import logging
+import random
+import time
+from contextvars import ContextVar
+from dataclasses import dataclass
+from typing import Awaitable, Callable, Iterator, Optional, TypeVar
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.util import await_only
+
+from api.config import settings
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+# connection_exception class, admin/crash shutdown, cannot_connect_now,
+# too_many_connections
+TRANSIENT_SQLSTATES = frozenset(
+    {"08000", "08001", "08003", "08004", "08006", "57P01", "57P02", "57P03", "53300"}
+)
+SAFE_METHODS = frozenset({"GET", "HEAD", "OPTIONS"})
+IDEMPOTENCY_KEY_HEADER = "idempotency-key"
+
+# Monotonic time by which retries must have given up; None outside
+# requests (scripts, background tasks), where only the policy applies
+retry_until: ContextVar[Optional[float]] = ContextVar("retry_until", default=None)
+
+
+class DatabaseUnavailable(Exception):
+    """A connection could not be opened within the connect retries (-> 503)"""
+
+
+@dataclass(frozen=True)
+class RetryPolicy:
+    """Bounded exponential backoff with full jitter and a total deadline"""
+
+    attempts: int
+    base_delay: float
+    max_delay: float
+    deadline: float
+
+    @classmethod
+    def from_settings(cls) -> "RetryPolicy":
+        return cls(
+            attempts=settings.DB_RETRY_ATTEMPTS,
+            base_delay=settings.DB_RETRY_BASE_DELAY,
+            max_delay=settings.DB_RETRY_MAX_DELAY,
+            deadline=settings.DB_RETRY_DEADLINE,
+        )
+
+    def deadline_from_now(self) -> float:
+        """Monotonic time to stop retrying: the policy's deadline or retry_until"""
+        deadline = time.monotonic() + self.deadline
+        limit = retry_until.get()
+        return deadline if limit is None else min(deadline, limit)
+
+    def delays(self) -> Iterator[float]:
+        """Sleep before each retry: uniform in [0, min(max, base * 2^n)]"""
+        for attempt in range(self.attempts - 1):
+            yield random.uniform(0, min(self.max_delay, self.base_delay * 2 ** attempt))
+
+
+def is_transient_connect_error(exc: BaseException) -> bool:
+    """Whether an error opening a connection is worth retrying"""
+    if isinstance(exc, DBAPIError):
+        exc = exc.orig or exc
+    if isinstance(exc, (OSError, asyncio.TimeoutError)):
+        return True
+    if getattr(exc, "sqlstate", None) in TRANSIENT_SQLSTATES:
+        return True
+    return type(exc).__name__ == "ConnectionDoesNotExistError"
+
+
+def is_connection_lost(exc: BaseException) -> bool:
+    """Whether a statement failed because its connection was dropped"""
+    return isinstance(exc, DBAPIError) and exc.connection_invalidated
+
+
+def idempotent_writes() -> None:
+    """
+    No-op route dependency marking a route that saves Idempotency-Key
+    responses with its writes, so a keyed write to it can be replayed
+    """
+    return None
+
+
+def is_replayable(method: str, headers, stores_keys: bool = False) -> bool:
+    """Whether re-running a request cannot duplicate a write"""
+    if method in SAFE_METHODS:
+        return True
+    return stores_keys and IDEMPOTENCY_KEY_HEADER in headers
+
+
+async def retry_async(
+    fn: Callable[[], Awaitable[T]],
+    policy: RetryPolicy,
+    should_retry: Callable[[BaseException], bool] = is_connection_lost,
+    what: str = "Database call",
+) -> T:
+    """Await fn(), retrying errors accepted by should_retry under the policy"""
+    deadline = policy.deadline_from_now()
+    delays = policy.delays()
+    while True:
+        try:
+            return await fn()
+        except Exception as exc:
+            delay = next(delays, None)
+            if delay is None or not should_retry(exc) or time.monotonic() + delay > deadline:
+                raise
+            logger.warning("%s failed (%s), retrying in %.2fs", what, exc, delay)
+            await asyncio.sleep(delay)
+
+
+def install_connect_retry(engine: Engine, policy: RetryPolicy) -> None:
+    """Retry transient failures when a (sync) engine opens a connection"""
+
+    def do_connect(dialect, conn_rec, cargs, cparams):
+        deadline = policy.deadline_from_now()
+        delays = policy.delays()
+        while True:
+            params = dict(cparams)
+            if dialect.driver == "asyncpg":
+                # Per-attempt timeout, so a hung handshake leaves time to retry
+                remaining = deadline - time.monotonic()
+                params["timeout"] = max(0.1, min(settings.DB_CONNECT_TIMEOUT, remaining / 2))
+            try:
+                return dialect.connect(*cargs, **params)
+            except Exception as exc:
+                if not is_transient_connect_error(exc):
+                    raise
+                delay = next(delays, None)
+                if delay is None or time.monotonic() + delay > deadline:
+                    # Raw driver errors (OSError, timeouts) are not DBAPIErrors:
+                    # mark them so only connect failures are answered with 503
+                    raise DatabaseUnavailable(f"Could not connect to the database: {exc}") from exc
+                logger.warning("Database connect failed (%s), retrying in %.2fs", exc, delay)
+                if dialect.is_async:
+                    await_only(asyncio.sleep(delay))
+                else:
+                    time.sleep(delay)
+
+    event.listen(engine, "do_connect", do_connect)
@@ -0,0 +1,103 @@
+"""Memory-mapped snapshot files
+
+A snapshot is a single JSON index line followed by the raw record bodies
+back to back:
+
+    {"format": 1, "generated_at": "...", "records": {"key": [offset, length, meta]}}\\n
+    <body><body>...
+
+Offsets are relative to the end of the index line. Bodies are sliced out of
+the mapping on demand, so opening a snapshot only reads the index.
+"""
+
+import json
+import logging
+import mmap
+import os
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple, Union
+
+logger = logging.getLogger(__name__)
+
+SNAPSHOT_FORMAT = 1
+
+
+def write_snapshot(
+    path: Union[str, Path], records: Dict[str, Tuple[bytes, Dict[str, Any]]]
+) -> None:
+    """Write records (key -> (body, meta)) to path, replacing it atomically"""
+    path = Path(path)
+    index, offset = {}, 0
+    for key, (body, meta) in records.items():
+        index[key] = [offset, len(body), meta]
+        offset += len(body)
+    header = {
+        "format": SNAPSHOT_FORMAT,
+        "generated_at": datetime.now(timezone.utc).isoformat(),
+        "records": index,
+    }
+
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_suffix(path.suffix + ".tmp")
+    with open(tmp_path, "wb") as f:
+        f.write(json.dumps(header, separators=(",", ":")).encode() + b"\n")
+        for body, _ in records.values():
+            f.write(body)
+    os.replace(tmp_path, path)
+
+
+class Snapshot:
+    """Read-only view of a snapshot file"""
+
+    def __init__(self, path: Union[str, Path]):
+        self.path = Path(path)
+        with open(self.path, "rb") as f:
+            self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        header_end = self._map.find(b"\n")
+        header = json.loads(self._map[:header_end])
+        if header.get("format") != SNAPSHOT_FORMAT:
+            self._map.close()
+            raise ValueError(f"Unsupported snapshot format: {header.get('format')}")
+        self.generated_at: str = header["generated_at"]
+        self._base = header_end + 1
+        self._records: Dict[str, list] = header["records"]
+
+    @classmethod
+    def open(cls, path: Union[str, Path]) -> Optional["Snapshot"]:
+        """Open a snapshot, or return None if it is missing or unreadable"""
+        try:
+            return cls(path)
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError, KeyError) as exc:
+            logger.warning("Ignoring unreadable snapshot %s: %s", path, exc)
+            return None
+
+    def __len__(self) -> int:
+        return len(self._records)
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._records
+
+    def get(self, key: str) -> Optional[Tuple[bytes, Dict[str, Any]]]:
+        """Return (body, meta) for key, or None if it is not in the snapshot"""
+        record = self._records.get(key)
+        if record is None:
+            return None
+        offset, length, meta = record
+        start = self._base + offset
+        return self._map[start:start + length], meta
+
+    def discard(self, key: str) -> None:
+        """Stop serving key from this snapshot"""
+        self._records.pop(key, None)
+
+    def discard_prefix(self, prefix: str) -> None:
+        """Stop serving every key starting with prefix"""
+        for key in [k for k in self._records if k.startswith(prefix)]:
+            del self._records[key]
+
+    def close(self) -> None:
+        self._records.clear()
+        self._map.close()
@@ -0,0 +1,88 @@
+"""
+Benchmark catalog response serialization.
+
+Compares the per-request cost of the original catalog GET path
+(ORM rows -> response_model validation -> jsonable_encoder -> JSONResponse)
+with serving the pre-rendered bytes kept in the catalog cache.
+
+Rows are built in memory from the seed data, so no database is needed.
+
+Usage: python scripts/bench_catalog_serialization.py [iterations]
+"""
+
+import asyncio
+import sys
+import timeit
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import List
+
+# Add parent directory to path to import api modules
+sys.path.append(str(Path(__file__).parent.parent))
+sys.path.append(str(Path(__file__).parent))
+
+from fastapi.responses import JSONResponse
+from fastapi.routing import serialize_response
+from fastapi.utils import create_model_field
+
+from api.services.catalog_service import CATALOG_RESOURCES, _build_entry
+from seed_data import PRICING_PLANS, ADDONS, SERVICES, FEATURES, ONBOARDING_QUESTIONS
+
+SEED_ROWS = {
+    "pricing": PRICING_PLANS,
+    "addons": ADDONS,
+    "services": SERVICES,
+    "features": FEATURES,
+    "onboarding": ONBOARDING_QUESTIONS,
+}
+
+
+def build_rows(resource: str) -> list:
+    """Build transient ORM instances for a resource from the seed data"""
+    model = CATALOG_RESOURCES[resource].model
+    now = datetime.now(timezone.utc)
+    return [
+        model(**{"id": index + 1, **data, "created_at": now, "updated_at": now})
+        for index, data in enumerate(SEED_ROWS[resource])
+    ]
+
+
+def bench_resource(resource: str, iterations: int) -> None:
+    """Time both serialization paths for one resource list"""
+    spec = CATALOG_RESOURCES[resource]
+    rows = build_rows(resource)
+    field = create_model_field("Response", List[spec.schema], mode="serialization")
+    loop = asyncio.new_event_loop()
+
+    def orm_path() -> bytes:
+        content = loop.run_until_complete(
+            serialize_response(field=field, response_content=rows)
+        )
+        return JSONResponse(content).body
+
+    entry = _build_entry(resource, [spec.schema.model_validate(row) for row in rows])
+
+    def cached_path() -> bytes:
+        return entry.response().body
+
+    orm_time = min(timeit.repeat(orm_path, number=iterations, repeat=5)) / iterations
+    cached_time = min(timeit.repeat(cached_path, number=iterations, repeat=5)) / iterations
+    loop.close()
+
+    print(
+        f"  {resource:<12} {len(rows):>3} rows  "
+        f"orm+response_model {orm_time * 1e6:9.1f} us   "
+        f"cached bytes {cached_time * 1e6:7.1f} us   "
+        f"speedup {orm_time / cached_time:6.1f}x"
+    )
+
+
+def main():
+    iterations = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    print(f"⏱  Catalog serialization benchmark ({iterations} iterations, best of 5)")
+    for resource in SEED_ROWS:
+        bench_resource(resource, iterations)
+
+
+if __name__ == "__main__":
+    main()
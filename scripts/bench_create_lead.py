@@ -0,0 +1,106 @@
+"""
+Benchmark POST /leads database work: the original four-round-trip path
+against create_lead.
+
+Original: SELECT pricing plan, SELECT questions, INSERT + COMMIT, then a
+SELECT to refresh server defaults. Now: pricing plan and questions from the
+catalog cache (one joined query on a miss) and INSERT ... RETURNING.
+Both are timed with a cold catalog cache (as on a fresh serverless
+instance) and a warm one, and the statements each sends are counted.
+
+Needs a reachable DATABASE_URL with seeded pricing plans and onboarding
+questions (use a Neon branch: the leads it creates are deleted afterwards,
+but they do hit the table).
+
+Usage: python scripts/bench_create_lead.py [requests] [service_type]
+"""
+
+import asyncio
+import statistics
+import sys
+import time
+from pathlib import Path
+
+# Add parent directory to path to import api modules
+sys.path.append(str(Path(__file__).parent.parent))
+
+from sqlalchemy import delete, event, select
+
+from api.database import AsyncSessionLocal, close_db, get_engine
+from api.models.lead import Lead
+from api.models.onboarding import OnboardingQuestion
+from api.models.pricing import PricingPlan
+from api.schemas.lead import LeadCreate
+from api.services.catalog_service import catalog_cache
+from api.services.lead_service import create_lead, format_ai_prompt
+
+
+async def create_lead_original(lead_create: LeadCreate, db) -> Lead:
+    """create_lead as it was: two lookups, then commit and refresh"""
+    result = await db.execute(select(PricingPlan).filter(PricingPlan.id == lead_create.service_type))
+    pricing = result.scalar_one()
+    result = await db.execute(
+        select(OnboardingQuestion).filter(OnboardingQuestion.service_type == lead_create.service_type)
+    )
+    questions = result.scalar_one()
+    ai_prompt = format_ai_prompt(
+        lead_create.model_dump(),
+        {"name": pricing.name, "timeline": pricing.timeline, "price": pricing.price},
+        questions.questions,
+    )
+    lead = Lead(**lead_create.model_dump(), ai_prompt=ai_prompt, status="new")
+    db.add(lead)
+    await db.commit()
+    await db.refresh(lead)
+    return lead
+
+
+async def bench(name, create, lead_create, requests, cold, statements, created):
+    timings, counts = [], []
+    for _ in range(requests):
+        if cold:
+            catalog_cache.clear()
+        statements.clear()
+        start = time.perf_counter()
+        async with AsyncSessionLocal() as db:
+            lead = await create(lead_create, db)
+        timings.append(time.perf_counter() - start)
+        counts.append(len(statements))
+        created.append(lead.id)
+
+    print(
+        f"  {name:<9} {'cold' if cold else 'warm'} cache   "
+        f"p50 {statistics.median(timings) * 1e3:7.1f} ms   "
+        f"mean {statistics.fmean(timings) * 1e3:7.1f} ms   "
+        f"statements {statistics.fmean(counts):.0f}"
+    )
+
+
+async def main():
+    requests = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+    service_type = sys.argv[2] if len(sys.argv) > 2 else "landing_page"
+    lead_create = LeadCreate(
+        service_type=service_type,
+        full_name="Benchmark Lead",
+        email="bench@example.com",
+        project_description="Latency benchmark",
+        answers={},
+    )
+
+    statements, created = [], []
+    event.listen(get_engine().sync_engine, "before_cursor_execute", lambda *args: statements.append(args[2]))
+
+    print(f"⏱  Lead creation benchmark ({requests} requests each, service type {service_type})")
+    try:
+        for cold in (True, False):
+            await bench("original", create_lead_original, lead_create, requests, cold, statements, created)
+            await bench("current", create_lead, lead_create, requests, cold, statements, created)
+    finally:
+        async with AsyncSessionLocal() as db:
+            await db.execute(delete(Lead).where(Lead.id.in_(created)))
+            await db.commit()
+        await close_db()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,74 @@
+"""
+Benchmark the Python-side cost of hot by-id lookups.
+
+Compares building select(Model).filter(Model.id == x) per call, as the
+routes used to, with executing the pre-built statements in api/queries.py.
+Both run against an in-memory SQLite database through a plain Session, so
+the numbers are SQLAlchemy overhead (statement construction, cache key
+generation, compiled cache lookup, row loading), not network time.
+
+Usage: python scripts/bench_hot_queries.py [iterations]
+"""
+
+import sys
+import timeit
+from pathlib import Path
+
+# Add parent directory to path to import api modules
+sys.path.append(str(Path(__file__).parent.parent))
+
+from sqlalchemy import create_engine, select
+from sqlalchemy.orm import Session
+
+from api.database import Base
+from api.models.lead import Lead
+from api.models.pricing import PricingPlan
+from api.queries import LEAD_BY_ID, PRICING_PLAN_BY_ID
+
+LOOKUPS = [
+    ("pricing plan", PricingPlan, PRICING_PLAN_BY_ID, "landing_page"),
+    ("lead", Lead, LEAD_BY_ID, 1),
+]
+
+
+def build_database() -> Session:
+    """In-memory database with one pricing plan and one lead"""
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine, tables=[PricingPlan.__table__, Lead.__table__])
+    session = Session(engine)
+    session.add(PricingPlan(
+        id="landing_page", name="Landing Page", price=15000, currency="PHP",
+        timeline="48-hour delivery", features=["Responsive design"],
+    ))
+    session.add(Lead(
+        service_type="landing_page", full_name="Juan", email="juan@example.com",
+        answers={}, ai_prompt="",
+    ))
+    session.commit()
+    return session
+
+
+def main():
+    iterations = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+    session = build_database()
+    print(f"⏱  Hot query benchmark ({iterations} iterations, best of 5)")
+
+    for name, model, statement, key in LOOKUPS:
+        def adhoc():
+            return session.execute(select(model).filter(model.id == key)).scalar_one_or_none()
+
+        def prebuilt():
+            return session.execute(statement, {"id": key}).scalar_one_or_none()
+
+        assert adhoc() is prebuilt() is not None
+        adhoc_time = min(timeit.repeat(adhoc, number=iterations, repeat=5)) / iterations
+        prebuilt_time = min(timeit.repeat(prebuilt, number=iterations, repeat=5)) / iterations
+        print(
+            f"  {name:<13} ad hoc select {adhoc_time * 1e6:7.1f} us   "
+            f"pre-built {prebuilt_time * 1e6:7.1f} us   "
+            f"saved {(adhoc_time - prebuilt_time) * 1e6:6.1f} us/query"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+"""
+Benchmark per-request database latency for each DB_POOL_MODE.
+
+Each simulated request opens a session, runs one small catalog-style query
+and closes the session, the way a route using get_db does. The first
+request per mode pays for connection setup; the rest show the steady state
+of a warm instance (NullPool reconnects every time, pooled modes reuse).
+
+Needs a reachable DATABASE_URL (use the Neon branch you deploy to: the
+handshake cost being measured depends on network distance).
+
+Usage: python scripts/bench_pool_modes.py [requests] [modes...]
+       e.g. python scripts/bench_pool_modes.py 50 null warm pgbouncer
+"""
+
+import asyncio
+import statistics
+import sys
+import time
+from pathlib import Path
+
+# Add parent directory to path to import api modules
+sys.path.append(str(Path(__file__).parent.parent))
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from api.database import create_engine_for_mode
+
+QUERY = text("SELECT count(*), max(updated_at) FROM pricing_plans")
+
+
+async def bench_mode(mode: str, requests: int) -> None:
+    """Time sequential session round trips for one pool mode"""
+    engine = create_engine_for_mode(mode)
+    sessions = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+
+    timings = []
+    try:
+        for _ in range(requests + 1):
+            start = time.perf_counter()
+            async with sessions() as db:
+                await db.execute(QUERY)
+            timings.append(time.perf_counter() - start)
+    finally:
+        await engine.dispose()
+
+    first, warm = timings[0], sorted(timings[1:])
+    p95 = warm[min(len(warm) - 1, int(len(warm) * 0.95))]
+    print(
+        f"  {mode:<10} first {first * 1e3:8.1f} ms   "
+        f"p50 {statistics.median(warm) * 1e3:7.1f} ms   "
+        f"p95 {p95 * 1e3:7.1f} ms   "
+        f"mean {statistics.fmean(warm) * 1e3:7.1f} ms"
+    )
+
+
+async def main():
+    requests = int(sys.argv[1]) if len(sys.argv) > 1 else 30
+    modes = sys.argv[2:] or ["null", "warm", "pgbouncer"]
+    print(f"⏱  Pool mode benchmark ({requests} requests per mode, after the first)")
+    for mode in modes:
+        await bench_mode(mode, requests)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
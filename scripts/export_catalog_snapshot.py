@@ -0,0 +1,43 @@
+"""
+Export the public catalog to a snapshot file shipped with the deployment.
+
+Run as a build step, after migrations and seeding, so cold instances can
+serve catalog reads without opening a database connection. Every list and
+item is rendered exactly as the API would, with its ETag; the app checks
+those against the database in the background and reloads only what changed.
+
+Usage: python scripts/export_catalog_snapshot.py [output_path]
+       (defaults to CATALOG_SNAPSHOT_PATH, api/data/catalog.snapshot)
+"""
+
+import asyncio
+import sys
+from pathlib import Path
+
+# Add parent directory to path to import api modules
+sys.path.append(str(Path(__file__).parent.parent))
+
+from api.database import AsyncSessionLocal, close_db
+from api.services.catalog_service import export_catalog_records, snapshot_path
+from api.utils.snapshot import write_snapshot
+
+
+async def export_snapshot(path: Path) -> None:
+    async with AsyncSessionLocal() as db:
+        records = await export_catalog_records(db)
+    await close_db()
+
+    write_snapshot(path, records)
+    size = sum(len(body) for body, _ in records.values())
+    print(f"✅ Wrote {len(records)} catalog entries ({size / 1024:.1f} KiB) to {path}")
+
+
+def main():
+    path = Path(sys.argv[1]) if len(sys.argv) > 1 else snapshot_path()
+    if path is None:
+        raise ValueError("CATALOG_SNAPSHOT_PATH is empty and no output path was given")
+    asyncio.run(export_snapshot(path))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,63 @@
+"""
+Re-render lead AI prompts made from outdated pricing/question versions.
+
+Same engine as POST /leads/prompts/regenerate, without the request
+deadline: for large backlogs after onboarding questions or pricing change.
+Chunks are committed as they are written, so an interrupted run can simply
+be started again.
+
+Usage: python scripts/regenerate_prompts.py [--service-type TYPE]
+           [--chunk-size N] [--workers N]
+"""
+
+import argparse
+import asyncio
+import sys
+from pathlib import Path
+
+# Add parent directory to path to import api modules
+sys.path.append(str(Path(__file__).parent.parent))
+
+from api.database import AsyncSessionLocal, close_db
+from api.services.prompt_regeneration import DEFAULT_CHUNK_SIZE, RegenerationStats, regenerate_prompts
+
+
+def print_progress(stats: RegenerationStats) -> None:
+    print(
+        f"  chunk {stats.chunks:>5}   {stats.regenerated:>8} prompts   "
+        f"{stats.leads_per_second:8.0f} leads/s",
+        flush=True,
+    )
+
+
+async def regenerate(service_type, chunk_size, workers) -> None:
+    print(f"🔁 Regenerating stale AI prompts (chunks of {chunk_size}, {workers or 1} renderer(s))")
+    try:
+        async with AsyncSessionLocal() as db:
+            stats = await regenerate_prompts(
+                db, service_type, chunk_size=chunk_size, workers=workers, progress=print_progress
+            )
+    finally:
+        await close_db()
+
+    for name, count in sorted(stats.by_service_type.items()):
+        print(f"  {name:<20} {count:>8}")
+    for name in stats.skipped_service_types:
+        print(f"  {name:<20} skipped (no pricing plan or questions)")
+    print(
+        f"✅ Regenerated {stats.regenerated} prompts in {stats.elapsed:.2f}s "
+        f"({stats.leads_per_second:.0f} leads/s)"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Re-render outdated lead AI prompts")
+    parser.add_argument("--service-type", help="only leads for this service type")
+    parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE)
+    parser.add_argument("--workers", type=int, default=0, help="render on a process pool of this size")
+    args = parser.parse_args()
+    asyncio.run(regenerate(args.service_type, args.chunk_size, args.workers))
+
+
+if __name__ == "__main__":
+    main()
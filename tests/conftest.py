@@ -1,14 +1,24 @@
 """Pytest configuration and fixtures"""
 
+import asyncio
+from contextlib import asynccontextmanager
+
 import pytest
 from fastapi.testclient import TestClient
 from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
 from httpx import AsyncClient
 
 from api.main import app
-from api.database import Base, get_db
+from api.database import Base, get_db, get_read_db
 from api.config import settings
+from api.services import catalog_service
+from api.services.catalog_service import catalog_cache
+
+# Never serve catalog reads from a locally exported snapshot
+settings.CATALOG_SNAPSHOT_PATH = ""
 
 # Test database URL (use in-memory SQLite for tests)
 SQLALCHEMY_DATABASE_URL = "sqlite:///./test.db"
@@ -31,6 +41,114 @@ def db_session():
         Base.metadata.drop_all(bind=engine)
 
 
+@asynccontextmanager
+async def _sqlite_session(*models):
+    engine = create_async_engine("sqlite+aiosqlite://", poolclass=StaticPool)
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all, tables=[model.__table__ for model in models])
+    try:
+        async with AsyncSession(engine, expire_on_commit=False) as session:
+            yield session
+    finally:
+        await engine.dispose()
+
+
+@pytest.fixture
+def async_db():
+    """
+    Async session on a fresh in-memory SQLite database with the given
+    models' tables (JSONB tables cannot be created on SQLite):
+
+        async with async_db(Lead) as db: ...
+    """
+    catalog_cache.clear()
+    yield _sqlite_session
+    catalog_cache.clear()
+
+
+def _reset_catalog_state():
+    catalog_cache.clear()
+    catalog_service._refreshing.clear()
+    catalog_service._written_at.clear()
+    catalog_service._bundle_body = ((), b"")
+
+
+@pytest.fixture
+def app_db(monkeypatch):
+    """
+    Test client for the app whose sessions (get_db, get_read_db and the
+    catalog's background ReadSessionLocal) all use one in-memory SQLite
+    database with the given models' tables; sessions opens more of them:
+
+        client, sessions = app_db(PricingPlan, Service)
+    """
+    engines = []
+
+    def make(*models):
+        engine = create_async_engine("sqlite+aiosqlite://", poolclass=StaticPool)
+        engines.append(engine)
+        sessions = async_sessionmaker(engine, expire_on_commit=False)
+
+        async def create_tables():
+            async with engine.begin() as conn:
+                await conn.run_sync(Base.metadata.create_all, tables=[model.__table__ for model in models])
+
+        async def override_get_db():
+            async with sessions() as session:
+                yield session
+
+        asyncio.run(create_tables())
+        app.dependency_overrides[get_db] = override_get_db
+        app.dependency_overrides[get_read_db] = override_get_db
+        monkeypatch.setattr(catalog_service, "ReadSessionLocal", sessions)
+        return TestClient(app, raise_server_exceptions=False), sessions
+
+    _reset_catalog_state()
+    yield make
+    app.dependency_overrides.clear()
+    _reset_catalog_state()
+    for engine in engines:
+        asyncio.run(engine.dispose())
+
+
+@pytest.fixture
+def catalog_app(app_db):
+    """app_db with every catalog table (one row in each) and edge_cache_purges"""
+    from api.models.addon import Addon
+    from api.models.company import CompanyInfo
+    from api.models.edge_purge import EdgePurge
+    from api.models.feature import Feature
+    from api.models.onboarding import OnboardingQuestion
+    from api.models.pricing import PricingPlan
+    from api.models.service import Service
+
+    client, sessions = app_db(PricingPlan, Addon, Service, Feature, CompanyInfo, OnboardingQuestion, EdgePurge)
+
+    async def seed():
+        async with sessions() as db:
+            db.add_all([
+                PricingPlan(id="landing_page", name="Landing Page", price=8000, timeline="48h", features=["Hero"]),
+                Addon(name="Logo", price_range="1500-2000", unit="each"),
+                Service(
+                    id="landing_page", name="Landing Page", description="One page", details="Details",
+                    icon="⚡", timeline="48h",
+                ),
+                Feature(icon="⚡", title="Fast", description="Quick delivery", display_order=1),
+                CompanyInfo(
+                    id=1, name="Lunaxcode", tagline="Websites", description="Web studio",
+                    contact={"email": "hi@example.ph"}, payment_terms={"deposit": 50},
+                ),
+                OnboardingQuestion(
+                    service_type="landing_page", title="Landing page",
+                    questions=[{"id": "pageType", "label": "What type of landing page?", "type": "select"}],
+                ),
+            ])
+            await db.commit()
+
+    asyncio.run(seed())
+    return client, sessions
+
+
 @pytest.fixture(scope="function")
 def client(db_session):
     """Create test client with database override"""
@@ -41,6 +159,8 @@ def client(db_session):
             pass
 
     app.dependency_overrides[get_db] = override_get_db
+    app.dependency_overrides[get_read_db] = override_get_db
+    catalog_cache.clear()
     with TestClient(app) as test_client:
         yield test_client
     app.dependency_overrides.clear()
@@ -56,6 +176,7 @@ async def async_client(db_session):
             pass
 
     app.dependency_overrides[get_db] = override_get_db
+    app.dependency_overrides[get_read_db] = override_get_db
     async with AsyncClient(app=app, base_url="http://test") as ac:
         yield ac
     app.dependency_overrides.clear()
@@ -0,0 +1,185 @@
+"""In-process cache tests"""
+
+import asyncio
+import dataclasses
+import time
+from datetime import datetime
+
+from fastapi import Response
+from sqlalchemy import update
+
+from api.models.company import CompanyInfo
+from api.services import catalog_service
+from api.services.catalog_service import CATALOG_RESOURCES, catalog_cache
+from api.utils.cache import SingleFlight, TTLCache
+
+
+def test_get_returns_stored_value():
+    """Test that a stored value is returned until it expires"""
+    cache = TTLCache(ttl=60)
+    cache.set("pricing", [1, 2, 3])
+    assert cache.get("pricing") == [1, 2, 3]
+    assert cache.hits == 1
+
+
+def test_expired_entry_is_dropped():
+    """Test that entries past their TTL are treated as misses"""
+    cache = TTLCache(ttl=60)
+    cache.set("pricing", "plans", ttl=0)
+    assert cache.get("pricing") is None
+    assert len(cache) == 0
+
+
+def test_least_recently_used_entry_is_evicted():
+    """Test that the oldest untouched entry is evicted when full"""
+    cache = TTLCache(ttl=60, max_entries=2)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.get("a")
+    cache.set("c", 3)
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+    assert cache.get("c") == 3
+    assert cache.evictions == 1
+
+
+def test_invalidate_and_prefix():
+    """Test dropping single keys and key prefixes"""
+    cache = TTLCache(ttl=60)
+    cache.set("pricing", 1)
+    cache.set("pricing:landing_page", 2)
+    cache.set("addons", 3)
+
+    cache.invalidate("addons")
+    assert cache.get("addons") is None
+
+    cache.invalidate_prefix("pricing")
+    assert len(cache) == 0
+
+
+def test_get_entry_reports_age():
+    """Test that raw entries expose their age for stale-while-revalidate"""
+    cache = TTLCache(ttl=60)
+    cache.set("company:1", "info", ttl=86400)
+    entry = cache.get_entry("company:1")
+    assert entry.value == "info"
+    assert entry.ttl == 86400
+    assert 0 <= entry.age < 1
+
+
+def test_single_flight_coalesces_concurrent_calls():
+    """Test that concurrent calls for one key share a single execution"""
+    flight = SingleFlight()
+    calls = []
+
+    async def load():
+        calls.append(1)
+        await asyncio.sleep(0.01)
+        return "plans"
+
+    async def burst():
+        return await asyncio.gather(*(flight.do("pricing", load) for _ in range(10)))
+
+    assert asyncio.run(burst()) == ["plans"] * 10
+    assert len(calls) == 1
+    assert flight.stats() == {"in_flight": 0, "executions": 1, "coalesced": 9}
+
+
+def test_single_flight_propagates_errors():
+    """Test that waiters see the leader's exception and the key is released"""
+    flight = SingleFlight()
+
+    async def fail():
+        await asyncio.sleep(0.01)
+        raise RuntimeError("database asleep")
+
+    async def burst():
+        return await asyncio.gather(
+            *(flight.do("pricing", fail) for _ in range(3)), return_exceptions=True
+        )
+
+    results = asyncio.run(burst())
+    assert all(isinstance(result, RuntimeError) for result in results)
+    assert flight.stats()["in_flight"] == 0
+
+
+def test_single_flight_waiter_takes_over_after_cancellation():
+    """Test that a waiter reruns the call when the leader is cancelled"""
+    flight = SingleFlight()
+
+    async def slow():
+        await asyncio.sleep(0.05)
+        return "plans"
+
+    async def scenario():
+        leader = asyncio.create_task(flight.do("pricing", slow))
+        await asyncio.sleep(0)
+        waiter = asyncio.create_task(flight.do("pricing", slow))
+        await asyncio.sleep(0)
+        leader.cancel()
+        return await waiter
+
+    assert asyncio.run(scenario()) == "plans"
+    assert flight.executions == 2
+
+
+def _company_ttls(monkeypatch, soft_ttl, hard_ttl):
+    spec = dataclasses.replace(CATALOG_RESOURCES["company"], soft_ttl=soft_ttl, hard_ttl=hard_ttl)
+    monkeypatch.setitem(CATALOG_RESOURCES, "company", spec)
+
+
+def _rename_company(sessions, name):
+    async def rename():
+        async with sessions() as db:
+            await db.execute(update(CompanyInfo).values(name=name, updated_at=datetime(2030, 1, 1)))
+            await db.commit()
+
+    asyncio.run(rename())
+
+
+def test_stale_entry_is_served_and_refreshed_once(catalog_app, monkeypatch):
+    """Test an entry past its soft TTL is returned immediately and refreshed once in the background"""
+    client, sessions = catalog_app
+    _company_ttls(monkeypatch, soft_ttl=0, hard_ttl=3600)
+    refreshes = []
+    refresh = catalog_service.refresh_catalog_entries
+
+    async def counting_refresh(stale):
+        refreshes.append(list(stale))
+        await refresh(stale)
+
+    monkeypatch.setattr(catalog_service, "refresh_catalog_entries", counting_refresh)
+    assert client.get("/api/v1/company").json()["name"] == "Lunaxcode"
+    assert refreshes == []
+    _rename_company(sessions, "Lunaxcode Studio")
+
+    # Served from the stale copy; the background task then reloads it
+    assert client.get("/api/v1/company").json()["name"] == "Lunaxcode"
+    assert refreshes == [[("company", 1)]]
+    assert catalog_cache.get("company:1").data.name == "Lunaxcode Studio"
+
+    # While a refresh is pending, further stale reads do not schedule another
+    first, second = [], []
+    catalog_service._cached("company", 1, first)
+    catalog_service._publish(Response(), "company:1", first)
+    catalog_service._cached("company", 1, second)
+    assert first == [("company", 1)] and second == []
+
+
+def test_failed_refresh_serves_stale_until_hard_ttl(catalog_app, monkeypatch):
+    """Test a refresh that cannot reach the database keeps the old entry until the hard TTL"""
+    client, _ = catalog_app
+    _company_ttls(monkeypatch, soft_ttl=0, hard_ttl=0.5)
+    assert client.get("/api/v1/company").status_code == 200
+
+    def unreachable():
+        raise ConnectionRefusedError("compute waking up")
+
+    monkeypatch.setattr(catalog_service, "ReadSessionLocal", unreachable)
+    response = client.get("/api/v1/company")
+    assert response.status_code == 200 and response.json()["name"] == "Lunaxcode"
+    assert catalog_cache.get("company:1") is not None
+    assert not catalog_service._refreshing
+
+    time.sleep(0.6)
+    assert catalog_cache.get("company:1") is None
@@ -0,0 +1,121 @@
+"""Catalog bundle and edge cache purge endpoint tests"""
+
+import asyncio
+
+import pytest
+from sqlalchemy import delete, event, select
+
+from api.models.company import CompanyInfo
+from api.models.edge_purge import EdgePurge
+from api.schemas.catalog import CatalogResponse
+from api.services import catalog_service
+from api.services.catalog_service import BUNDLE_SURROGATE_KEY, catalog_cache
+
+
+@pytest.fixture
+def admin_headers(monkeypatch):
+    monkeypatch.setattr("api.config.settings.API_KEY", "test-admin-key")
+    return {"X-API-Key": "test-admin-key"}
+
+
+def test_bundle_body(catalog_app):
+    """Test the bundle holds every resource with cache headers for the edge"""
+    client, _ = catalog_app
+    response = client.get("/api/v1/catalog")
+
+    assert response.status_code == 200
+    data = response.json()
+    assert set(data) == set(CatalogResponse.model_fields)
+    assert [plan["id"] for plan in data["pricing"]] == ["landing_page"]
+    assert data["onboarding_questions"][0]["service_type"] == "landing_page"
+    assert data["company"]["name"] == "Lunaxcode"
+    assert CatalogResponse.model_validate(data)
+    assert response.headers["Surrogate-Key"] == BUNDLE_SURROGATE_KEY
+    assert response.headers["Cache-Control"].startswith("public")
+    assert response.headers["ETag"]
+
+
+def test_bundle_company_is_null_without_company_info(catalog_app):
+    """Test company is null, not an empty list, when there is no company row"""
+    client, sessions = catalog_app
+
+    async def delete_company():
+        async with sessions() as db:
+            await db.execute(delete(CompanyInfo))
+            await db.commit()
+
+    asyncio.run(delete_company())
+    assert client.get("/api/v1/catalog").json()["company"] is None
+
+
+def test_bundle_not_modified_on_a_cold_cache(catalog_app):
+    """Test a matching If-None-Match is answered from one version query without loading rows"""
+    client, sessions = catalog_app
+    etag = client.get("/api/v1/catalog").headers["ETag"]
+    catalog_cache.clear()
+    catalog_service._bundle_body = ((), b"")
+    statements = []
+    event.listen(
+        sessions.kw["bind"].sync_engine, "before_cursor_execute",
+        lambda conn, cursor, sql, *args: statements.append(sql),
+    )
+
+    response = client.get("/api/v1/catalog", headers={"If-None-Match": etag})
+
+    assert response.status_code == 304
+    assert response.headers["ETag"] == etag
+    assert len(statements) == 1
+    assert len(catalog_cache) == 0
+
+
+def test_bundle_reflects_admin_writes(catalog_app, admin_headers):
+    """Test an admin write invalidates the bundle and changes its ETag"""
+    client, _ = catalog_app
+    before = client.get("/api/v1/catalog")
+
+    response = client.post(
+        "/api/v1/addons", json={"name": "Hosting", "price_range": "500-800", "unit": "monthly"},
+        headers=admin_headers,
+    )
+    assert response.status_code == 201
+
+    after = client.get("/api/v1/catalog", headers={"If-None-Match": before.headers["ETag"]})
+    assert after.status_code == 200
+    assert after.headers["ETag"] != before.headers["ETag"]
+    assert [addon["name"] for addon in after.json()["addons"]] == ["Logo", "Hosting"]
+
+
+def test_bundle_is_rebuilt_when_an_entry_is_reloaded(catalog_app, admin_headers):
+    """Test an edit that keeps the bundle ETag (same second) still changes the bundle body"""
+    client, _ = catalog_app
+    before = client.get("/api/v1/catalog")
+    assert before.json()["pricing"][0]["price"] == 8000
+
+    # SQLite's now() has second resolution: count and max(updated_at) are unchanged
+    response = client.put("/api/v1/pricing/landing_page", json={"price": 9000}, headers=admin_headers)
+    assert response.status_code == 200
+
+    assert client.get("/api/v1/pricing").json()[0]["price"] == 9000
+    assert client.get("/api/v1/catalog").json()["pricing"][0]["price"] == 9000
+
+
+def test_admin_writes_record_purges_in_the_database(catalog_app, admin_headers):
+    """Test pending purges are stored with the write, so every instance lists them"""
+    client, sessions = catalog_app
+    client.put("/api/v1/pricing/landing_page", json={"price": 9000}, headers=admin_headers)
+    client.put("/api/v1/pricing/landing_page", json={"price": 9500}, headers=admin_headers)
+
+    async def stored_keys():
+        async with sessions() as db:
+            return set((await db.scalars(select(EdgePurge.surrogate_key))).all())
+
+    assert asyncio.run(stored_keys()) == {"pricing", "pricing:landing_page"}
+    purges = client.get("/api/v1/catalog/purges", headers=admin_headers).json()
+    assert set(purges["surrogate_key"].split()) == {"pricing", "pricing:landing_page"}
+    assert len(purges["keys"]) == 2
+
+    response = client.delete("/api/v1/catalog/purges", params={"keys": ["pricing"]}, headers=admin_headers)
+    assert response.status_code == 204
+    assert asyncio.run(stored_keys()) == {"pricing:landing_page"}
+    client.delete("/api/v1/catalog/purges", headers=admin_headers)
+    assert client.get("/api/v1/catalog/purges", headers=admin_headers).json()["keys"] == []
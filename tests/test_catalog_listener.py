@@ -0,0 +1,117 @@
+"""Cross-instance catalog invalidation tests"""
+
+import asyncio
+import os
+
+import pytest
+
+from api.services.catalog_listener import CatalogChangeListener
+from api.services.catalog_service import (
+    CATALOG_CHANNEL,
+    catalog_cache,
+    handle_catalog_notification,
+)
+
+
+def test_notification_evicts_list_and_item():
+    """Test a '<table>:<id>' payload drops the resource list and that item"""
+    catalog_cache.clear()
+    for key in ("pricing", "pricing:landing_page", "pricing:web_app", "addons"):
+        catalog_cache.set(key, object())
+
+    handle_catalog_notification("pricing_plans:landing_page")
+
+    assert catalog_cache.get("pricing") is None
+    assert catalog_cache.get("pricing:landing_page") is None
+    assert catalog_cache.get("pricing:web_app") is not None
+    assert catalog_cache.get("addons") is not None
+    catalog_cache.clear()
+
+
+def test_notification_without_id_evicts_resource():
+    """Test a bare table payload drops every key for the resource"""
+    catalog_cache.clear()
+    for key in ("features", "features:1", "features:2", "services"):
+        catalog_cache.set(key, object())
+
+    handle_catalog_notification("features")
+
+    assert len(catalog_cache) == 1
+    assert catalog_cache.get("services") is not None
+    catalog_cache.clear()
+
+
+def test_unknown_table_is_ignored():
+    """Test payloads for non-catalog tables leave the cache alone"""
+    catalog_cache.clear()
+    catalog_cache.set("pricing", object())
+
+    handle_catalog_notification("leads:42")
+
+    assert catalog_cache.get("pricing") is not None
+    catalog_cache.clear()
+
+
+def test_listener_keeps_retrying_unexpected_errors(monkeypatch, caplog):
+    """Test a connect error other than OSError is logged and retried, not fatal"""
+    listener = CatalogChangeListener(min_backoff=0, max_backoff=0)
+    attempts = []
+
+    async def bad_dsn():
+        attempts.append(1)
+        raise ValueError("invalid DSN")
+
+    monkeypatch.setattr(listener, "_connect", bad_dsn)
+
+    async def scenario():
+        await listener.start()
+        for _ in range(50):
+            if len(attempts) >= 3:
+                break
+            await asyncio.sleep(0.01)
+        running = not listener._task.done()
+        await listener.stop()
+        return running
+
+    assert asyncio.run(scenario())
+    assert len(attempts) >= 3
+    assert "Catalog listener failed to start" in caplog.text
+
+
+@pytest.mark.integration
+@pytest.mark.skipif(
+    not os.getenv("TEST_DATABASE_URL"), reason="TEST_DATABASE_URL not set"
+)
+def test_listener_receives_notify():
+    """Test a NOTIFY from another connection evicts the cached key"""
+    import asyncpg
+
+    async def scenario():
+        dsn = os.environ["TEST_DATABASE_URL"]
+        listener = CatalogChangeListener(connect_args={"dsn": dsn})
+        catalog_cache.set("addons", object())
+        catalog_cache.set("addons:3", object())
+        await listener.start()
+        try:
+            for _ in range(50):
+                if listener.connected:
+                    break
+                await asyncio.sleep(0.1)
+
+            writer = await asyncpg.connect(dsn)
+            try:
+                await writer.execute("SELECT pg_notify($1, $2)", CATALOG_CHANNEL, "addons:3")
+            finally:
+                await writer.close()
+
+            for _ in range(50):
+                if listener.notifications:
+                    break
+                await asyncio.sleep(0.1)
+        finally:
+            await listener.stop()
+
+        assert catalog_cache.get("addons") is None
+        assert catalog_cache.get("addons:3") is None
+
+    asyncio.run(scenario())
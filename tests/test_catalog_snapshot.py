@@ -0,0 +1,81 @@
+"""Catalog served from a build-time snapshot"""
+
+import asyncio
+from datetime import datetime
+
+from sqlalchemy import event, update
+
+from api.models.pricing import PricingPlan
+from api.services import catalog_service
+from api.services.catalog_service import (
+    _cached,
+    catalog_cache,
+    export_catalog_records,
+    refresh_catalog_entries,
+)
+from api.utils.snapshot import write_snapshot
+
+
+def _export_snapshot(sessions, path, monkeypatch):
+    async def export():
+        async with sessions() as db:
+            return await export_catalog_records(db)
+
+    write_snapshot(path, asyncio.run(export()))
+    monkeypatch.setattr("api.config.settings.CATALOG_SNAPSHOT_PATH", str(path))
+    monkeypatch.setattr(catalog_service, "_snapshot", None)
+
+
+def _count_statements(sessions):
+    statements = []
+    engine = sessions.kw["bind"].sync_engine
+    event.listen(engine, "before_cursor_execute", lambda conn, cursor, sql, *args: statements.append(sql))
+    return statements
+
+
+def test_route_is_served_from_the_snapshot(catalog_app, tmp_path, monkeypatch):
+    """Test a cold read returns the snapshot body without a query and schedules its revalidation"""
+    client, sessions = catalog_app
+    _export_snapshot(sessions, tmp_path / "catalog.snapshot", monkeypatch)
+    scheduled = []
+
+    async def record_refresh(stale):
+        scheduled.append(stale)
+
+    monkeypatch.setattr(catalog_service, "refresh_catalog_entries", record_refresh)
+    statements = _count_statements(sessions)
+
+    response = client.get("/api/v1/pricing")
+
+    assert response.status_code == 200
+    assert response.json()[0]["id"] == "landing_page"
+    assert statements == []
+    assert scheduled == [[("pricing", None)]]
+
+
+def test_revalidation_reloads_only_outdated_keys(catalog_app, tmp_path, monkeypatch):
+    """Test stale snapshot keys are checked in one query and only changed ones reloaded"""
+    client, sessions = catalog_app
+    _export_snapshot(sessions, tmp_path / "catalog.snapshot", monkeypatch)
+    stale = []
+    snapshot_entries = {
+        key: _cached(*key, stale=stale)
+        for key in (("pricing", None), ("addons", None), ("pricing", "landing_page"), ("company", None))
+    }
+
+    async def edit_price():
+        async with sessions() as db:
+            await db.execute(update(PricingPlan).values(price=9000, updated_at=datetime(2030, 1, 1)))
+            await db.commit()
+
+    asyncio.run(edit_price())
+    statements = _count_statements(sessions)
+    asyncio.run(refresh_catalog_entries(stale))
+
+    # One version query, then the pricing list and item
+    assert len(statements) == 3
+    assert catalog_cache.get("addons") is snapshot_entries[("addons", None)]
+    assert catalog_cache.get("company") is snapshot_entries[("company", None)]
+    assert catalog_cache.get("pricing").data[0].price == 9000
+    assert catalog_cache.get("pricing:landing_page").data.price == 9000
+    assert not catalog_service._refreshing
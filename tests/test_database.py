@@ -0,0 +1,73 @@
+"""Database engine configuration tests"""
+
+import os
+import subprocess
+import sys
+
+import pytest
+from sqlalchemy.pool import NullPool
+
+import api.database as database
+from api.config import settings
+from api.database import (
+    engine_options,
+    get_engine,
+    get_read_engine,
+    pooler_url,
+    resolve_pool_mode,
+)
+
+
+def test_pooler_url():
+    """Test Neon hosts are pointed at their pooled endpoint exactly once"""
+    direct = "postgresql+asyncpg://u:p@ep-cool-name-123456.us-east-2.aws.neon.tech/db?ssl=require"
+    pooled = "postgresql+asyncpg://u:p@ep-cool-name-123456-pooler.us-east-2.aws.neon.tech/db?ssl=require"
+
+    assert pooler_url(direct) == pooled
+    assert pooler_url(pooled) == pooled
+    assert pooler_url("postgresql+asyncpg://u:p@localhost/db") == "postgresql+asyncpg://u:p@localhost/db"
+
+
+def test_pool_modes():
+    """Test each pool mode's engine options"""
+    assert issubclass(engine_options("null")["poolclass"], NullPool)
+    assert engine_options("warm")["pool_pre_ping"] is True
+    assert engine_options("pgbouncer")["connect_args"]["statement_cache_size"] == 0
+    assert resolve_pool_mode("WARM") == "warm"
+    with pytest.raises(ValueError):
+        resolve_pool_mode("session")
+
+
+def test_app_imports_without_engine():
+    """Test importing the app neither needs DATABASE_URL nor creates the engine"""
+    env = {key: value for key, value in os.environ.items() if key != "DATABASE_URL"}
+    code = (
+        "import sys, api.main, api.database as database; "
+        "assert database._engine is None; "
+        "assert 'asyncpg' not in sys.modules"
+    )
+    subprocess.run([sys.executable, "-c", code], env=env, check=True)
+
+
+@pytest.fixture
+def fresh_engines(monkeypatch):
+    """Lazily created engines for a test URL, disposed and reset afterwards"""
+    monkeypatch.setattr(settings, "DATABASE_URL", "postgresql://u:p@primary.local/db")
+    monkeypatch.setattr(settings, "DATABASE_READ_URL", "")
+    monkeypatch.setattr(database, "_engine", None)
+    monkeypatch.setattr(database, "_read_engine", None)
+    yield
+    for engine in (database._engine, database._read_engine):
+        if engine is not None:
+            engine.sync_engine.dispose()
+
+
+def test_read_engine_falls_back_to_primary(monkeypatch, fresh_engines):
+    """Test reads use the primary engine unless DATABASE_READ_URL is set"""
+    assert get_read_engine() is get_engine()
+    assert get_engine().url.host == "primary.local"
+
+    monkeypatch.setattr(settings, "DATABASE_READ_URL", "postgresql://u:p@replica.local/db")
+    replica = get_read_engine()
+    assert replica is not get_engine()
+    assert replica.url.host == "replica.local"
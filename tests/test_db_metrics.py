@@ -0,0 +1,55 @@
+"""Pool and query latency metrics tests"""
+
+from sqlalchemy import create_engine, text
+
+from api.utils.db_metrics import (
+    EngineMetrics,
+    InstrumentedNullPool,
+    LatencyHistogram,
+    engine_report,
+    instrument_engine,
+)
+
+
+def test_histogram_percentiles_and_buckets():
+    """Test samples are summarised into percentiles and bucket counts"""
+    histogram = LatencyHistogram()
+    for ms in (1, 3, 3, 40, 2000):
+        histogram.observe(ms / 1000)
+
+    summary = histogram.snapshot()
+    assert summary["count"] == 5
+    assert summary["p50_ms"] == 3
+    assert summary["max_ms"] == 2000
+    assert summary["buckets"]["le_1"] == 1
+    assert summary["buckets"]["le_5"] == 2
+    assert summary["buckets"]["le_50"] == 1
+    assert summary["buckets"]["le_2500"] == 1
+    assert sum(summary["buckets"].values()) == 5
+
+
+def test_histogram_drops_samples_outside_window():
+    """Test the rolling window forgets old samples but keeps the total"""
+    histogram = LatencyHistogram(window=0)
+    histogram.observe(0.01)
+    assert histogram.snapshot() == {"count": 0, "total": 1}
+
+
+def test_engine_records_acquire_connect_and_query_times():
+    """Test pool and cursor events feed the engine's metrics"""
+    engine = create_engine("sqlite://", poolclass=InstrumentedNullPool)
+    instrument_engine(engine, EngineMetrics())
+
+    with engine.connect() as conn:
+        conn.execute(text("SELECT 1"))
+        conn.execute(text("SELECT 2"))
+    engine.dispose()  # The recreated pool keeps recording
+    with engine.connect() as conn:
+        conn.execute(text("SELECT 3"))
+
+    report = engine_report(engine)
+    assert report["pool"]["class"] == "InstrumentedNullPool"
+    assert report["pool"]["waiters"] == 0
+    assert report["acquire"]["count"] == 2
+    assert report["connect"]["count"] == 2
+    assert report["query"]["count"] == 3
@@ -0,0 +1,30 @@
+"""List field projection tests"""
+
+import pytest
+from sqlalchemy import select
+from sqlalchemy.dialects import postgresql
+
+from api.models.lead import Lead
+from api.schemas.lead import LeadListItem
+from api.utils.exceptions import ValidationException
+from api.utils.fields import load_columns, parse_fields, project
+
+
+def test_parse_fields():
+    """Test id is always included, duplicates dropped and unknown fields rejected"""
+    assert parse_fields(None, LeadListItem) is None
+    assert parse_fields("full_name, status,full_name", LeadListItem) == ["id", "full_name", "status"]
+    with pytest.raises(ValidationException):
+        parse_fields("full_name,password", LeadListItem)
+
+
+def test_only_requested_columns_are_selected():
+    """Test heavy columns stay out of the SELECT and the projected row"""
+    columns = parse_fields("full_name,status", LeadListItem)
+    sql = str(select(Lead).options(*load_columns(Lead, columns)).compile(dialect=postgresql.dialect()))
+    assert "leads.full_name" in sql and "leads.status" in sql
+    assert "ai_prompt" not in sql and "answers" not in sql
+
+    lead = Lead(id=1, full_name="Maria", status="new", ai_prompt="long prompt")
+    assert project(lead, columns) == {"id": 1, "full_name": "Maria", "status": "new"}
+    assert project(lead, None) is lead
@@ -1,6 +1,28 @@
 """Health check endpoint tests"""
 
 import pytest
+from fastapi.testclient import TestClient
+
+from api.config import settings
+from api.main import app
+from api.services.db_health import DatabaseProber
+
+
+@pytest.fixture
+def prober(monkeypatch):
+    """Replace the app's database prober with one using a fake check"""
+    calls = []
+
+    async def check():
+        calls.append(1)
+        if getattr(check, "error", None):
+            raise check.error
+
+    prober = DatabaseProber(check=check, interval=0, max_age=60)
+    prober.calls = calls
+    prober.fake_check = check
+    monkeypatch.setattr("api.routers.health.db_prober", prober)
+    return prober
 
 
 def test_health_check(client):
@@ -12,13 +34,41 @@ def test_health_check(client):
     assert data["service"] == "lunaxcode-api"
 
 
-def test_database_health(client):
+def test_database_health(prober):
     """Test database health check endpoint"""
-    response = client.get("/api/v1/health/db")
+    response = TestClient(app).get("/api/v1/health/db")
     assert response.status_code == 200
     data = response.json()
     assert data["status"] == "healthy"
     assert data["database"] == "connected"
+    assert data["latency_ms"] >= 0
+
+
+def test_database_health_is_cached(prober):
+    """Test probes are reused until stale unless fresh=1 is passed"""
+    client = TestClient(app)
+    client.get("/api/v1/health/db")
+    client.get("/api/v1/health/db")
+    assert len(prober.calls) == 1
+
+    client.get("/api/v1/health/db?fresh=1")
+    assert len(prober.calls) == 2
+
+
+def test_database_health_hides_error_in_production(prober, monkeypatch):
+    """Test the probe error is reported in development only"""
+    prober.fake_check.error = OSError("connection refused")
+    client = TestClient(app)
+
+    data = client.get("/api/v1/health/db").json()
+    assert data["status"] == "unhealthy"
+    assert data["error"] == "connection refused"
+    assert data["consecutive_failures"] == 1
+
+    monkeypatch.setattr(settings, "ENVIRONMENT", "production")
+    data = client.get("/api/v1/health/db?fresh=1").json()
+    assert data["database"] == "disconnected"
+    assert "error" not in data
 
 
 def test_root_endpoint(client):
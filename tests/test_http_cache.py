@@ -0,0 +1,94 @@
+"""Conditional request helper tests"""
+
+from datetime import datetime, timezone
+
+from starlette.requests import Request
+
+from api.utils.http_cache import (
+    PRIVATE_CACHE_CONTROL,
+    DefaultCacheControlMiddleware,
+    etag_matches,
+    format_http_date,
+    is_not_modified,
+    parse_http_date,
+    shared_cache_control,
+)
+
+LAST_MODIFIED = datetime(2025, 10, 3, 8, 30, 15, 123456, tzinfo=timezone.utc)
+
+
+def make_request(headers):
+    """Build a bare GET request with the given headers"""
+    return Request({
+        "type": "http",
+        "method": "GET",
+        "path": "/api/v1/pricing",
+        "headers": [(k.lower().encode(), v.encode()) for k, v in headers.items()],
+    })
+
+
+def test_etag_matches():
+    """Test If-None-Match parsing with lists, wildcards and weak tags"""
+    assert etag_matches('"abc"', '"abc"')
+    assert etag_matches('"xyz", W/"abc"', '"abc"')
+    assert etag_matches("*", '"abc"')
+    assert not etag_matches('"xyz"', '"abc"')
+
+
+def test_http_date_round_trip():
+    """Test formatting and parsing HTTP-dates"""
+    formatted = format_http_date(LAST_MODIFIED)
+    assert formatted == "Fri, 03 Oct 2025 08:30:15 GMT"
+    assert parse_http_date(formatted) == LAST_MODIFIED.replace(microsecond=0)
+    assert parse_http_date("not a date") is None
+
+
+def test_if_none_match_takes_precedence():
+    """Test that If-Modified-Since is ignored when an ETag is sent"""
+    request = make_request({
+        "If-None-Match": '"stale"',
+        "If-Modified-Since": format_http_date(LAST_MODIFIED),
+    })
+    assert not is_not_modified(request, '"current"', LAST_MODIFIED)
+
+
+def test_if_modified_since():
+    """Test Last-Modified comparison at one-second resolution"""
+    request = make_request({"If-Modified-Since": format_http_date(LAST_MODIFIED)})
+    assert is_not_modified(request, '"current"', LAST_MODIFIED)
+
+    newer = LAST_MODIFIED.replace(second=16)
+    assert not is_not_modified(request, '"current"', newer)
+
+
+def test_unconditional_request():
+    """Test that requests without validators are never 304"""
+    assert not is_not_modified(make_request({}), '"current"', LAST_MODIFIED)
+
+
+def test_shared_cache_control():
+    """Test the edge caching directive keeps browsers revalidating"""
+    assert shared_cache_control(60, 3600) == (
+        "public, max-age=0, s-maxage=60, stale-while-revalidate=3600"
+    )
+
+
+def test_default_cache_control_middleware():
+    """Test responses without Cache-Control default to private, no-store"""
+    from fastapi import FastAPI, Response
+    from fastapi.testclient import TestClient
+
+    app = FastAPI()
+    app.add_middleware(DefaultCacheControlMiddleware)
+
+    @app.get("/private")
+    def private():
+        return {"ok": True}
+
+    @app.get("/public")
+    def public():
+        return Response(b"{}", headers={"Cache-Control": "public, s-maxage=60"})
+
+    client = TestClient(app)
+    assert client.get("/private").headers["cache-control"] == PRIVATE_CACHE_CONTROL
+    assert client.get("/public").headers["cache-control"] == "public, s-maxage=60"
@@ -0,0 +1,122 @@
+"""Idempotency-Key storage tests"""
+
+import asyncio
+
+import pytest
+from sqlalchemy import func, select
+from sqlalchemy.exc import DBAPIError, IntegrityError
+
+from api.models.idempotency_key import IdempotencyKey
+from api.models.lead import Lead
+from api.models.onboarding import OnboardingQuestion
+from api.models.pricing import PricingPlan
+from api.schemas.lead import LeadCreate
+from api.services.idempotency import request_hash, saved_response
+from api.services.lead_service import LEAD_ROUTE, create_lead
+from api.utils.exceptions import ValidationException
+from api.utils.retry import RetryPolicy, install_connect_retry
+
+QUESTIONS = [{"id": "pageType", "label": "What type of landing page?", "type": "select"}]
+LEAD = LeadCreate(service_type="landing_page", full_name="Maria", email="m@example.ph", answers={})
+TABLES = (PricingPlan, OnboardingQuestion, Lead, IdempotencyKey)
+
+
+@pytest.fixture
+def lead_app(app_db):
+    """App client on a SQLite database with a landing_page catalog"""
+    client, sessions = app_db(*TABLES)
+
+    async def seed():
+        async with sessions() as db:
+            db.add(PricingPlan(id="landing_page", name="Landing", price=8000, timeline="48h", features=["Hero"]))
+            db.add(OnboardingQuestion(service_type="landing_page", title="Landing", questions=QUESTIONS))
+            await db.commit()
+
+    asyncio.run(seed())
+    return client, sessions
+
+
+def test_keyed_lead_is_created_once(async_db):
+    """Test the response is saved with the lead and a second write with the key is rejected"""
+    async def run():
+        async with async_db(PricingPlan, OnboardingQuestion, Lead, IdempotencyKey) as db:
+            db.add(PricingPlan(id="landing_page", name="Landing", price=8000, timeline="48h", features=["Hero"]))
+            db.add(OnboardingQuestion(service_type="landing_page", title="Landing", questions=QUESTIONS))
+            await db.commit()
+            body_hash = request_hash(LEAD.model_dump_json().encode())
+
+            assert await saved_response(db, "lead-1", LEAD_ROUTE, body_hash) is None
+            lead = await create_lead(LEAD, db, idempotency_key="lead-1", body_hash=body_hash)
+
+            saved = await saved_response(db, "lead-1", LEAD_ROUTE, body_hash)
+            assert saved.status_code == 201
+            assert b'"id":%d' % lead.id in saved.body
+
+            # A concurrent request that missed the saved response cannot commit
+            db.expunge_all()
+            with pytest.raises(IntegrityError):
+                await create_lead(LEAD, db, idempotency_key="lead-1", body_hash=body_hash)
+            await db.rollback()
+            assert await db.scalar(select(func.count()).select_from(Lead)) == 1
+
+            with pytest.raises(ValidationException):
+                await saved_response(db, "lead-1", LEAD_ROUTE, request_hash(b"{}"))
+
+    asyncio.run(run())
+
+
+def test_keyed_lead_is_replayed_after_a_lost_connection(lead_app, monkeypatch):
+    """Test POST /leads with a key is replayed after a dropped connection and answered once"""
+    import api.routers.leads as leads_router
+
+    client, sessions = lead_app
+    monkeypatch.setattr("api.config.settings.DB_RETRY_BASE_DELAY", 0)
+    calls = []
+
+    async def lose_connection_once(*args, **kwargs):
+        calls.append(1)
+        if len(calls) == 1:
+            raise DBAPIError("INSERT INTO leads", {}, Exception("connection closed"), connection_invalidated=True)
+        return await create_lead(*args, **kwargs)
+
+    monkeypatch.setattr(leads_router, "create_lead", lose_connection_once)
+    body = LEAD.model_dump_json()
+    headers = {"Idempotency-Key": "lead-1", "Content-Type": "application/json"}
+
+    first = client.post("/api/v1/leads", content=body, headers=headers)
+    assert first.status_code == 201
+    assert len(calls) == 2
+
+    again = client.post("/api/v1/leads", content=body, headers=headers)
+    assert again.status_code == 201 and again.json() == first.json()
+    assert len(calls) == 2
+
+    # Without a key, a dropped connection is not replayed
+    calls.clear()
+    response = client.post("/api/v1/leads", content=body, headers={"Content-Type": "application/json"})
+    assert response.status_code == 503 and "INSERT" not in response.text
+    assert len(calls) == 1
+
+    async def count():
+        async with sessions() as db:
+            return await db.scalar(select(func.count()).select_from(Lead))
+    assert asyncio.run(count()) == 1
+
+
+def test_lead_submission_is_503_when_the_database_is_unreachable(lead_app, monkeypatch):
+    """Test a connect that fails through its retries is a 503, not a 400"""
+    client, sessions = lead_app
+    engine = sessions.kw["bind"]
+    install_connect_retry(engine.sync_engine, RetryPolicy(attempts=2, base_delay=0, max_delay=0, deadline=5))
+    engine.sync_engine.pool.dispose()
+
+    def refuse(*args, **kwargs):
+        raise ConnectionRefusedError("compute waking up")
+
+    monkeypatch.setattr(engine.sync_engine.dialect, "connect", refuse)
+    response = client.post(
+        "/api/v1/leads", content=LEAD.model_dump_json(), headers={"Content-Type": "application/json"}
+    )
+
+    assert response.status_code == 503
+    assert response.headers["Retry-After"] == "2"
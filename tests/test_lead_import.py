@@ -0,0 +1,132 @@
+"""Bulk lead import parsing tests"""
+
+import asyncio
+import json
+
+from sqlalchemy import select, text
+
+from api.models.lead import Lead
+from api.models.onboarding import OnboardingQuestion
+from api.models.pricing import PricingPlan
+from api.models.service import Service
+from api.services.lead_import import RowError, import_leads, iter_lines, parse_csv, parse_ndjson
+
+
+async def _chunks(body: bytes, size: int):
+    for start in range(0, len(body), size):
+        yield body[start:start + size]
+
+
+def _parse(parse, body: bytes, size: int = 7):
+    async def collect():
+        return [row async for row in parse(iter_lines(_chunks(body, size)))]
+    return asyncio.run(collect())
+
+
+def test_csv_rows_span_chunks_and_lines():
+    """Test quoted multi-line fields, JSON answers, empty cells and bad rows"""
+    body = (
+        '\ufeffservice_type,full_name,email,project_description,answers\r\n'
+        'landing_page,Maria Santos,maria@example.ph,"Launch\nwith ""quotes""","{""pageType"": ""Product""}"\r\n'
+        'landing_page,Ñoño,n@example.ph,,{}\r\n'
+        'landing_page,Too,many,columns,{},x\r\n'
+        'landing_page,Bad,b@example.ph,,{oops\r\n'
+    ).encode()
+    rows = _parse(parse_csv, body)
+
+    assert rows[0] == (1, {
+        "service_type": "landing_page",
+        "full_name": "Maria Santos",
+        "email": "maria@example.ph",
+        "project_description": 'Launch\nwith "quotes"',
+        "answers": {"pageType": "Product"},
+    })
+    assert rows[1] == (2, {"service_type": "landing_page", "full_name": "Ñoño", "email": "n@example.ph", "answers": {}})
+    assert [(number, str(error)) for number, error in rows[2:]] == [
+        (3, "expected 5 columns, got 6"),
+        (4, "answers: not valid JSON"),
+    ]
+
+
+def test_ndjson_rows():
+    """Test each non-empty line is one object and bad lines are row errors"""
+    lead = {"service_type": "landing_page", "full_name": "Maria", "email": "m@example.ph", "answers": {}}
+    body = f"{json.dumps(lead)}\n\n[1]\n{{oops\n{json.dumps(lead)}".encode()
+    rows = _parse(parse_ndjson, body)
+
+    assert [number for number, _ in rows] == [1, 2, 3, 4]
+    assert rows[0][1] == lead and rows[3][1] == lead
+    assert isinstance(rows[1][1], RowError) and isinstance(rows[2][1], RowError)
+
+
+QUESTIONS = [{"id": "pageType", "label": "What type of landing page?", "type": "select"}]
+
+
+def _rows(*objects):
+    async def gen():
+        for number, data in enumerate(objects, 1):
+            yield number, data
+    return gen()
+
+
+def _lead(name: str, service_type: str = "landing_page", **fields):
+    return {"service_type": service_type, "full_name": name, "email": "lead@example.ph", "answers": {}, **fields}
+
+
+async def _seed_catalog(db, *service_types):
+    for service_type in service_types:
+        db.add(PricingPlan(id=service_type, name=service_type, price=8000, timeline="48h", features=["Hero"]))
+        db.add(OnboardingQuestion(service_type=service_type, title=service_type, questions=QUESTIONS))
+    await db.commit()
+
+
+def test_import_rejects_rows_and_commits_batches(async_db):
+    """Test invalid rows and unknown service types are reported while the rest is imported"""
+    async def run():
+        async with async_db(PricingPlan, OnboardingQuestion, Lead) as db:
+            await _seed_catalog(db, "landing_page")
+            stats = await import_leads(_rows(
+                _lead("A"),
+                _lead("B", email="not-an-email"),
+                _lead("C", service_type="ecommerce"),
+                RowError("not valid JSON"),
+                _lead("D", status="converted"),
+                _lead("E"),
+                _lead("F"),
+            ), db, batch_size=3)
+
+            assert (stats.received, stats.imported, stats.failed, stats.batches) == (7, 4, 3, 3)
+            assert [error["row"] for error in stats.errors] == [2, 3, 4]
+            assert stats.errors[1]["errors"] == ["service_type: no pricing plan or questions for ecommerce"]
+
+            leads = (await db.scalars(select(Lead).order_by(Lead.id))).all()
+            assert [lead.full_name for lead in leads] == ["A", "D", "E", "F"]
+            assert leads[1].status == "converted"
+            assert all(lead.ai_prompt and lead.prompt_version for lead in leads)
+
+    asyncio.run(run())
+
+
+def test_import_rolls_back_a_failed_batch_and_continues(async_db):
+    """Test a batch the database rejects is reported per row without losing other batches"""
+    async def run():
+        async with async_db(Service, PricingPlan, OnboardingQuestion, Lead) as db:
+            db.add(Service(id="landing_page", name="Landing", description="d", details="d", icon="i", timeline="48h"))
+            # web_app has pricing and questions but no services row: the FK rejects it
+            await _seed_catalog(db, "landing_page", "web_app")
+            await db.execute(text("PRAGMA foreign_keys=ON"))
+
+            stats = await import_leads(_rows(
+                _lead("A"), _lead("B"),
+                _lead("C", service_type="web_app"), _lead("D"),
+                _lead("E"),
+            ), db, batch_size=2)
+
+            assert (stats.imported, stats.failed, stats.batches, stats.failed_batches) == (3, 2, 3, 1)
+            assert stats.stopped is None
+            assert [error["row"] for error in stats.errors] == [3, 4]
+            assert stats.errors[0]["errors"][0].startswith("batch not imported: FOREIGN KEY")
+            names = (await db.scalars(select(Lead.full_name).order_by(Lead.id))).all()
+            assert names == ["A", "B", "E"]
+
+    asyncio.run(run())
@@ -0,0 +1,99 @@
+"""AI prompt formatting tests"""
+
+from api.models.lead import Lead
+from api.services.lead_service import (
+    PromptContext,
+    QuestionIndex,
+    format_ai_prompt,
+    prompt_is_current,
+    prompt_version,
+    render_ai_prompt,
+    render_lead_prompt,
+)
+from api.services.prompt_regeneration import _render_rows_in_worker, render_rows
+
+QUESTIONS = [
+    {"id": "pageType", "label": "What type of landing page?", "type": "select"},
+    {"id": "sections", "label": "Required sections", "type": "checkbox"},
+    {"id": "ctaGoal", "label": "Primary call-to-action goal", "type": "text"},
+]
+
+PRICING = {"name": "Landing Page", "timeline": "48-hour delivery", "price": 8000}
+
+LEAD = {
+    "full_name": "Maria Santos",
+    "company": "TechStartup PH",
+    "email": "maria@techstartup.ph",
+    "phone": "+63 917 123 4567",
+    "project_description": "Product launch",
+    "answers": {
+        "sections": ["Hero Section", "Pricing"],
+        "pageType": "Product Launch",
+        "unknown": "ignored",
+    },
+}
+
+
+def test_format_ai_prompt():
+    """Test the prompt lists answers in submission order with their labels"""
+    assert format_ai_prompt(LEAD, PRICING, QUESTIONS) == "\n".join([
+        "Project: Landing Page for Maria Santos (TechStartup PH)",
+        "Service Type: Landing Page",
+        "Email: maria@techstartup.ph",
+        "Phone: +63 917 123 4567",
+        "",
+        "Project Description:",
+        "Product launch",
+        "",
+        "Requirements:",
+        "- Required sections: Hero Section, Pricing",
+        "- What type of landing page?: Product Launch",
+        "",
+        "Timeline: 48-hour delivery",
+        "Price: ₱8,000",
+    ])
+
+
+def test_compiled_question_index():
+    """Test a compiled index renders the same prompt as the raw questions"""
+    index = QuestionIndex.compile(QUESTIONS)
+
+    assert index.labels["ctaGoal"] == "Primary call-to-action goal"
+    assert index.ordered_labels == tuple(q["label"] for q in QUESTIONS)
+    assert render_ai_prompt(LEAD, PRICING, index) == format_ai_prompt(LEAD, PRICING, QUESTIONS)
+
+
+def test_prompt_version_tracks_rendered_inputs():
+    """Test relabelled questions or repriced plans change the version, other edits don't"""
+    index = QuestionIndex.compile(QUESTIONS)
+    version = prompt_version(PRICING, index)
+
+    reordered_options = [{**q, "options": ["a", "b"]} for q in QUESTIONS]
+    relabelled = [{**QUESTIONS[0], "label": "Landing page type"}, *QUESTIONS[1:]]
+    assert prompt_version(PRICING, QuestionIndex.compile(reordered_options)) == version
+    assert prompt_version(PRICING, QuestionIndex.compile(relabelled)) != version
+    assert prompt_version({**PRICING, "price": 9000}, index) != version
+
+
+def test_stored_lead_prompt_is_current_only_for_its_version():
+    """Test a stored lead renders like a submission and goes stale with the version"""
+    context = PromptContext(QuestionIndex.compile(QUESTIONS), PRICING, "v1")
+    lead = Lead(service_type="landing_page", **LEAD)
+
+    assert not prompt_is_current(lead, context)
+    lead.ai_prompt, lead.prompt_version = render_lead_prompt(lead, context), context.version
+    assert lead.ai_prompt == format_ai_prompt(LEAD, PRICING, QUESTIONS)
+    assert prompt_is_current(lead, context)
+    assert not prompt_is_current(lead, PromptContext(context.index, PRICING, "v2"))
+
+
+def test_batch_rendering_matches_single_lead():
+    """Test rows rendered in batches, in-process or in a worker, match format_ai_prompt"""
+    context = PromptContext(QuestionIndex.compile(QUESTIONS), PRICING, "v1")
+    row = (7, LEAD["full_name"], LEAD["company"], LEAD["email"], LEAD["phone"],
+           LEAD["project_description"], LEAD["answers"])
+    expected = [(7, format_ai_prompt(LEAD, PRICING, QUESTIONS))]
+
+    assert render_rows(context, [row]) == expected
+    labels = tuple(context.index.labels.items())
+    assert _render_rows_in_worker(labels, PRICING, [row]) == expected
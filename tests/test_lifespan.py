@@ -0,0 +1,72 @@
+"""Application startup and shutdown tests"""
+
+import asyncio
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy.ext.asyncio import create_async_engine
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+
+import api.database as database
+from api.config import settings
+from api.database import Base
+from api.main import app
+from api.services.catalog_listener import catalog_listener
+from api.services.catalog_service import CATALOG_BUNDLE, CATALOG_RESOURCES, catalog_cache
+
+
+class FakeListenConnection:
+    closed = False
+
+    def is_closed(self):
+        return self.closed
+
+    async def close(self):
+        self.closed = True
+
+
+@pytest.fixture
+def file_engine(tmp_path, monkeypatch):
+    """Pooled engine on a SQLite file with the catalog tables, installed as the app's engine"""
+    engine = create_async_engine(
+        f"sqlite+aiosqlite:///{tmp_path / 'app.db'}", poolclass=AsyncAdaptedQueuePool
+    )
+
+    async def create_tables():
+        async with engine.begin() as conn:
+            tables = [spec.model.__table__ for spec in CATALOG_RESOURCES.values()]
+            await conn.run_sync(Base.metadata.create_all, tables=tables)
+
+    asyncio.run(create_tables())
+    monkeypatch.setattr(settings, "DATABASE_READ_URL", "")
+    monkeypatch.setattr(database, "_engine", engine)
+    monkeypatch.setattr(database, "_read_engine", None)
+    catalog_cache.clear()
+    yield engine
+    catalog_cache.clear()
+    asyncio.run(engine.dispose())
+
+
+def test_startup_warms_up_and_shutdown_releases(file_engine, monkeypatch):
+    """Test startup opens pooled connections, preloads the catalog and starts the listener"""
+    monkeypatch.setattr(settings, "DB_WARMUP_CONNECTIONS", 2)
+    monkeypatch.setattr(settings, "CATALOG_PRELOAD", True)
+    monkeypatch.setattr(settings, "CATALOG_LISTEN_ENABLED", True)
+    monkeypatch.setattr(settings, "DB_HEALTH_PROBE_INTERVAL", 0)
+    connection = FakeListenConnection()
+
+    async def connect():
+        catalog_listener._connection = connection
+
+    monkeypatch.setattr(catalog_listener, "_connect", connect)
+
+    with TestClient(app):
+        warmed_pool = file_engine.pool
+        assert warmed_pool.checkedin() == 2
+        assert all(catalog_cache.get(resource) is not None for resource in CATALOG_BUNDLE.values())
+        assert catalog_listener._task is not None and not catalog_listener._task.done()
+
+    assert catalog_listener._task is None and connection.closed
+    # dispose() closes the pooled connections and starts a new, empty pool
+    assert file_engine.pool is not warmed_pool
+    assert warmed_pool.checkedin() == 0
@@ -0,0 +1,70 @@
+"""Batch prompt regeneration tests"""
+
+import asyncio
+from datetime import datetime
+
+from sqlalchemy import select
+
+from api.models.lead import Lead
+from api.models.onboarding import OnboardingQuestion
+from api.models.pricing import PricingPlan
+from api.services.lead_service import format_ai_prompt, get_lead_with_prompt
+from api.services.prompt_regeneration import regenerate_prompts
+
+QUESTIONS = [{"id": "pageType", "label": "What type of landing page?", "type": "select"}]
+EDITED_AT = datetime(2025, 1, 2, 3, 4, 5)
+
+
+def test_regeneration_renders_stale_prompts_in_chunks(async_db):
+    """Test stale prompts are re-rendered in chunks without touching updated_at"""
+    async def run():
+        async with async_db(PricingPlan, OnboardingQuestion, Lead) as db:
+            db.add(PricingPlan(id="landing_page", name="Landing Page", price=8000, timeline="48h", features=["Hero"]))
+            db.add(OnboardingQuestion(service_type="landing_page", title="Landing page", questions=QUESTIONS))
+            db.add_all(
+                Lead(
+                    service_type="landing_page", full_name=f"Lead {i}", email="lead@example.ph",
+                    answers={"pageType": "Launch"}, ai_prompt="old", prompt_version="old", updated_at=EDITED_AT,
+                )
+                for i in range(5)
+            )
+            await db.commit()
+
+            stats = await regenerate_prompts(db, chunk_size=2)
+            assert (stats.regenerated, stats.chunks) == (5, 3)
+            assert stats.by_service_type == {"landing_page": 5}
+
+            db.expire_all()
+            leads = (await db.scalars(select(Lead).order_by(Lead.id))).all()
+            pricing = {"name": "Landing Page", "timeline": "48h", "price": 8000}
+            lead_data = {"full_name": "Lead 0", "email": "lead@example.ph", "answers": {"pageType": "Launch"}}
+            assert leads[0].ai_prompt == format_ai_prompt(lead_data, pricing, QUESTIONS)
+            assert {lead.updated_at.replace(tzinfo=None) for lead in leads} == {EDITED_AT}
+
+            assert (await regenerate_prompts(db)).regenerated == 0
+
+    asyncio.run(run())
+
+
+def test_lazy_render_keeps_updated_at(async_db):
+    """Test a prompt re-rendered on an admin read is saved without touching updated_at"""
+    async def run():
+        async with async_db(PricingPlan, OnboardingQuestion, Lead) as db:
+            db.add(PricingPlan(id="landing_page", name="Landing Page", price=8000, timeline="48h", features=["Hero"]))
+            db.add(OnboardingQuestion(service_type="landing_page", title="Landing page", questions=QUESTIONS))
+            db.add(Lead(
+                id=1, service_type="landing_page", full_name="Lead", email="lead@example.ph",
+                answers={"pageType": "Launch"}, ai_prompt="old", prompt_version="old", updated_at=EDITED_AT,
+            ))
+            await db.commit()
+            db.expunge_all()
+
+            lead = await get_lead_with_prompt(1, db)
+            assert lead.prompt_version != "old" and lead.updated_at == EDITED_AT
+
+            db.expunge_all()
+            stored = await db.get(Lead, 1)
+            assert stored.ai_prompt == lead.ai_prompt and stored.prompt_version == lead.prompt_version
+            assert stored.updated_at == EDITED_AT
+
+    asyncio.run(run())
@@ -0,0 +1,27 @@
+"""Pre-built hot query tests"""
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session
+
+from api.database import Base
+from api.models.pricing import PricingPlan
+from api.queries import PRICING_PLAN_BY_ID
+
+
+def test_by_id_statement_binds_the_id():
+    """Test a pre-built statement is reused with different ids"""
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine, tables=[PricingPlan.__table__])
+    with Session(engine) as session:
+        session.add_all([
+            PricingPlan(id=plan_id, name=plan_id, price=1, timeline="", features=[])
+            for plan_id in ("landing_page", "web_app")
+        ])
+        session.commit()
+
+        found = session.execute(PRICING_PLAN_BY_ID, {"id": "web_app"}).scalar_one()
+        missing = session.execute(PRICING_PLAN_BY_ID, {"id": "nope"}).scalar_one_or_none()
+
+    assert found.name == "web_app"
+    assert missing is None
+    assert ":id" in str(PRICING_PLAN_BY_ID)
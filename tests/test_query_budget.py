@@ -0,0 +1,84 @@
+"""Query budget tests"""
+
+import asyncio
+
+from fastapi import APIRouter, Depends, FastAPI
+from fastapi.testclient import TestClient
+
+from api.utils.auth import verify_api_key
+from api.utils.query_budget import (
+    ADMIN_BUDGET,
+    EXPORT_BUDGET,
+    PUBLIC_BUDGET,
+    BudgetedRoute,
+    QueryBudget,
+    apply_statement_timeout,
+    current_budget,
+)
+
+
+def make_client(router: APIRouter) -> TestClient:
+    app = FastAPI()
+    app.include_router(router)
+    return TestClient(app)
+
+
+def test_routes_get_budget_from_dependencies():
+    """Test public, admin and explicitly declared budgets"""
+    router = APIRouter(route_class=BudgetedRoute)
+
+    @router.get("/public")
+    async def public():
+        return current_budget.get().name
+
+    @router.get("/admin")
+    async def admin(api_key: str = Depends(verify_api_key)):
+        return current_budget.get().name
+
+    @router.get("/export", dependencies=[Depends(EXPORT_BUDGET)])
+    async def export(api_key: str = Depends(verify_api_key)):
+        return current_budget.get().name
+
+    budgets = {route.path: route.query_budget for route in router.routes}
+    assert budgets == {"/public": PUBLIC_BUDGET, "/admin": ADMIN_BUDGET, "/export": EXPORT_BUDGET}
+    assert make_client(router).get("/public").json() == "public"
+    assert current_budget.get() is None
+
+
+def test_request_deadline_returns_504(monkeypatch):
+    """Test a request running past its deadline is cut off with 504"""
+    monkeypatch.setattr("api.config.settings.QUERY_DEADLINE_GRACE", 0.05)
+    router = APIRouter(route_class=BudgetedRoute)
+
+    @router.get("/slow", dependencies=[Depends(QueryBudget("tiny", 1))])
+    async def slow():
+        await asyncio.sleep(1)
+
+    response = make_client(router).get("/slow")
+    assert response.status_code == 504
+
+
+def test_statement_timeout_set_per_transaction():
+    """Test the after_begin hook issues SET LOCAL on Postgres only"""
+
+    class FakeConnection:
+        def __init__(self, dialect_name):
+            self.dialect = type("Dialect", (), {"name": dialect_name})
+            self.statements = []
+
+        def exec_driver_sql(self, sql):
+            self.statements.append(sql)
+
+    postgres, sqlite = FakeConnection("postgresql"), FakeConnection("sqlite")
+    apply_statement_timeout(None, None, postgres)
+    assert postgres.statements == []
+
+    token = current_budget.set(ADMIN_BUDGET)
+    try:
+        apply_statement_timeout(None, None, postgres)
+        apply_statement_timeout(None, None, sqlite)
+    finally:
+        current_budget.reset(token)
+
+    assert postgres.statements == [f"SET LOCAL statement_timeout = {ADMIN_BUDGET.statement_timeout_ms}"]
+    assert sqlite.statements == []
@@ -0,0 +1,70 @@
+"""Slow-query log tests"""
+
+import json
+import logging
+
+from sqlalchemy import create_engine, text
+
+from api.utils.db_metrics import EngineMetrics, instrument_engine
+from api.utils.query_log import current_route, fingerprint, install_slow_query_log
+
+
+def test_fingerprint_groups_similar_statements():
+    """Test literals, bind parameters and IN lists are normalized away"""
+    a = fingerprint("SELECT * FROM leads\n WHERE id = $1 AND status IN ($2, $3) LIMIT 10")
+    b = fingerprint("SELECT * FROM leads WHERE id = $4 AND status IN ($5) LIMIT 50")
+    assert a == b
+    assert a[1] == "SELECT * FROM leads WHERE id = ? AND status IN (?) LIMIT ?"
+    assert fingerprint("SELECT 'x'::jsonb")[1] == "SELECT ?::jsonb"
+
+
+def test_only_slow_statements_are_logged(caplog):
+    """Test statements under the threshold are skipped and slow ones logged as JSON"""
+    engine = create_engine("sqlite://")
+    install_slow_query_log(engine, threshold_ms=0, sample_rate=1.0)
+    fast = create_engine("sqlite://")
+    install_slow_query_log(fast, threshold_ms=60_000, sample_rate=1.0)
+
+    token = current_route.set("GET /api/v1/leads")
+    try:
+        with caplog.at_level(logging.WARNING, logger="api.slow_query"):
+            with fast.connect() as conn:
+                conn.execute(text("SELECT 1"))
+            with engine.connect() as conn:
+                conn.execute(text("SELECT 1 WHERE 2 = :n"), {"n": 2})
+    finally:
+        current_route.reset(token)
+
+    assert len(caplog.records) == 1
+    entry = json.loads(caplog.records[0].getMessage())
+    assert entry["event"] == "slow_query"
+    assert entry["route"] == "GET /api/v1/leads"
+    assert entry["statement"] == "SELECT ? WHERE ? = ?"
+    assert entry["duration_ms"] >= 0
+    assert len(entry["fingerprint"]) == 12
+
+
+def test_sample_rate_zero_disables_log(caplog):
+    """Test a zero sample rate installs no hooks"""
+    engine = create_engine("sqlite://")
+    install_slow_query_log(engine, threshold_ms=0, sample_rate=0)
+    with caplog.at_level(logging.WARNING, logger="api.slow_query"):
+        with engine.connect() as conn:
+            conn.execute(text("SELECT 1"))
+    assert not caplog.records
+
+
+def test_slow_log_shares_the_metrics_timer(caplog):
+    """Test one statement timer feeds both the query histogram and the slow log"""
+    engine = create_engine("sqlite://")
+    metrics = EngineMetrics()
+    instrument_engine(engine, metrics)
+    install_slow_query_log(engine, threshold_ms=0, sample_rate=1.0)
+
+    with caplog.at_level(logging.WARNING, logger="api.slow_query"):
+        with engine.connect() as conn:
+            conn.execute(text("SELECT 1"))
+
+    assert metrics.query.total == 1
+    assert len(caplog.records) == 1
+    assert len(engine.dispatch.before_cursor_execute) == 1
@@ -0,0 +1,164 @@
+"""Connection retry tests"""
+
+import asyncio
+import time
+
+import pytest
+from fastapi import APIRouter, Depends, FastAPI, Request
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, text
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.ext.asyncio import create_async_engine
+from sqlalchemy.util import await_only
+
+from api.utils.query_budget import BudgetedRoute, QueryBudget
+from api.utils.retry import DatabaseUnavailable, RetryPolicy, idempotent_writes, install_connect_retry
+
+FAST_POLICY = RetryPolicy(attempts=3, base_delay=0, max_delay=0, deadline=5)
+
+
+def test_backoff_is_bounded():
+    """Test delays grow exponentially, stay under the cap and stop after the attempts"""
+    policy = RetryPolicy(attempts=5, base_delay=0.1, max_delay=0.3, deadline=10)
+    delays = list(policy.delays())
+    assert len(delays) == 4
+    assert all(0 <= delay <= bound for delay, bound in zip(delays, (0.1, 0.2, 0.3, 0.3)))
+
+
+def test_connect_retries_transient_errors(monkeypatch):
+    """Test a refused connection is retried and other errors are not"""
+    engine = create_engine("sqlite://")
+    install_connect_retry(engine, FAST_POLICY)
+    connect = engine.dialect.connect
+    failures = [ConnectionRefusedError("compute waking up")] * 2
+
+    def flaky_connect(*args, **kwargs):
+        if failures:
+            raise failures.pop()
+        return connect(*args, **kwargs)
+
+    monkeypatch.setattr(engine.dialect, "connect", flaky_connect)
+    with engine.connect() as conn:
+        assert conn.execute(text("SELECT 1")).scalar() == 1
+    assert failures == []
+
+    failures.append(ValueError("bad password"))
+    engine.dispose()
+    with pytest.raises(ValueError):
+        engine.connect()
+
+    failures.extend([ConnectionRefusedError("compute waking up")] * 3)
+    with pytest.raises(DatabaseUnavailable):
+        engine.connect()
+
+
+def test_only_connect_failures_are_503():
+    """Test OSErrors and timeouts outside opening a connection stay 500s"""
+    from api.main import app
+
+    for exc, status_code in (
+        (DatabaseUnavailable("Could not connect"), 503),
+        (DBAPIError("SELECT 1", {}, Exception("connection closed"), connection_invalidated=True), 503),
+        (DBAPIError("SELECT 1", {}, OSError("disk full")), 500),
+        (OSError("snapshot not readable"), 500),
+        (TimeoutError("upstream API"), 500),
+    ):
+        handler = app.exception_handlers.get(type(exc), app.exception_handlers[Exception])
+        assert asyncio.run(handler(None, exc)).status_code == status_code, exc
+
+
+def test_only_replayable_requests_are_retried(monkeypatch):
+    """Test GETs and keyed writes to key-storing routes are replayed after a lost connection"""
+    monkeypatch.setattr("api.config.settings.DB_RETRY_BASE_DELAY", 0)
+    router = APIRouter(route_class=BudgetedRoute)
+    calls = []
+
+    def lose_connection_once():
+        calls.append(1)
+        if len(calls) % 2:
+            raise DBAPIError("SELECT 1", {}, Exception("connection closed"), connection_invalidated=True)
+        return {"ok": True}
+
+    @router.get("/read")
+    async def read():
+        return lose_connection_once()
+
+    @router.post("/write")
+    async def write():
+        return lose_connection_once()
+
+    @router.post("/keyed", dependencies=[Depends(idempotent_writes)])
+    async def keyed():
+        return lose_connection_once()
+
+    @router.post("/stream")
+    async def stream(request: Request):
+        async for _ in request.stream():
+            pass
+        return lose_connection_once()
+
+    app = FastAPI()
+    app.include_router(router)
+    client = TestClient(app, raise_server_exceptions=False)
+    key = {"Idempotency-Key": "lead-123"}
+
+    assert client.get("/read").json() == {"ok": True}
+    assert len(calls) == 2
+
+    assert client.post("/write").status_code == 500
+    assert len(calls) == 3
+
+    # A route that does not store keys cannot tell a replay from a new write
+    calls.clear()
+    assert client.post("/write", headers=key).status_code == 500
+    assert len(calls) == 1
+
+    calls.clear()
+    assert client.post("/keyed", headers=key).json() == {"ok": True}
+    assert len(calls) == 2
+
+    # A streamed body can only be read once
+    calls.clear()
+    assert client.post("/stream", headers=key, content=b"a,b\n").status_code == 500
+    assert len(calls) == 1
+
+
+def test_connect_retries_fit_the_request_budget(monkeypatch):
+    """Test a hung connect is cut short and retried within the route's budget"""
+    monkeypatch.setattr("api.config.settings.DB_RETRY_BASE_DELAY", 0)
+    monkeypatch.setattr("api.config.settings.QUERY_DEADLINE_GRACE", 0.2)
+    # The public budget scaled down by 10; DB_CONNECT_TIMEOUT (5s) alone
+    # would outlast the request deadline
+    budget = QueryBudget("public", 300)
+    engine = create_async_engine("sqlite+aiosqlite://")
+    install_connect_retry(engine.sync_engine, RetryPolicy.from_settings())
+    dialect = engine.sync_engine.dialect
+    connect = dialect.connect
+    timeouts = []
+
+    def waking_connect(*args, timeout=None, **kwargs):
+        timeouts.append(timeout)
+        if len(timeouts) == 1:
+            # Compute still waking up: the handshake hangs until the attempt times out
+            await_only(asyncio.sleep(timeout))
+            raise asyncio.TimeoutError()
+        return connect(*args, **kwargs)
+
+    monkeypatch.setattr(dialect, "driver", "asyncpg")
+    monkeypatch.setattr(dialect, "connect", waking_connect)
+
+    router = APIRouter(route_class=BudgetedRoute)
+
+    @router.get("/leads", dependencies=[Depends(budget)])
+    async def leads():
+        async with engine.connect() as conn:
+            return {"ok": (await conn.execute(text("SELECT 1"))).scalar()}
+
+    app = FastAPI()
+    app.include_router(router)
+    started = time.monotonic()
+    response = TestClient(app).get("/leads")
+
+    assert response.json() == {"ok": 1}
+    assert time.monotonic() - started < budget.deadline
+    assert len(timeouts) == 2 and timeouts[0] <= 0.15
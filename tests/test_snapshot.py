@@ -0,0 +1,47 @@
+"""Snapshot file tests"""
+
+from api.utils.snapshot import Snapshot, write_snapshot
+
+
+def test_snapshot_round_trip(tmp_path):
+    """Test records are read back with their bodies and metadata"""
+    path = tmp_path / "catalog.snapshot"
+    write_snapshot(path, {
+        "pricing": (b'[{"id":"landing_page"}]', {"etag": '"a"'}),
+        "pricing:landing_page": (b'{"id":"landing_page"}', {"etag": '"b"'}),
+        "company": (b"[]", {"etag": '"c"'}),
+    })
+
+    snapshot = Snapshot.open(path)
+    assert len(snapshot) == 3
+    assert snapshot.get("pricing") == (b'[{"id":"landing_page"}]', {"etag": '"a"'})
+    assert snapshot.get("pricing:landing_page")[0] == b'{"id":"landing_page"}'
+    assert snapshot.get("company") == (b"[]", {"etag": '"c"'})
+    assert snapshot.get("addons") is None
+    snapshot.close()
+
+
+def test_snapshot_discard(tmp_path):
+    """Test discarded keys are no longer served"""
+    path = tmp_path / "catalog.snapshot"
+    write_snapshot(path, {
+        "pricing": (b"[]", {}),
+        "pricing:web_app": (b"{}", {}),
+        "addons": (b"[]", {}),
+    })
+
+    snapshot = Snapshot.open(path)
+    snapshot.discard("addons")
+    assert "addons" not in snapshot
+    snapshot.discard_prefix("pricing")
+    assert len(snapshot) == 0
+    snapshot.close()
+
+
+def test_missing_or_corrupt_snapshot(tmp_path):
+    """Test unusable snapshot files are ignored"""
+    assert Snapshot.open(tmp_path / "missing.snapshot") is None
+
+    corrupt = tmp_path / "corrupt.snapshot"
+    corrupt.write_bytes(b"not json\n")
+    assert Snapshot.open(corrupt) is None